@@ -0,0 +1,459 @@
+"""
+Нагрузочный тест: прогон сотен лобби через полную игру.
+
+Бот работает с фейковым сервером Telegram Bot API (aiohttp на localhost),
+Redis - fakeredis (--redis fake, пакеты из requirements-bench.txt) или
+Redis из настроек (--redis local), PostgreSQL - из настроек (.env).
+Апдейты подаются в диспетчер (dp.feed_update) как синтетические сообщения
+игроков, поэтому проходят через роутеры game_create, game_join и обработку
+команд в игре (process_in_game).
+
+Отчет:
+- p50/p99/max задержки обработки апдейта по действиям;
+- количество команд Redis и обращений к Redis (запрос или pipeline) на действие;
+- количество вызовов Telegram API на раунд (по методам);
+- ожидание соединения из пула базы данных и заполненность пула.
+
+Запуск из директории app (база данных должна быть доступна и мигрирована,
+НЕ запускать на боевой базе - тест создает пользователей):
+
+    python benchmarks/load_test.py --lobbies 200 --players 4
+
+Паузы в сообщениях игры (asyncio_sleep) по умолчанию пропускаются
+(--sleep-scale 0), длительность раунда сокращается (--round-sec).
+Движки игровых команд сравниваются запуском с --engine lock и --engine actor,
+форматы значений в Redis - с --serializer json, orjson и msgpack.
+"""
+
+from argparse import (
+    ArgumentParser,
+    Namespace,
+)
+from asyncio import (
+    Semaphore,
+    Task,
+    create_task as asyncio_create_task,
+    gather as asyncio_gather,
+    run as asyncio_run,
+    sleep as asyncio_sleep,
+    timeout as asyncio_timeout,
+)
+from contextvars import ContextVar
+from datetime import datetime
+from itertools import count
+from json import (
+    dumps as json_dumps,
+    loads as json_loads,
+)
+from os import (
+    environ,
+    path as os_path,
+)
+from sys import path as sys_path
+from time import perf_counter
+from typing import Any
+
+from aiohttp import web
+
+# INFO: добавляет корневую директорию проекта в sys.path для возможности
+#       использования абсолютных путей импорта данных из модулей.
+sys_path.append(os_path.abspath(os_path.join(os_path.dirname(__file__), '../..')))
+
+# INFO. Ограничитель запросов к Telegram не должен влиять на замеры кода игры.
+for key, value in (
+    ('TELEGRAM_RATE_GLOBAL_PER_SEC', '1000000'),
+    ('TELEGRAM_RATE_CHAT_PER_SEC', '1000000'),
+    ('TELEGRAM_RATE_CHAT_BURST', '1000000'),
+    ('TELEGRAM_RATE_CHAT_CLEANUP_PER_SEC', '1000000'),
+):
+    environ.setdefault(key, value)
+
+# INFO. Действие, к которому относятся текущие запросы к Redis и Telegram
+#       (наследуется фоновыми задачами, созданными при обработке апдейта).
+_CURRENT_ACTION: ContextVar[dict[str, int] | None] = ContextVar('_CURRENT_ACTION', default=None)
+
+# INFO. Диапазон ID пользователей Telegram для теста.
+USERS_ID_TELEGRAM_BASE: int = 7_000_000_000
+
+ACTIONS_STATISTIC_KEYS: tuple[str] = ('redis_commands', 'redis_round_trips', 'telegram_calls')
+
+
+class FakeTelegramServer:
+    """
+    Класс фейкового сервера Telegram Bot API.
+
+    Отвечает на все методы успешно и считает количество вызовов по методам.
+    """
+
+    def __init__(self):
+        self.calls: dict[str, int] = {}
+        self.__messages_ids: count = count(1)
+        self.__runner: web.AppRunner | None = None
+        self.url: str | None = None
+
+    async def start(self, host: str = '127.0.0.1', port: int = 0) -> None:
+        app: web.Application = web.Application()
+        app.router.add_post(path='/bot{token}/{method}', handler=self.__handle)
+        self.__runner = web.AppRunner(app=app, access_log=None)
+        await self.__runner.setup()
+        await web.TCPSite(runner=self.__runner, host=host, port=port).start()
+        port: int = self.__runner.addresses[0][1]
+        self.url = f'http://{host}:{port}'
+
+    async def stop(self) -> None:
+        await self.__runner.cleanup()
+
+    async def __handle(self, request: web.Request) -> web.Response:
+        method: str = request.match_info['method'].lower()
+        self.calls[method] = self.calls.get(method, 0) + 1
+        data: dict[str, Any] = dict(await request.post())
+        return web.json_response(data={'ok': True, 'result': self.__make_result(method=method, data=data)})
+
+    def __make_message(self, chat_id: str, **kwargs) -> dict[str, Any]:
+        return {
+            'message_id': next(self.__messages_ids),
+            'date': int(datetime.now().timestamp()),
+            'chat': {'id': int(chat_id), 'type': 'private'},
+            **kwargs,
+        }
+
+    def __make_result(self, method: str, data: dict[str, Any]) -> Any:
+        chat_id: str = data.get('chat_id', '1')
+        if method in ('sendmessage', 'editmessagetext'):
+            return self.__make_message(chat_id=chat_id, text=data.get('text', ''))
+        if method == 'sendphoto':
+            return self.__make_message(
+                chat_id=chat_id,
+                photo=[{'file_id': 'file_id', 'file_unique_id': 'file_unique_id', 'width': 1, 'height': 1}],
+            )
+        if method == 'sendmediagroup':
+            return [
+                self.__make_message(chat_id=chat_id, text='')
+                for _ in json_loads(data.get('media', '[]'))
+            ]
+        if method == 'getfile':
+            return {'file_id': 'file_id', 'file_unique_id': 'file_unique_id'}
+        if method == 'getme':
+            return {'id': 1, 'is_bot': True, 'first_name': 'bot'}
+        return True
+
+
+class LoadTest:
+    """Класс нагрузочного теста."""
+
+    def __init__(self, args: Namespace):
+        self.args: Namespace = args
+        self.latencies: dict[str, list[float]] = {}
+        self.actions_statistic: dict[str, dict[str, int]] = {}
+        self.rounds: int = 0
+        self.games_finished: int = 0
+        self.lobbies_errors: dict[str, int] = {}
+        self.telegram_server: FakeTelegramServer = FakeTelegramServer()
+        self.__updates_ids: count = count(1)
+        self.__messages_ids: count = count(1)
+
+    async def run(self) -> None:
+        self.__setup_settings()
+        self.__setup_redis()
+        self.__import_app()
+        await self.telegram_server.start()
+        self.bot.session.api = self.TelegramAPIServer.from_base(self.telegram_server.url)
+        self.bot.session.middleware(self.__count_telegram_request)
+        self.GameParams.ROUND_DURATION_SEC = self.args.round_sec
+        self.GameParams.ANSWER_DEBOUNCE_SEC = 0
+        self.__patch_sleeps()
+        await self.__seed_cards()
+
+        round_timers_task: Task = asyncio_create_task(self.round_timers.run())
+        semaphore: Semaphore = Semaphore(value=self.args.concurrency)
+        started: float = perf_counter()
+        try:
+            await asyncio_gather(
+                *(self.__play_lobby_with_semaphore(lobby_index=i, semaphore=semaphore) for i in range(self.args.lobbies)),
+            )
+        finally:
+            round_timers_task.cancel()
+            await self.telegram_server.stop()
+            await self.bot.session.close()
+        self.__print_report(duration=perf_counter() - started)
+
+    def __setup_settings(self) -> None:
+        """Применяет настройки бота из аргументов (до импорта модулей бота)."""
+        from app.src.config.config import settings
+        if self.args.engine is not None:
+            settings.GAME_ENGINE = self.args.engine
+        if self.args.serializer is not None:
+            settings.REDIS_SERIALIZER = self.args.serializer
+
+    def __setup_redis(self) -> None:
+        """Подменяет Redis на fakeredis (до импорта модулей бота) и считает запросы к Redis."""
+        from redis.asyncio.client import (
+            Pipeline,
+            Redis,
+        )
+
+        import app.src.database.database as database
+        if self.args.redis == 'fake':
+            from fakeredis import FakeAsyncRedis
+            database.redis_engine = FakeAsyncRedis(decode_responses=True, encoding_errors='surrogateescape')
+            database.redis_blocking_engine = database.redis_engine
+
+        execute_command = Redis.execute_command
+        pipeline_execute = Pipeline.execute
+
+        async def execute_command_counted(client: Redis, *args, **kwargs) -> Any:
+            statistic: dict[str, int] | None = _CURRENT_ACTION.get()
+            if statistic is not None:
+                statistic['redis_commands'] += 1
+                statistic['redis_round_trips'] += 1
+            return await execute_command(client, *args, **kwargs)
+
+        async def pipeline_execute_counted(pipe: Pipeline, *args, **kwargs) -> Any:
+            statistic: dict[str, int] | None = _CURRENT_ACTION.get()
+            if statistic is not None and pipe.command_stack:
+                statistic['redis_commands'] += len(pipe.command_stack)
+                statistic['redis_round_trips'] += 1
+            return await pipeline_execute(pipe, *args, **kwargs)
+
+        Redis.execute_command = execute_command_counted
+        Pipeline.execute = pipeline_execute_counted
+
+    def __import_app(self) -> None:
+        """Импортирует модули бота (после подмены Redis)."""
+        from aiogram.client.telegram import TelegramAPIServer
+        from aiogram.types import (
+            Chat,
+            Message,
+            Update,
+            User,
+        )
+
+        from app.src.bot.bot import bot
+        from app.src.bot.dispatcher import dp
+        from app.src.database.database import (
+            RedisKeys,
+            redis_engine,
+        )
+        from app.src.scheduler.round_timer import round_timers
+        from app.src.utils.game_storage import load_game
+        from app.src.utils.metrics import (
+            MetricsNames,
+            metrics,
+        )
+        from app.src.utils.reply_keyboard import RoutersCommands
+        from app.src.validators.game import (
+            GameParams,
+            GameRoles,
+            GameStatus,
+        )
+
+        self.TelegramAPIServer = TelegramAPIServer
+        self.Chat, self.Message, self.Update, self.User = Chat, Message, Update, User
+        self.bot, self.dp, self.round_timers = bot, dp, round_timers
+        self.RedisKeys, self.redis_engine = RedisKeys, redis_engine
+        self.load_game = load_game
+        self.MetricsNames, self.metrics = MetricsNames, metrics
+        self.RoutersCommands = RoutersCommands
+        self.GameParams, self.GameRoles, self.GameStatus = GameParams, GameRoles, GameStatus
+
+    def __patch_sleeps(self) -> None:
+        """Сокращает паузы между сообщениями игры в sleep_scale раз."""
+        from sys import modules
+
+        scale: float = self.args.sleep_scale
+
+        async def scaled_sleep(delay: float, *args, **kwargs) -> None:
+            await asyncio_sleep(delay * scale)
+
+        for module_name in (
+            'app.src.utils.game',
+            'app.src.bot.routers.game_create',
+            'app.src.bot.routers.game_join',
+        ):
+            modules[module_name].asyncio_sleep = scaled_sleep
+
+    async def __seed_cards(self) -> None:
+        """Сохраняет в Redis синтетические карты (вместо синхронизации картинок)."""
+        await self.redis_engine.set(
+            self.RedisKeys.WORDS,
+            json_dumps([[f'word_{i}', f'word_file_id_{i}'] for i in range(200)]),
+        )
+        await self.redis_engine.set(
+            self.RedisKeys.ROLES,
+            json_dumps({
+                role: f'role_file_id_{role}'
+                for role in (self.GameRoles.BUKA, self.GameRoles.DREAMER, self.GameRoles.FAIRY, self.GameRoles.SANDMAN)
+            }),
+        )
+        await self.redis_engine.set(self.RedisKeys.RULES, json_dumps(['rules_file_id']))
+
+    async def __count_telegram_request(self, make_request, bot, method) -> Any:
+        """Middleware сессии бота: считает вызовы Telegram API по действиям."""
+        statistic: dict[str, int] | None = _CURRENT_ACTION.get()
+        if statistic is not None:
+            statistic['telegram_calls'] += 1
+        return await make_request(bot, method)
+
+    async def __send(self, action: str, user_id: int, text: str) -> None:
+        """Отправляет сообщение игрока в диспетчер и замеряет время обработки."""
+        user: Any = self.User(id=user_id, is_bot=False, first_name=f'Player {user_id}')
+        message: Any = self.Message(
+            message_id=next(self.__messages_ids),
+            date=datetime.now(),
+            chat=self.Chat(id=user_id, type='private'),
+            from_user=user,
+            text=text,
+        )
+        statistic: dict[str, int] = self.actions_statistic.setdefault(
+            action,
+            {'count': 0, **{k: 0 for k in ACTIONS_STATISTIC_KEYS}},
+        )
+        statistic['count'] += 1
+        token = _CURRENT_ACTION.set(statistic)
+        started: float = perf_counter()
+        try:
+            await self.dp.feed_update(
+                bot=self.bot,
+                update=self.Update(update_id=next(self.__updates_ids), message=message),
+            )
+        finally:
+            self.latencies.setdefault(action, []).append(perf_counter() - started)
+            _CURRENT_ACTION.reset(token)
+
+    async def __wait_status(self, number: str, *statuses: str) -> dict[str, Any]:
+        """Ожидает перехода игры в один из статусов statuses (не дольше --wait-sec)."""
+        async with asyncio_timeout(self.args.round_sec + self.args.wait_sec):
+            while 1:
+                game: dict[str, Any] | None = await self.load_game(number=number, fields=('status',))
+                if game and game['status'] in (*statuses, self.GameStatus.FINISHED):
+                    return await self.load_game(number=number)
+                await asyncio_sleep(0.05)
+
+    async def __play_lobby_with_semaphore(self, lobby_index: int, semaphore: Semaphore) -> None:
+        """Проводит лобби через игру, учитывая ошибки вместо остановки теста."""
+        async with semaphore:
+            try:
+                await self.__play_lobby(lobby_index=lobby_index)
+            except Exception as e:
+                name: str = type(e).__name__
+                self.lobbies_errors[name] = self.lobbies_errors.get(name, 0) + 1
+
+    async def __play_lobby(self, lobby_index: int) -> None:
+        """Проводит одно лобби через полную игру."""
+        commands = self.RoutersCommands
+        players_ids: list[int] = [
+            USERS_ID_TELEGRAM_BASE + lobby_index * 100 + i
+            for i in range(self.args.players)
+        ]
+        host_id: int = players_ids[0]
+
+        for user_id in players_ids:
+            await self.__send(action='start', user_id=user_id, text='/start')
+
+        await self.__send(action='game_create', user_id=host_id, text=commands.GAME_CREATE)
+        number: str = str(
+            await self.redis_engine.get(self.RedisKeys.USER_GAME_LOBBY_NUMBER.format(id_telegram=str(host_id))),
+        ).strip('"')
+        game: dict[str, Any] = await self.load_game(number=number, fields=('password',))
+        for user_id in players_ids[1:]:
+            await self.__send(action='game_join', user_id=user_id, text=commands.GAME_JOIN)
+            await self.__send(action='game_join_number', user_id=user_id, text=number)
+            await self.__send(action='game_join_password', user_id=user_id, text=game['password'])
+
+        await self.__send(action='game_start', user_id=host_id, text=commands.GAME_START)
+
+        while 1:
+            game: dict[str, Any] = await self.__wait_status(number, self.GameStatus.PREPARE_NEXT_ROUND)
+            if game['status'] == self.GameStatus.FINISHED:
+                break
+            supervisor_id: int = int(game['players_dreaming_order'][game['supervisor_index']])
+
+            await self.__send(action='round_start', user_id=supervisor_id, text=commands.START_ROUND)
+            for i in range(self.args.words):
+                # INFO. Под нагрузкой раунд может закончиться раньше, чем будут
+                #       отправлены все ответы: ответ после окончания раунда
+                #       бот принял бы за оценку пересказа сна.
+                game: dict[str, Any] = await self.load_game(number=number, fields=('status',))
+                if game['status'] != self.GameStatus.ROUND_IS_STARTED:
+                    break
+                await self.__send(
+                    action='round_answer',
+                    user_id=supervisor_id,
+                    text=commands.WORD_CORRECT if i % 3 else commands.WORD_INCORRECT,
+                )
+            game: dict[str, Any] = await self.__wait_status(
+                number,
+                self.GameStatus.WAIT_DREAMER_RETAILS,
+                self.GameStatus.PREPARE_NEXT_ROUND,
+            )
+            if game['status'] == self.GameStatus.WAIT_DREAMER_RETAILS:
+                await self.__send(action='round_retell', user_id=supervisor_id, text=commands.WORD_CORRECT)
+            self.rounds += 1
+
+        self.games_finished += 1
+        for user_id in players_ids:
+            await self.__send(action='home', user_id=user_id, text=commands.HOME)
+
+    def __print_report(self, duration: float) -> None:
+        """Выводит отчет теста."""
+        print(
+            f'Lobbies: {self.args.lobbies}, players: {self.args.players}, '
+            f'finished games: {self.games_finished}, rounds: {self.rounds}, '
+            f'duration: {duration:.1f} s',
+        )
+        if self.lobbies_errors:
+            print(f'Failed lobbies: {self.lobbies_errors}')
+        print()
+        print(f'{"action":<20}{"count":>8}{"p50 ms":>10}{"p99 ms":>10}{"max ms":>10}{"redis cmd":>11}{"redis rtt":>11}{"tg calls":>10}')
+        for action, latencies in self.latencies.items():
+            latencies: list[float] = sorted(latencies)
+            statistic: dict[str, int] = self.actions_statistic[action]
+            print(
+                f'{action:<20}{len(latencies):>8}'
+                f'{self.__percentile(latencies, 50) * 1000:>10.1f}'
+                f'{self.__percentile(latencies, 99) * 1000:>10.1f}'
+                f'{latencies[-1] * 1000:>10.1f}'
+                f'{statistic["redis_commands"] / statistic["count"]:>11.1f}'
+                f'{statistic["redis_round_trips"] / statistic["count"]:>11.1f}'
+                f'{statistic["telegram_calls"] / statistic["count"]:>10.1f}',
+            )
+        print()
+        print('Telegram calls per round (all lobbies, including background tasks):')
+        for method, calls in sorted(self.telegram_server.calls.items()):
+            print(f'  {method:<20}{calls / max(self.rounds, 1):>10.1f}')
+
+        all_metrics: dict[str, Any] = self.metrics.get_all()
+        wait: dict[str, float] = all_metrics.get(self.MetricsNames.DB_POOL_CHECKOUT_WAIT_SEC, {'count': 0, 'sum': 0, 'max': 0})
+        saturation: dict[str, float] = all_metrics.get(self.MetricsNames.DB_POOL_SATURATION, {'max': 0})
+        print()
+        print(
+            f'DB pool: checkouts {wait["count"]}, '
+            f'wait avg {wait["sum"] / max(wait["count"], 1) * 1000:.1f} ms, '
+            f'wait max {wait["max"] * 1000:.1f} ms, '
+            f'saturation max {saturation["max"] * 100:.0f}%, '
+            f'timeouts {all_metrics.get(self.MetricsNames.DB_POOL_CHECKOUT_TIMEOUTS, 0)}',
+        )
+
+    @staticmethod
+    def __percentile(values: list[float], percent: float) -> float:
+        """Возвращает перцентиль отсортированного списка значений."""
+        return values[min(len(values) - 1, int(len(values) * percent / 100))]
+
+
+def __parse_args() -> Namespace:
+    parser: ArgumentParser = ArgumentParser(description='Нагрузочный тест бота.')
+    parser.add_argument('--lobbies', type=int, default=100, help='количество лобби')
+    parser.add_argument('--players', type=int, default=4, help='количество игроков в лобби')
+    parser.add_argument('--concurrency', type=int, default=1000, help='количество одновременно играющих лобби')
+    parser.add_argument('--words', type=int, default=6, help='количество ответов сновидца за раунд')
+    parser.add_argument('--round-sec', type=float, default=3, help='длительность раунда (сек)')
+    parser.add_argument('--wait-sec', type=float, default=60, help='сколько ждать смены статуса игры сверх длительности раунда (сек)')
+    parser.add_argument('--sleep-scale', type=float, default=0, help='множитель пауз между сообщениями игры')
+    parser.add_argument('--redis', choices=('fake', 'local'), default='fake', help='fakeredis или Redis из настроек')
+    parser.add_argument('--engine', choices=('lock', 'actor'), default=None, help='движок игровых команд (по умолчанию - из настроек)')
+    parser.add_argument('--serializer', choices=('json', 'orjson', 'msgpack'), default=None, help='формат значений в Redis (по умолчанию - из настроек)')
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    asyncio_run(LoadTest(args=__parse_args()).run())
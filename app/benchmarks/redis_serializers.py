@@ -0,0 +1,131 @@
+"""
+Замер форматов значений в Redis (REDIS_SERIALIZER): размер и время
+преобразования словаря игры (поля Redis Hash, как в game_storage)
+и колоды слов (одно значение, как в redis_set).
+
+Запуск из директории app (нужны переменные окружения бота; форматы, пакеты
+которых не установлены, пропускаются):
+
+    python benchmarks/redis_serializers.py --words 400 --players 6
+"""
+
+from argparse import (
+    ArgumentParser,
+    Namespace,
+)
+from os import path as os_path
+from random import choices
+from string import (
+    ascii_letters,
+    digits,
+)
+from sys import path as sys_path
+from timeit import timeit
+from typing import (
+    Any,
+    Callable,
+)
+
+# INFO: добавляет корневую директорию проекта в sys.path для возможности
+#       использования абсолютных путей импорта данных из модулей.
+sys_path.append(os_path.abspath(os_path.join(os_path.dirname(__file__), '../..')))
+
+
+def __make_game(players: int, words: int) -> tuple[dict[str, Any], list[list[str]]]:
+    """Возвращает словарь игры в ходе раунда и колоду слов."""
+    players_ids: list[str] = [str(1_000_000_000 + i) for i in range(players)]
+    game: dict[str, Any] = {
+        'number': '1234',
+        'password': '5678',
+        'redis_key': 'src_game_lobby_1234',
+        'status': 'round_is_started',
+        'card_index': 17,
+        'players_dreaming_order': players_ids,
+        'dreamer_index': 2,
+        'supervisor_index': 3,
+        'last_check_answer_datetime': '2025-01-01 10:00:00.123456',
+        'round_correct_count': 4,
+        'round_incorrect_count': 1,
+        'round_user_retell_dream_correct': False,
+        'round_correct_words': ['Колокольчик', 'Маяк', 'Облако', 'Лестница'],
+        'players': {
+            id_telegram: {
+                'name': f'Иван Иванов {i} (@ivan_{i})',
+                'chat_id': id_telegram,
+                'id': i,
+                'role': 'песочный человечек',
+            }
+            for i, id_telegram in enumerate(players_ids)
+        },
+    }
+    deck: list[list[str]] = [
+        [f'Слово {i}', 'AgACAgIAAxkDAAI' + ''.join(choices(ascii_letters + digits + '_-', k=60))]
+        for i in range(words)
+    ]
+    return game, deck
+
+
+def __measure(func: Callable[[], Any], repeat: int) -> float:
+    """Возвращает среднее время вызова (мкс)."""
+    return timeit(func, number=repeat) / repeat * 1_000_000
+
+
+def __size(values: list[str]) -> int:
+    """Возвращает размер значений в байтах (как они передаются в Redis)."""
+    return sum(len(value.encode('utf-8', 'surrogateescape')) for value in values)
+
+
+def main(args: Namespace) -> None:
+    from importlib import reload
+
+    from app.src.config.config import (
+        RedisSerializers,
+        settings,
+    )
+    from app.src.utils import redis_app
+
+    game, deck = __make_game(players=args.players, words=args.words)
+    game_fields: dict[str, Any] = {k: v for k, v in game.items() if k != 'players'}
+
+    print(f'{"payload":<10}{"format":<10}{"bytes":>10}{"encode us":>12}{"decode us":>12}')
+    for name in (RedisSerializers.JSON, RedisSerializers.ORJSON, RedisSerializers.MSGPACK):
+        # INFO. Модуль перезагружается, чтобы формат был выбран так же, как при запуске бота.
+        settings.REDIS_SERIALIZER = name
+        try:
+            redis_app = reload(redis_app)
+        except ImportError:
+            print(f'{"":<10}{name:<10} (пакет не установлен)')
+            continue
+
+        def encode_game() -> list[str]:
+            return [
+                *redis_app.redis_hash_encode(data=game_fields).values(),
+                *redis_app.redis_hash_encode(data=game['players']).values(),
+            ]
+
+        def encode_deck() -> str:
+            return redis_app.redis_dumps(value=deck)
+
+        game_values: list[str] = encode_game()
+        deck_value: str = encode_deck()
+        for payload, encode, decode, values in (
+            ('game', encode_game, lambda: [redis_app.redis_loads(data=v) for v in game_values], game_values),
+            ('deck', encode_deck, lambda: redis_app.redis_loads(data=deck_value), [deck_value]),
+        ):
+            print(
+                f'{payload:<10}{name:<10}{__size(values=values):>10}'
+                f'{__measure(func=encode, repeat=args.repeat):>12.1f}'
+                f'{__measure(func=decode, repeat=args.repeat):>12.1f}',
+            )
+
+
+def __parse_args() -> Namespace:
+    parser: ArgumentParser = ArgumentParser(description='Замер форматов значений в Redis.')
+    parser.add_argument('--players', type=int, default=6, help='количество игроков в игре')
+    parser.add_argument('--words', type=int, default=400, help='количество карт в колоде')
+    parser.add_argument('--repeat', type=int, default=2000, help='количество повторов замера')
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    main(args=__parse_args())
@@ -1,5 +1,7 @@
 from aiogram import Bot
 
 from app.src.config.config import settings
+from app.src.utils.rate_limiter import telegram_rate_limiter
 
 bot: Bot = Bot(token=settings.BOT_TOKEN)
+bot.session.middleware(telegram_rate_limiter)
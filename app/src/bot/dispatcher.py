@@ -2,7 +2,12 @@ from aiogram import (
     Dispatcher,
     Router,
 )
+from aiogram.fsm.storage.base import (
+    BaseStorage,
+    DefaultKeyBuilder,
+)
 from aiogram.fsm.storage.memory import MemoryStorage
+from aiogram.fsm.storage.redis import RedisStorage
 
 from app.src.bot.routers.fallback import router as fallback
 from app.src.bot.routers.help import router as help
@@ -13,9 +18,41 @@ from app.src.bot.routers.send_test_picture import router as send_test_picture
 from app.src.bot.routers.start import router as start
 from app.src.bot.routers.statistic import router as statistic
 from app.src.bot.routers.sync_images import router as sync_images
+from app.src.config.config import (
+    FsmStorages,
+    settings,
+)
+from app.src.database.database import (
+    RedisKeys,
+    redis_engine,
+)
+from app.src.utils.redis_app import (
+    redis_dumps,
+    redis_loads,
+)
+
+
+def __get_fsm_storage() -> BaseStorage:
+    """
+    Возвращает хранилище состояний FSM.
+
+    Хранилище в Redis общее для всех процессов бота и переживает
+    перезапуск, хранилище в памяти - только для одного процесса.
+    """
+    if settings.FSM_STORAGE == FsmStorages.MEMORY:
+        return MemoryStorage()
+    return RedisStorage(
+        redis=redis_engine,
+        key_builder=DefaultKeyBuilder(prefix=RedisKeys.FSM, separator='_', with_destiny=True),
+        state_ttl=settings.FSM_STORAGE_TTL_SEC,
+        data_ttl=settings.FSM_STORAGE_TTL_SEC,
+        json_loads=redis_loads,
+        json_dumps=redis_dumps,
+    )
+
 
 dp: Dispatcher = Dispatcher(
-    storage=MemoryStorage(),
+    storage=__get_fsm_storage(),
 )
 
 routers: tuple[Router] = (
@@ -23,6 +23,7 @@ from app.src.utils.game import (
     process_avaliable_game_numbers,
     process_in_game,
     process_in_game_destroy_game_confirm,
+    process_game_command,
     process_game_in_redis,
     send_game_roles_messages,
     send_game_start_messages,
@@ -100,6 +101,42 @@ async def start_game(
     message: Message,
     state: FSMContext,
 ) -> None:
+    # INFO. При GAME_ENGINE=actor начало игры выполняется актором лобби,
+    #       поэтому команды игроков ожидают окончания подготовки игры.
+    return await process_game_command(
+        command=lambda: __start_game(message=message, state=state),
+        message=message,
+    )
+
+
+@router.message(
+    StateFilter(
+        GameForm.in_game,
+        GameForm.in_game_destroy_game,
+        GameForm.in_game_drop_game,
+        GameForm.in_game_set_penalty,
+    ),
+)
+async def in_game(
+    message: Message,
+    state: FSMContext,
+) -> None:
+    return await process_in_game(
+        message=message,
+        state=state,
+    )
+
+
+async def __start_game(
+    message: Message,
+    state: FSMContext,
+) -> None:
+    """
+    Обрабатывает команды хоста в лобби и начинает игру.
+
+    Блокировка лобби удерживается до окончания подготовки игры и рассылки
+    ролей: промежуточные сохранения ее не освобождают.
+    """
     await delete_messages_list(chat_id=message.chat.id, messages_ids=(message.message_id,))
     if message.text == RoutersCommands.GAME_DROP:
         return await process_in_game_destroy_game_confirm(
@@ -116,7 +153,7 @@ async def start_game(
         return
 
     await state.set_state(state=GameForm.in_game)
-    process_avaliable_game_numbers(remove_number=game['number'])
+    await process_avaliable_game_numbers(remove_number=game['number'])
 
     await setup_game_data(game=game)
     await send_game_start_messages(game=game)
@@ -125,24 +162,6 @@ async def start_game(
     await process_game_in_redis(redis_key=game['redis_key'], set_game=game)
 
 
-@router.message(
-    StateFilter(
-        GameForm.in_game,
-        GameForm.in_game_destroy_game,
-        GameForm.in_game_drop_game,
-        GameForm.in_game_set_penalty,
-    ),
-)
-async def in_game(
-    message: Message,
-    state: FSMContext,
-) -> None:
-    return await process_in_game(
-        message=message,
-        state=state,
-    )
-
-
 async def __create_lobby(
     user: User,
     message: Message,
@@ -156,12 +175,12 @@ async def __create_lobby(
         else:
             number: str = ''.join(choices('013456789', k=4))
             key: str = RedisKeys.GAME_LOBBY.format(number=number)
-            if redis_check_exists(key=key):
+            if await redis_check_exists(key=key):
                 continue
         break
 
-    redis_set(key=RedisKeys.USER_GAME_LOBBY_NUMBER.format(id_telegram=str(user.id_telegram)), value=number)
-    process_avaliable_game_numbers(add_number=number)
+    await redis_set(key=RedisKeys.USER_GAME_LOBBY_NUMBER.format(id_telegram=str(user.id_telegram)), value=number)
+    await process_avaliable_game_numbers(add_number=number)
     return {
         'number': number,
         'password': ''.join(choices('0123456789', k=4)),
@@ -47,7 +47,7 @@ async def command_game_join(
     state: FSMContext,
 ) -> None:
     """Инициализирует присоединение к игровому лобби."""
-    avaliable_games_numbers: list[str] = process_avaliable_game_numbers(get=True)
+    avaliable_games_numbers: list[str] = await process_avaliable_game_numbers(get=True)
     if not avaliable_games_numbers:
         await state.clear()
         answer: Message = await message.answer(text='В данный момент никто не собирается спать.')
@@ -208,6 +208,6 @@ async def add_to_game(
         messages=[answer],
     )
     await process_game_in_redis(redis_key=game['redis_key'], set_game=game)
-    redis_set(key=RedisKeys.USER_GAME_LOBBY_NUMBER.format(id_telegram=str(user.id_telegram)), value=game['number'])
+    await redis_set(key=RedisKeys.USER_GAME_LOBBY_NUMBER.format(id_telegram=str(user.id_telegram)), value=game['number'])
     if len(game['players']) == GameParams.PLAYERS_MAX:
-        process_avaliable_game_numbers(remove_number=game['number'])
+        await process_avaliable_game_numbers(remove_number=game['number'])
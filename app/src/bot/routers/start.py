@@ -35,17 +35,27 @@ async def command_start(message: Message) -> None:
         )
 
         if not user:
-            user: User = await user_crud.create(
-                obj_data={
-                    'id_telegram': str(message.from_user.id),
-                    'name_first': message.from_user.first_name,
-                    'name_last': message.from_user.last_name,
-                    'username': message.from_user.username,
-                },
-                session=session,
-                perform_commit=False,
-            )
-            rules: list[str] = await get_rules_ids_telegram()
+            try:
+                user: User = await user_crud.create(
+                    obj_data={
+                        'id_telegram': str(message.from_user.id),
+                        'name_first': message.from_user.first_name,
+                        'name_last': message.from_user.last_name,
+                        'username': message.from_user.username,
+                    },
+                    session=session,
+                    perform_check_unique=False,
+                    perform_commit=False,
+                )
+            except ValueError:
+                # INFO. Пользователь уже создан параллельным апдейтом.
+                user: User = await user_crud.retrieve_by_id_telegram(
+                    obj_id_telegram=message.from_user.id,
+                    session=session,
+                )
+                rules: list[str] = []
+            else:
+                rules: list[str] = await get_rules_ids_telegram()
             if rules:
                 await message.answer_media_group(
                     media=[
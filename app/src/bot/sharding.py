@@ -0,0 +1,140 @@
+"""
+Модуль горизонтального масштабирования: распределение апдейтов по воркерам.
+
+При WORKERS_COUNT > 1 бот запускается несколькими процессами:
+- шлюз (WORKER_ID не указан) получает апдейты от Telegram (polling или
+  webhook) и не обрабатывает их, а кладет в очередь воркера в Redis;
+- воркеры (WORKER_ID от 0 до WORKERS_COUNT - 1) забирают апдейты из своей
+  очереди и обрабатывают их.
+
+Апдейты игрока, находящегося в лобби (RedisKeys.USER_GAME_LOBBY_NUMBER),
+всегда попадают к воркеру, определяемому хешем номера лобби. Остальные
+апдейты распределяются по хешу ID пользователя: равномерно между
+воркерами и с сохранением порядка апдейтов одного пользователя.
+
+Апдейты одного пользователя воркер обрабатывает последовательно,
+разных пользователей - конкурентно.
+"""
+
+from asyncio import (
+    Task,
+    create_task as asyncio_create_task,
+    wait as asyncio_wait,
+)
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+)
+from zlib import crc32
+
+from aiogram import (
+    BaseMiddleware,
+    loggers,
+)
+from aiogram.types import (
+    TelegramObject,
+    Update,
+)
+from aiogram.types.update import UpdateTypeLookupError
+
+from app.src.bot.bot import bot
+from app.src.bot.dispatcher import dp
+from app.src.config.config import settings
+from app.src.database.database import (
+    RedisKeys,
+    redis_engine,
+)
+from app.src.utils.metrics import (
+    MetricsNames,
+    metrics,
+)
+from app.src.utils.redis_app import redis_get
+
+# INFO. Таймаут ожидания апдейта в очереди (сек), после которого
+#       ожидание повторяется (позволяет корректно остановить воркер).
+WORKER_QUEUE_WAIT_SEC: int = 5
+
+
+class UpdatesRouterMiddleware(BaseMiddleware):
+    """
+    Класс middleware шлюза: вместо обработки апдейта
+    кладет его в очередь ответственного воркера.
+    """
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: Update,
+        data: dict[str, Any],
+    ) -> None:
+        worker_id: int = await get_update_worker_id(update=event)
+        await redis_engine.rpush(
+            RedisKeys.WORKER_UPDATES.format(worker_id=worker_id),
+            event.model_dump_json(exclude_unset=True, by_alias=True),
+        )
+        metrics.inc(MetricsNames.WORKER_UPDATES_ROUTED)
+
+
+def get_shard(key: int | str) -> int:
+    """Возвращает ID воркера по ключу (одинаковый во всех процессах)."""
+    return crc32(str(key).encode()) % settings.WORKERS_COUNT
+
+
+async def get_update_worker_id(update: Update) -> int:
+    """Возвращает ID воркера, ответственного за апдейт."""
+    user_id: int | None = __get_update_user_id(update=update)
+    if user_id is None:
+        return get_shard(key=update.update_id)
+
+    number: str | None = await redis_get(key=RedisKeys.USER_GAME_LOBBY_NUMBER.format(id_telegram=str(user_id)))
+    if number is not None:
+        return get_shard(key=f'lobby_{number}')
+    return get_shard(key=f'user_{user_id}')
+
+
+async def run_worker(worker_id: int) -> None:
+    """Забирает апдейты из очереди воркера и обрабатывает их."""
+    queue_key: str = RedisKeys.WORKER_UPDATES.format(worker_id=worker_id)
+    # INFO. Последняя задача обработки апдейта каждого пользователя:
+    #       следующая задача пользователя ждет ее завершения.
+    users_tasks: dict[int, Task] = {}
+
+    while 1:
+        item: tuple[str, str] | None = await redis_engine.blpop(queue_key, timeout=WORKER_QUEUE_WAIT_SEC)
+        if item is None:
+            continue
+        try:
+            update: Update = Update.model_validate_json(item[1], context={'bot': bot})
+        except ValueError:
+            loggers.event.exception('Skip invalid update from queue %s', queue_key)
+            continue
+
+        user_id: int = __get_update_user_id(update=update) or update.update_id
+        task: Task = asyncio_create_task(
+            __feed_update_after(update=update, previous=users_tasks.get(user_id)),
+        )
+        users_tasks[user_id] = task
+        task.add_done_callback(
+            lambda t, user_id=user_id: users_tasks.pop(user_id, None) if users_tasks.get(user_id) is t else None,
+        )
+
+
+async def __feed_update_after(update: Update, previous: Task | None) -> None:
+    """Обрабатывает апдейт после завершения обработки предыдущего апдейта пользователя."""
+    if previous is not None:
+        await asyncio_wait((previous,))
+    try:
+        await dp.feed_update(bot=bot, update=update)
+    except Exception:
+        loggers.event.exception('Cause exception while process update id=%d', update.update_id)
+
+
+def __get_update_user_id(update: Update) -> int | None:
+    """Возвращает ID пользователя - автора апдейта."""
+    try:
+        event: TelegramObject = update.event
+    except UpdateTypeLookupError:
+        return None
+    user: Any = getattr(event, 'from_user', None)
+    return user.id if user is not None else None
@@ -0,0 +1,123 @@
+"""
+Модуль режима webhook: веб-сервер aiohttp, принимающий апдейты Telegram.
+
+Эндпоинт settings.WEBHOOK_PATH принимает как один апдейт (так их
+присылает Telegram), так и JSON-список апдейтов (пачка, например
+записанные апдейты для локальной проверки):
+
+    curl -X POST localhost:8080/webhook \\
+        -H 'X-Telegram-Bot-Api-Secret-Token: <WEBHOOK_SECRET_TOKEN>' \\
+        -H 'Content-Type: application/json' \\
+        -d @updates.json
+
+Ответ отправляется сразу, апдейты обрабатываются в фоне: апдейты
+одного чата - последовательно в порядке получения, разных чатов -
+конкурентно.
+
+Метрики процесса отдает отдельный веб-сервер (см. app.src.utils.metrics_server).
+"""
+
+from asyncio import (
+    Event,
+    Task,
+    create_task as asyncio_create_task,
+    gather as asyncio_gather,
+)
+from hmac import compare_digest
+from typing import Any
+
+from aiogram import loggers
+from aiogram.types import Update
+from aiohttp import web
+from pydantic import ValidationError
+
+from app.src.bot.bot import bot
+from app.src.bot.dispatcher import dp
+from app.src.config.config import settings
+from app.src.utils.metrics import (
+    MetricsNames,
+    metrics,
+)
+
+SECRET_TOKEN_HEADER: str = 'X-Telegram-Bot-Api-Secret-Token'
+
+# INFO. Ссылки на фоновые задачи обработки апдейтов, чтобы их
+#       не удалил сборщик мусора до завершения.
+__FEED_TASKS: set[Task] = set()
+
+
+async def feed_updates(updates: list[Update]) -> None:
+    """
+    Обрабатывает пачку апдейтов: апдейты одного чата последовательно,
+    апдейты разных чатов конкурентно.
+    """
+    updates_by_chat: dict[int, list[Update]] = {}
+    for update in updates:
+        updates_by_chat.setdefault(__get_update_chat_id(update=update), []).append(update)
+    await asyncio_gather(*(__feed_chat_updates(updates=v) for v in updates_by_chat.values()))
+
+
+async def run_webhook() -> None:
+    """Запускает веб-сервер и, если указан WEBHOOK_BASE_URL, регистрирует webhook в Telegram."""
+    app: web.Application = web.Application()
+    app.router.add_post(path=settings.WEBHOOK_PATH, handler=__handle_webhook)
+
+    runner: web.AppRunner = web.AppRunner(app=app)
+    await runner.setup()
+    await web.TCPSite(runner=runner, host=settings.WEBHOOK_HOST, port=settings.WEBHOOK_PORT).start()
+
+    if settings.WEBHOOK_BASE_URL:
+        await bot.set_webhook(
+            url=settings.WEBHOOK_BASE_URL.rstrip('/') + settings.WEBHOOK_PATH,
+            secret_token=settings.WEBHOOK_SECRET_TOKEN,
+            allowed_updates=dp.resolve_used_update_types(),
+        )
+    try:
+        await Event().wait()
+    finally:
+        await runner.cleanup()
+        if __FEED_TASKS:
+            await asyncio_gather(*__FEED_TASKS, return_exceptions=True)
+
+
+async def __feed_chat_updates(updates: list[Update]) -> None:
+    """Последовательно обрабатывает апдейты одного чата."""
+    for update in updates:
+        try:
+            await dp.feed_update(bot=bot, update=update)
+        except Exception:
+            loggers.event.exception('Cause exception while process update id=%d', update.update_id)
+
+
+def __get_update_chat_id(update: Update) -> int:
+    """Возвращает ID чата апдейта (или ID апдейта, если чата нет)."""
+    event: Any = update.message or update.edited_message or update.callback_query
+    if event is None:
+        return update.update_id
+    if update.callback_query is not None:
+        return event.from_user.id
+    return event.chat.id
+
+
+async def __handle_webhook(request: web.Request) -> web.Response:
+    """Принимает апдейт или пачку апдейтов и запускает их обработку в фоне."""
+    if not compare_digest(
+        request.headers.get(SECRET_TOKEN_HEADER, '').encode(),
+        settings.WEBHOOK_SECRET_TOKEN.encode(),
+    ):
+        return web.Response(status=401)
+
+    try:
+        data: dict | list[dict] = await request.json()
+        updates: list[Update] = [
+            Update.model_validate(obj=obj, context={'bot': bot})
+            for obj in (data if isinstance(data, list) else (data,))
+        ]
+    except (ValueError, ValidationError):
+        return web.Response(status=400)
+
+    metrics.inc(MetricsNames.WEBHOOK_UPDATES, len(updates))
+    task: Task = asyncio_create_task(feed_updates(updates=updates))
+    __FEED_TASKS.add(task)
+    task.add_done_callback(__FEED_TASKS.discard)
+    return web.json_response(data={'ok': True, 'accepted': len(updates)})
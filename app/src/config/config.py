@@ -1,6 +1,8 @@
 from datetime import tzinfo
 from pathlib import Path
+from typing import Self
 
+from pydantic import model_validator
 from pydantic_settings import (
     BaseSettings,
     SettingsConfigDict,
@@ -39,6 +41,41 @@ class Dirs:
         )
 
 
+class BotModes:
+    """Класс представления режимов получения апдейтов от Telegram."""
+
+    POLLING: str = 'polling'
+    WEBHOOK: str = 'webhook'
+
+
+class FsmStorages:
+    """Класс представления хранилищ состояний FSM."""
+
+    MEMORY: str = 'memory'
+    REDIS: str = 'redis'
+
+
+class RedisSerializers:
+    """Класс представления форматов значений в Redis."""
+
+    # INFO. Стандартный модуль json.
+    JSON: str = 'json'
+    # INFO. Тот же JSON через пакет orjson (быстрее, не экранирует кириллицу).
+    ORJSON: str = 'orjson'
+    # INFO. Бинарный формат пакета msgpack (значения с байтом-меткой формата).
+    MSGPACK: str = 'msgpack'
+
+
+class GameEngines:
+    """Класс представления движков обработки игровых команд."""
+
+    # INFO. Каждое действие извлекает игру из Redis под блокировкой лобби.
+    LOCK: str = 'lock'
+    # INFO. Лобби принадлежит актору процесса, который хранит игру в памяти
+    #       (см. модуль app.src.utils.game_actor).
+    ACTOR: str = 'actor'
+
+
 class Settings(BaseSettings):
     """Класс представления переменных окружения."""
 
@@ -54,18 +91,83 @@ class Settings(BaseSettings):
     POSTGRES_DB: str
     POSTGRES_PASSWORD: str
     POSTGRES_USER: str
+    DB_POOL_SIZE: int = 10
+    DB_POOL_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT_SEC: float = 30
+    # INFO. Соединения старше указанного времени (сек) пересоздаются.
+    DB_POOL_RECYCLE_SEC: int = 1800
+    DB_POOL_PRE_PING: bool = False
+    # INFO. Размер кеша подготовленных выражений asyncpg на соединение (0 - отключен).
+    DB_STATEMENT_CACHE_SIZE: int = 256
+    # INFO. Кеш пользователей в памяти процесса (0 - отключен).
+    USER_CACHE_SIZE: int = 10_000
+    USER_CACHE_TTL_SEC: int = 300
 
     """Настройки базы данных Redis."""
     REDIS_HOST: str = 'redis'
     REDIS_PORT: int = 6379
     REDIS_DB_CACHE: int = 0
+    REDIS_POOL_MAX_CONNECTIONS: int = 64
+    # INFO. Отдельный пул для ожидания блокировок (BLPOP занимает соединение на все ожидание).
+    REDIS_BLOCKING_POOL_MAX_CONNECTIONS: int = 16
+    # INFO. Формат записи значений; значения в JSON читаются при любом формате.
+    REDIS_SERIALIZER: str = RedisSerializers.JSON
 
     """Настройки Telegram Bot."""
     ADMIN_IDS: list[str]
     ADMIN_NOTIFY_ID: str
+    BOT_MODE: str = BotModes.POLLING
     BOT_TOKEN: str
     DEBUG_DB: bool = False
     DEBUG_LOGGING: bool = False
+    FSM_STORAGE: str = FsmStorages.REDIS
+    GAME_ENGINE: str = GameEngines.LOCK
+    # INFO. Время (сек) без команд, после которого актор лобби выгружает игру из памяти.
+    GAME_ACTOR_IDLE_SEC: float = 300
+    # INFO. Время жизни брошенных состояний FSM (сек), по умолчанию - сутки.
+    FSM_STORAGE_TTL_SEC: int = 86_400
+    # INFO. Общий для всех процессов бота лимит, делится между воркерами.
+    TELEGRAM_RATE_GLOBAL_PER_SEC: float = 30
+    TELEGRAM_RATE_CHAT_PER_SEC: float = 1
+    TELEGRAM_RATE_CHAT_BURST: int = 5
+    # INFO. Удаление сообщений ограничивается отдельно от отправки.
+    TELEGRAM_RATE_CHAT_CLEANUP_PER_SEC: float = 5
+    TELEGRAM_RETRY_AFTER_MAX_RETRIES: int = 3
+
+    """Настройки веб-сервера метрик (METRICS_PORT=0 - сервер отключен)."""
+    METRICS_HOST: str = '0.0.0.0'
+    METRICS_PORT: int = 9100
+
+    """Настройки режима webhook (BOT_MODE=webhook)."""
+    WEBHOOK_BASE_URL: str | None = None
+    WEBHOOK_HOST: str = '0.0.0.0'
+    WEBHOOK_PATH: str = '/webhook'
+    WEBHOOK_PORT: int = 8080
+    # INFO. Обязателен при BOT_MODE=webhook: без него апдейты мог бы
+    #       прислать любой, кому доступен порт веб-сервера.
+    WEBHOOK_SECRET_TOKEN: str | None = None
+
+    """Настройки горизонтального масштабирования."""
+    WORKERS_COUNT: int = 1
+    # INFO. Не указан - процесс-шлюз (или единственный процесс при WORKERS_COUNT=1).
+    WORKER_ID: int | None = None
+
+    @model_validator(mode='after')
+    def check_webhook_secret_token(self) -> Self:
+        """Проверяет, что в режиме webhook указан секретный токен."""
+        if self.BOT_MODE == BotModes.WEBHOOK and not self.WEBHOOK_SECRET_TOKEN:
+            raise ValueError('WEBHOOK_SECRET_TOKEN is required when BOT_MODE=webhook')
+        return self
+
+    @property
+    def is_gateway(self) -> bool:
+        """Является ли процесс шлюзом, распределяющим апдейты по воркерам."""
+        return self.WORKERS_COUNT > 1 and self.WORKER_ID is None
+
+    @property
+    def is_worker(self) -> bool:
+        """Является ли процесс воркером, обрабатывающим апдейты из очереди."""
+        return self.WORKERS_COUNT > 1 and self.WORKER_ID is not None
 
 
 settings = Settings()
@@ -47,6 +47,7 @@ class ImageCrud(BaseAsyncCrud):
         query: Select = (
             select(Image.name, Image.id_telegram, Image.id_telegram_rotated)
             .where(Image.category == ImageCategory.WORDS)
+            .order_by(Image.name)
         )
         return (await session.execute(query)).all()
 
@@ -1,24 +1,80 @@
-from sqlalchemy.orm.strategy_options import selectinload
+from asyncio import (
+    CancelledError,
+    sleep as asyncio_sleep,
+)
+from typing import (
+    Any,
+    Iterable,
+)
+from uuid import uuid4
+
+from aiogram import loggers
+from redis.asyncio.client import PubSub
+from sqlalchemy.orm.strategy_options import contains_eager
 from sqlalchemy.sql import select
-from sqlalchemy.sql.selectable import Select
+from sqlalchemy.sql.selectable import (
+    ScalarSelect,
+    Select,
+)
 
+from app.src.config.config import settings
 from app.src.database.base_async_crud import (
     AsyncSession,
     BaseAsyncCrud,
 )
+from app.src.database.database import (
+    RedisKeys,
+    redis_engine,
+)
 from app.src.models.user import User
 from app.src.models.user_statistic import UserStatistic
+from app.src.utils.cache import LruTtlCache
+from app.src.utils.metrics import MetricsNames
+
+# INFO. Поля пользователя, которые хранятся в кеше (достаточные
+#       для главного меню и лобби).
+USER_CACHE_FIELDS: tuple[str] = (
+    'id',
+    'id_telegram',
+    'message_main_last_id',
+    'name_first',
+    'name_last',
+    'username',
+)
+# INFO. Сообщение об очистке всего кеша в канале RedisKeys.USER_CACHE_INVALIDATE.
+USER_CACHE_INVALIDATE_ALL: str = '*'
+# INFO. Пауза (сек) перед повторной подпиской на очистку кеша после ошибки.
+USER_CACHE_RESUBSCRIBE_SEC: float = 1
 
 
 class UserCrud(BaseAsyncCrud):
-    """Класс CRUD запросов к базе данных к таблице User."""
+    """
+    Класс CRUD запросов к базе данных к таблице User.
 
-    async def create(self, *, obj_data, session, perform_cleanup = True, perform_commit = True):
+    Пользователи кешируются в каждом процессе (апдейты одного пользователя
+    могут обрабатывать разные воркеры), поэтому изменения пользователя
+    публикуются в канал RedisKeys.USER_CACHE_INVALIDATE, и остальные
+    процессы удаляют его из своего кеша (см. listen_cache_invalidations).
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.cache: LruTtlCache = LruTtlCache(
+            max_size=settings.USER_CACHE_SIZE,
+            ttl=settings.USER_CACHE_TTL_SEC,
+            metric_hits=MetricsNames.USER_CACHE_HITS,
+            metric_misses=MetricsNames.USER_CACHE_MISSES,
+        )
+        # INFO. Метка процесса: собственные сообщения об очистке кеша пропускаются.
+        self.__cache_token: str = uuid4().hex
+
+    async def create(self, *, obj_data, session, perform_check_unique = True, perform_cleanup = True, perform_commit = True):
         """
         Создает один объект в базе данных.
         Изменяет значение "id_telegram" в тип данных str.
 
-        Создает объект статистики достижений.
+        Создает объект статистики достижений (без проверки
+        уникальности: пользователь только что создан).
         """
         from app.src.crud.user_achievement import user_achievement_crud
         from app.src.crud.user_statistic import user_statistic_crud
@@ -26,23 +82,104 @@ class UserCrud(BaseAsyncCrud):
         if 'id_telegram' in obj_data:
             obj_data['id_telegram'] = str(obj_data['id_telegram'])
 
-        user: User = await super().create(obj_data=obj_data, session=session, perform_cleanup=perform_cleanup, perform_commit=False)
-        await user_achievement_crud.create(obj_data={'user_id': user.id}, session=session, perform_commit=False)
-        await user_statistic_crud.create(obj_data={'user_id': user.id}, session=session, perform_commit=perform_commit)
+        user: User = await super().create(
+            obj_data=obj_data,
+            session=session,
+            perform_check_unique=perform_check_unique,
+            perform_cleanup=perform_cleanup,
+            perform_commit=False,
+        )
+        await user_achievement_crud.create(
+            obj_data={'user_id': user.id},
+            session=session,
+            perform_check_unique=False,
+            perform_commit=False,
+        )
+        await user_statistic_crud.create(
+            obj_data={'user_id': user.id},
+            session=session,
+            perform_check_unique=False,
+            perform_commit=perform_commit,
+        )
+        await self.__cache_user(user=user, perform_commit=perform_commit)
 
         return user
 
     async def retrieve_by_id_telegram(
         self,
         *,
-        obj_id_telegram: int |str,
+        obj_id_telegram: int | str,
         session: AsyncSession,
+        use_cache: bool = True,
     ) -> User | None:
         """
         Получает один объект из базы данных по указанному id_telegram.
+
+        Если use_cache=True, то сначала объект ищется в кеше. Из кеша
+        возвращается объект User, не связанный с сессией, заполненный
+        только полями USER_CACHE_FIELDS.
+        """
+        obj_id_telegram: str = str(obj_id_telegram)
+        if use_cache:
+            cached: dict[str, Any] | None = self.cache.get(obj_id_telegram)
+            if cached is not None:
+                return User(**cached)
+
+        user: User | None = await self._retrieve_one_by_column(
+            column_name='id_telegram',
+            value=obj_id_telegram,
+            session=session,
+        )
+        if user is not None:
+            self.cache.set(user.id_telegram, self.__get_cache_data(user=user))
+        return user
+
+    async def update_by_id(
+        self,
+        *,
+        obj_id: int,
+        obj_data: dict[str, Any],
+        session: AsyncSession,
+        perform_check_unique: bool = False,
+        perform_cleanup: bool = True,
+        perform_commit: bool = True,
+    ) -> User:
+        """Обновляет один объект из базы данных по указанному id и обновляет кеш."""
+        user: User = await super().update_by_id(
+            obj_id=obj_id,
+            obj_data=obj_data,
+            session=session,
+            perform_check_unique=perform_check_unique,
+            perform_cleanup=perform_cleanup,
+            perform_commit=perform_commit,
+        )
+        await self.__cache_user(user=user, perform_commit=perform_commit)
+        return user
+
+    async def delete_by_id(self, *, obj_id: int, session: AsyncSession, perform_commit: bool = True) -> None:
+        """Удаляет один объект из базы данных по указанному id и очищает кеш."""
+        await super().delete_by_id(obj_id=obj_id, session=session, perform_commit=perform_commit)
+        self.cache.clear()
+        await self.__publish_invalidation(key=USER_CACHE_INVALIDATE_ALL)
+
+    async def delete_all_by_ids(
+        self,
+        *,
+        obj_ids: Iterable[int],
+        session: AsyncSession,
+        perform_commit: bool = True,
+    ) -> None:
+        """Удаляет все объекты из базы данных по указанным id и очищает кеш."""
+        await super().delete_all_by_ids(obj_ids=obj_ids, session=session, perform_commit=perform_commit)
+        self.cache.clear()
+        await self.__publish_invalidation(key=USER_CACHE_INVALIDATE_ALL)
+
+    def get_id_by_id_telegram_subquery(self, *, obj_id_telegram: int | str) -> ScalarSelect:
+        """
+        Возвращает подзапрос id пользователя по указанному id_telegram
+        (для изменения связанных объектов без предварительного запроса).
         """
-        query: Select = select(User).where(User.id_telegram == str(obj_id_telegram))
-        return (await session.execute(query)).scalars().first()
+        return select(User.id).where(User.id_telegram == str(obj_id_telegram)).scalar_subquery()
 
     async def retrieve_players_statistic(
         self,
@@ -53,12 +190,7 @@ class UserCrud(BaseAsyncCrud):
         Получает список игроков с их статистикой из базы данных.
         """
         query: Select = (
-            select(User)
-            .join(User.statistics)
-            .options(
-                selectinload(User.achievements),
-                selectinload(User.statistics),
-            )
+            self.__get_query_with_relations()
             .order_by(
                 UserStatistic.top_score.desc(),
                 UserStatistic.total_wins.desc(),
@@ -69,6 +201,71 @@ class UserCrud(BaseAsyncCrud):
         )
         return (await session.execute(query)).scalars().all()
 
+    async def listen_cache_invalidations(self) -> None:
+        """Удаляет из кеша пользователей, измененных другими процессами."""
+        while 1:
+            pubsub: PubSub = redis_engine.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(RedisKeys.USER_CACHE_INVALIDATE)
+                # INFO. Сообщения, опубликованные без подписки, пропущены,
+                #       поэтому кеш мог устареть целиком.
+                self.cache.clear()
+                async for message in pubsub.listen():
+                    token, _, key = message['data'].partition(':')
+                    if token == self.__cache_token:
+                        continue
+                    if key == USER_CACHE_INVALIDATE_ALL:
+                        self.cache.clear()
+                    else:
+                        self.cache.delete(key)
+            except CancelledError:
+                raise
+            except Exception:
+                loggers.event.exception('Cause exception while listen user cache invalidations')
+                await asyncio_sleep(USER_CACHE_RESUBSCRIBE_SEC)
+            finally:
+                await pubsub.aclose()
+
+    async def __cache_user(self, *, user: User, perform_commit: bool = True) -> None:
+        """
+        Записывает пользователя в кеш (write-through) и удаляет его из кеша
+        остальных процессов. Если изменения не зафиксированы, то запись
+        удаляется: транзакция может быть отменена.
+        """
+        if perform_commit:
+            self.cache.set(user.id_telegram, self.__get_cache_data(user=user))
+        else:
+            self.cache.delete(user.id_telegram)
+        await self.__publish_invalidation(key=user.id_telegram)
+
+    @staticmethod
+    def __get_cache_data(user: User) -> dict[str, Any]:
+        """Возвращает поля пользователя для записи в кеш."""
+        return {k: getattr(user, k) for k in USER_CACHE_FIELDS}
+
+    async def __publish_invalidation(self, key: str) -> None:
+        """Публикует очистку записи кеша (или всего кеша) для остальных процессов."""
+        await redis_engine.publish(RedisKeys.USER_CACHE_INVALIDATE, f'{self.__cache_token}:{key}')
+
+    @staticmethod
+    def __get_query_with_relations() -> Select:
+        """
+        Возвращает запрос пользователей вместе со статистикой и достижениями.
+
+        Загрузки одного пользователя со связями нет: обработчики игры статистику
+        и достижения только изменяют, не читая их (подзапрос id пользователя
+        get_id_by_id_telegram_subquery, bulk_increment в конце игры).
+        """
+        return (
+            select(User)
+            .join(User.statistics)
+            .outerjoin(User.achievements)
+            .options(
+                contains_eager(User.statistics),
+                contains_eager(User.achievements),
+            )
+        )
+
 
 user_crud: UserCrud = UserCrud(
     model=User,
@@ -1,6 +1,3 @@
-from sqlalchemy.sql import select
-from sqlalchemy.sql.selectable import Select
-
 from app.src.database.base_async_crud import BaseAsyncCrud
 from app.src.database.database import AsyncSession
 from app.src.models.user_achievement import UserAchievement
@@ -16,8 +13,11 @@ class UserAchievementCrud(BaseAsyncCrud):
         session: AsyncSession,
     ) -> UserAchievement | None:
         """Получает один объект из базы данных по указанному id."""
-        query: Select = select(UserAchievement).where(UserAchievement.user_id == user_id)
-        result: UserAchievement | None = (await session.execute(query)).scalars().first()
+        result: UserAchievement | None = await self._retrieve_one_by_column(
+            column_name='user_id',
+            value=user_id,
+            session=session,
+        )
         if result is None:
             self._raise_value_error_not_found(id=user_id)
         return result
@@ -1,11 +1,10 @@
-from typing import Any
-
-from sqlalchemy.sql import (
-    select,
-    update,
+from typing import (
+    Any,
+    Iterable,
 )
+
+from sqlalchemy.sql import update
 from sqlalchemy.sql.dml import Update
-from sqlalchemy.sql.selectable import Select
 
 from app.src.crud.user import user_crud
 from app.src.database.database import AsyncSession
@@ -24,8 +23,11 @@ class UserStatisticCrud(BaseAsyncCrud):
         session: AsyncSession,
     ) -> UserStatistic | None:
         """Получает один объект из базы данных по указанному id."""
-        query: Select = select(UserStatistic).where(UserStatistic.user_id == user_id)
-        result: UserStatistic | None = (await session.execute(query)).scalars().first()
+        result: UserStatistic | None = await self._retrieve_one_by_column(
+            column_name='user_id',
+            value=user_id,
+            session=session,
+        )
         if result is None:
             self._raise_value_error_not_found(id=user_id)
         return result
@@ -33,35 +35,72 @@ class UserStatisticCrud(BaseAsyncCrud):
     async def update_by_user_id_telegram(
         self,
         *,
-        user_id_telegram: int,
+        user_id_telegram: int | str,
         obj_data: dict[str, Any],
         session: AsyncSession,
-        perform_check_unique: bool = True,
+        perform_check_unique: bool = False,
         perform_cleanup: bool = True,
         perform_commit: bool = True,
     ) -> UserStatistic | None:
-        """Обновляет один объект из базы данных по указанному user_id_telegram."""
+        """
+        Обновляет один объект из базы данных по указанному user_id_telegram
+        одним запросом (id пользователя определяется подзапросом).
+
+        Значения obj_data могут быть выражениями SQLAlchemy
+        (например, UserStatistic.total_quits + 1).
+        """
         if perform_cleanup:
             obj_data: dict[str, Any] = self._clean_obj_data_non_model_fields(obj_data=obj_data)
 
         if perform_check_unique:
             await self._check_unique(obj_data=obj_data, session=session)
 
-        # TODO. Сделать одним запросом в БД.
-        user: User = await user_crud.retrieve_by_id_telegram(obj_id_telegram=user_id_telegram, session=session)
         stmt: Update = (
             update(UserStatistic)
-            .where(UserStatistic.user_id == user.id)
+            .where(UserStatistic.user_id == user_crud.get_id_by_id_telegram_subquery(obj_id_telegram=user_id_telegram))
             .values(**obj_data)
             .returning(UserStatistic)
         )
-        obj: UserStatistic = (await session.execute(stmt)).scalars().first()
+        obj: UserStatistic | None = await self._execute_returning_one(stmt=stmt, session=session)
 
         if perform_commit:
             await session.commit()
 
         return obj
 
+    async def update_by_users_ids_telegram(
+        self,
+        *,
+        users_ids_telegram: Iterable[int | str],
+        obj_data: dict[str, Any],
+        session: AsyncSession,
+        perform_cleanup: bool = True,
+        perform_commit: bool = True,
+    ) -> None:
+        """
+        Обновляет объекты пользователей с указанными id_telegram одним запросом
+        UPDATE ... FROM table_user.
+
+        Значения obj_data могут быть выражениями SQLAlchemy
+        (например, UserStatistic.total_games + 1).
+        """
+        if perform_cleanup:
+            obj_data: dict[str, Any] = self._clean_obj_data_non_model_fields(obj_data=obj_data)
+
+        stmt: Update = (
+            update(UserStatistic)
+            .where(
+                UserStatistic.user_id == User.id,
+                User.id_telegram.in_([str(id_telegram) for id_telegram in users_ids_telegram]),
+            )
+            .values(**obj_data)
+            .execution_options(synchronize_session=False)
+        )
+        await session.execute(stmt)
+
+        if perform_commit:
+            await session.commit()
+
 
 user_statistic_crud: UserStatisticCrud = UserStatisticCrud(
     model=UserStatistic,
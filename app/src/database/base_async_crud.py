@@ -7,18 +7,26 @@ from typing import (
     Iterable,
 )
 
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.sql import (
+    bindparam,
+    column,
     delete,
     insert,
     select,
     update,
+    values,
 )
 from sqlalchemy.sql.dml import (
     Delete,
     Insert,
     Update,
 )
-from sqlalchemy.sql.selectable import Select
+from sqlalchemy.sql.selectable import (
+    Select,
+    Values,
+)
 
 from app.src.database.database import (
     AsyncSession,
@@ -28,6 +36,15 @@ from app.src.database.database import (
 PAGINATION_LIMIT_DEFAULT: int = 15
 PAGINATION_OFFSET_DEFAULT: int = 0
 
+# INFO. Максимальное количество объектов в одном запросе bulk_* методов.
+BULK_CHUNK_SIZE: int = 500
+
+# INFO. Код ошибки PostgreSQL нарушения ограничения уникальности (unique_violation).
+SQLSTATE_UNIQUE_VIOLATION: str = '23505'
+# INFO. Максимальное количество параметров в одном запросе (ограничение
+#       протокола PostgreSQL - 32767), учитывается при разбиении на пачки.
+BULK_PARAMS_MAX: int = 32_000
+
 
 class BaseAsyncCrud():
     """Базовый класс асинхронных CRUD запросов к базе данных."""
@@ -43,28 +60,122 @@ class BaseAsyncCrud():
         self.unique_columns_err = unique_columns_err
         self.unique_columns = unique_columns
 
+        # INFO. Метаданные модели и частые запросы формируются один раз:
+        #       запросы по колонке используют параметр "value", поэтому
+        #       SQLAlchemy переиспользует их скомпилированную форму.
+        self._columns_names: frozenset[str] = frozenset(col.name for col in model.__table__.columns)
+        self._queries_by_column: dict[str, Select] = {}
+        for column_name in ('id', *(unique_columns or ())):
+            self._get_query_by_column(column_name=column_name)
+        self._query_unique: Select | None = None
+        if unique_columns is not None:
+            self._query_unique = select(model).filter(
+                *(getattr(model, column_name) == bindparam(column_name) for column_name in unique_columns),
+            )
+        self._query_by_ids: Select = select(model).where(model.id.in_(bindparam('ids', expanding=True)))
+
     async def create(
         self,
         *,
         obj_data: dict[str, Any],
         session: AsyncSession,
+        perform_check_unique: bool = True,
         perform_cleanup: bool = True,
         perform_commit: bool = True,
     ) -> Base:
-        """Создает один объект в базе данных."""
-        await self._check_unique(obj_data=obj_data, session=session)
+        """
+        Создает один объект в базе данных.
+
+        Если perform_check_unique=False, то уникальность не проверяется
+        отдельным запросом: нарушение ограничений уникальности базы данных
+        откатывает транзакцию и выбрасывает ValueError.
+        """
+        if perform_check_unique:
+            await self._check_unique(obj_data=obj_data, session=session)
 
         if perform_cleanup:
             obj_data: dict[str, Any] = self._clean_obj_data_non_model_fields(obj_data=obj_data)
 
         stmt: Insert = insert(self.model).values(**obj_data).returning(self.model)
-        obj: Base = (await session.execute(stmt)).scalars().first()
+        obj: Base = await self._execute_returning_one(stmt=stmt, session=session)
 
         if perform_commit:
             await session.commit()
 
         return obj
 
+    async def bulk_create(
+        self,
+        *,
+        objs_data: Iterable[dict[str, Any]],
+        session: AsyncSession,
+        perform_cleanup: bool = True,
+        perform_commit: bool = True,
+    ) -> list[Base]:
+        """
+        Создает несколько объектов в базе данных запросами
+        INSERT ... VALUES (...), (...) ... RETURNING пачками до BULK_CHUNK_SIZE.
+
+        Уникальность не проверяется отдельным запросом: нарушение ограничений
+        уникальности базы данных откатывает транзакцию и выбрасывает ValueError.
+        """
+        objs: list[Base] = []
+        for chunk in self._split_objs_data_to_chunks(objs_data=objs_data, perform_cleanup=perform_cleanup):
+            stmt: Insert = insert(self.model).values(chunk).returning(self.model)
+            objs.extend(await self._execute_returning_all(stmt=stmt, session=session))
+
+        if perform_commit:
+            await session.commit()
+
+        return objs
+
+    async def bulk_upsert(
+        self,
+        *,
+        objs_data: Iterable[dict[str, Any]],
+        index_elements: Iterable[str],
+        session: AsyncSession,
+        update_columns: Iterable[str] | None = None,
+        perform_cleanup: bool = True,
+        perform_commit: bool = True,
+    ) -> list[Base]:
+        """
+        Создает или обновляет несколько объектов в базе данных запросами
+        INSERT ... ON CONFLICT (index_elements) DO UPDATE ... RETURNING
+        пачками до BULK_CHUNK_SIZE.
+
+        Атрибуты:
+            index_elements: Iterable[str] - колонки ограничения уникальности,
+                по которому определяется существующий объект
+            update_columns: Iterable[str] | None - обновляемые колонки
+                существующего объекта (по умолчанию все переданные,
+                кроме index_elements)
+        """
+        index_elements: tuple[str] = tuple(index_elements)
+        # INFO. Один запрос не может обновить одну строку дважды,
+        #       поэтому из повторяющихся объектов остается последний.
+        objs_data: dict[tuple, dict[str, Any]] = {
+            tuple(obj_data[k] for k in index_elements): obj_data
+            for obj_data in objs_data
+        }
+
+        objs: list[Base] = []
+        for chunk in self._split_objs_data_to_chunks(objs_data=objs_data.values(), perform_cleanup=perform_cleanup):
+            stmt = pg_insert(self.model).values(chunk)
+            columns_names: Iterable[str] = update_columns or (k for k in chunk[0] if k not in index_elements)
+            set_: dict[str, Any] = {k: stmt.excluded[k] for k in columns_names}
+            if set_:
+                stmt = stmt.on_conflict_do_update(index_elements=index_elements, set_=set_)
+            else:
+                stmt = stmt.on_conflict_do_nothing(index_elements=index_elements)
+            stmt = stmt.returning(self.model).execution_options(populate_existing=True)
+            objs.extend(await self._execute_returning_all(stmt=stmt, session=session))
+
+        if perform_commit:
+            await session.commit()
+
+        return objs
+
     async def retrieve_all(
         self,
         *,
@@ -84,12 +195,30 @@ class BaseAsyncCrud():
         session: AsyncSession,
     ) -> Base:
         """Получает один объект из базы данных по указанному id."""
-        query: Select = select(self.model).where(self.model.id == obj_id)
-        result: Base | None = (await session.execute(query)).scalars().first()
+        result: Base | None = await self._retrieve_one_by_column(column_name='id', value=obj_id, session=session)
         if result is None:
             self._raise_value_error_not_found(id=obj_id)
         return result
 
+    async def retrieve_by_ids(
+        self,
+        *,
+        obj_ids: Iterable[int],
+        session: AsyncSession,
+    ) -> list[Base]:
+        """
+        Получает объекты из базы данных по указанным id
+        (запросами пачками до BULK_CHUNK_SIZE id).
+        Несуществующие id пропускаются, порядок объектов не гарантируется.
+        """
+        obj_ids: list[int] = list(dict.fromkeys(obj_ids))
+        result: list[Base] = []
+        for i in range(0, len(obj_ids), BULK_CHUNK_SIZE):
+            result.extend(
+                (await session.execute(self._query_by_ids, {'ids': obj_ids[i:i + BULK_CHUNK_SIZE]})).scalars().all(),
+            )
+        return result
+
     async def update_by_id(
         self,
         *,
@@ -100,14 +229,15 @@ class BaseAsyncCrud():
         perform_cleanup: bool = True,
         perform_commit: bool = True,
     ) -> Base:
-        """Обновляет один объект из базы данных по указанному id."""
+        """
+        Обновляет один объект из базы данных по указанному id.
+
+        Существование объекта определяется по результату UPDATE ... RETURNING,
+        без предварительного запроса.
+        """
         if perform_cleanup:
             obj_data: dict[str, Any] = self._clean_obj_data_non_model_fields(obj_data=obj_data)
 
-        query: Select = select(self.model).where(self.model.id == obj_id)
-        if (await session.execute(query)).scalars().first() is None:
-            self._raise_value_error_not_found(id=obj_id)
-
         if perform_check_unique:
             await self._check_unique(obj_data=obj_data, session=session)
 
@@ -117,13 +247,115 @@ class BaseAsyncCrud():
             .values(**obj_data)
             .returning(self.model)
         )
-        obj: Base = (await session.execute(stmt)).scalars().first()
+        obj: Base | None = await self._execute_returning_one(stmt=stmt, session=session)
+        if obj is None:
+            self._raise_value_error_not_found(id=obj_id)
 
         if perform_commit:
             await session.commit()
 
         return obj
 
+    async def bulk_update_by_ids(
+        self,
+        *,
+        objs_data: dict[int, dict[str, Any]],
+        session: AsyncSession,
+        perform_cleanup: bool = True,
+        perform_commit: bool = True,
+    ) -> None:
+        """
+        Обновляет несколько объектов в базе данных запросами
+        UPDATE ... SET col = v.col FROM (VALUES ...) AS v WHERE id = v.id
+        пачками до BULK_CHUNK_SIZE.
+
+        Атрибуты:
+            objs_data: dict[int, dict[str, Any]] - {id объекта: данные для обновления}
+        """
+        updated_ids: set[int] = set()
+        for chunk in self._split_objs_data_to_chunks(
+            objs_data=({**data, 'id': obj_id} for obj_id, data in objs_data.items()),
+            perform_cleanup=perform_cleanup,
+        ):
+            columns_names: list[str] = [k for k in chunk[0] if k != 'id']
+            if not columns_names:
+                updated_ids.update(obj_data['id'] for obj_data in chunk)
+                continue
+            data: Values = (
+                values(
+                    *(column(k, getattr(self.model, k).type) for k in ('id', *columns_names)),
+                    name='data',
+                )
+                .data([tuple(obj_data[k] for k in ('id', *columns_names)) for obj_data in chunk])
+            )
+            stmt: Update = (
+                update(self.model)
+                .where(self.model.id == data.c.id)
+                .values({k: data.c[k] for k in columns_names})
+                .returning(self.model)
+                .execution_options(synchronize_session=False, populate_existing=True)
+            )
+            updated_ids.update(obj.id for obj in await self._execute_returning_all(stmt=stmt, session=session))
+
+        not_found_ids: list[int] = [obj_id for obj_id in objs_data if obj_id not in updated_ids]
+        if not_found_ids:
+            await session.rollback()
+            self._raise_value_error_not_found(ids=not_found_ids)
+
+        if perform_commit:
+            await session.commit()
+
+    async def bulk_increment(
+        self,
+        *,
+        key_column: str,
+        rows: dict[Any, dict[str, int | float]],
+        session: AsyncSession,
+        perform_commit: bool = True,
+    ) -> None:
+        """
+        Увеличивает числовые колонки нескольких объектов одним запросом
+        UPDATE ... SET col = col + v.col FROM (VALUES ...) AS v.
+
+        Увеличение выполняется на стороне базы данных, поэтому одновременные
+        изменения одного объекта не перезаписывают друг друга.
+
+        Атрибуты:
+            key_column: str - колонка, по которой определяется объект
+            rows: dict[Any, dict[str, int | float]] - {значение key_column: {колонка: прирост}}
+        """
+        rows: dict[Any, dict[str, int | float]] = {
+            key: {
+                k: v
+                for k, v in self._clean_obj_data_non_model_fields(obj_data=data).items()
+                if isinstance(v, (int, float)) and not isinstance(v, bool)
+            }
+            for key, data in rows.items()
+        }
+        columns_names: list[str] = sorted({k for data in rows.values() for k in data})
+        if not columns_names:
+            return
+
+        model_key_column: Any = getattr(self.model, key_column)
+        deltas: Values = (
+            values(
+                column(key_column, model_key_column.type),
+                *(column(k, getattr(self.model, k).type) for k in columns_names),
+                name='deltas',
+            )
+            .data([(key, *(data.get(k, 0) for k in columns_names)) for key, data in rows.items()])
+        )
+        stmt: Update = (
+            update(self.model)
+            .where(model_key_column == deltas.c[key_column])
+            .values({k: getattr(self.model, k) + deltas.c[k] for k in columns_names})
+            .execution_options(synchronize_session=False)
+        )
+        await session.execute(stmt)
+
+        if perform_commit:
+            await session.commit()
+
     async def delete_by_id(
         self,
         *,
@@ -166,14 +398,75 @@ class BaseAsyncCrud():
         if self.unique_columns is None:
             return
 
-        conditions: list = []
-        for column_name in self.unique_columns:
-            conditions.append(getattr(self.model, column_name) == obj_data[column_name])
-        query: Select = select(self.model).filter(*conditions)
-
-        if (await session.execute(query)).scalar() is not None:
+        params: dict[str, Any] = {column_name: obj_data[column_name] for column_name in self.unique_columns}
+        if (await session.execute(self._query_unique, params)).scalar() is not None:
             raise ValueError(self.unique_columns_err)
 
+    async def _execute_returning_one(
+        self,
+        *,
+        stmt: Insert | Update,
+        session: AsyncSession,
+    ) -> Base | None:
+        """
+        Выполняет запрос с RETURNING и возвращает первый объект.
+
+        При нарушении ограничений откатывает транзакцию; нарушение
+        уникальности выбрасывается как ValueError, остальные - как есть.
+        """
+        try:
+            return (await session.execute(stmt)).scalars().first()
+        except IntegrityError as e:
+            await session.rollback()
+            if getattr(e.orig, 'sqlstate', None) != SQLSTATE_UNIQUE_VIOLATION:
+                raise
+            raise ValueError(self.unique_columns_err) from e
+
+    async def _execute_returning_all(
+        self,
+        *,
+        stmt: Insert | Update,
+        session: AsyncSession,
+    ) -> list[Any]:
+        """
+        Выполняет запрос с RETURNING и возвращает все объекты.
+
+        При нарушении ограничений откатывает транзакцию; нарушение
+        уникальности выбрасывается как ValueError, остальные - как есть.
+        """
+        try:
+            return (await session.execute(stmt)).scalars().all()
+        except IntegrityError as e:
+            await session.rollback()
+            if getattr(e.orig, 'sqlstate', None) != SQLSTATE_UNIQUE_VIOLATION:
+                raise
+            raise ValueError(self.unique_columns_err) from e
+
+    def _split_objs_data_to_chunks(
+        self,
+        *,
+        objs_data: Iterable[dict[str, Any]],
+        perform_cleanup: bool = True,
+    ) -> list[list[dict[str, Any]]]:
+        """
+        Разбивает данные объектов на пачки для bulk_* методов.
+
+        В одной пачке находятся объекты с одинаковым набором колонок
+        (этого требует запрос с несколькими VALUES), размер пачки
+        ограничен BULK_CHUNK_SIZE объектами и BULK_PARAMS_MAX параметрами.
+        """
+        objs_data_by_columns: dict[tuple[str], list[dict[str, Any]]] = {}
+        for obj_data in objs_data:
+            if perform_cleanup:
+                obj_data: dict[str, Any] = self._clean_obj_data_non_model_fields(obj_data=obj_data)
+            objs_data_by_columns.setdefault(tuple(sorted(obj_data)), []).append(obj_data)
+
+        chunks: list[list[dict[str, Any]]] = []
+        for columns_names, group in objs_data_by_columns.items():
+            chunk_size: int = max(1, min(BULK_CHUNK_SIZE, BULK_PARAMS_MAX // max(1, len(columns_names))))
+            chunks.extend(group[i:i + chunk_size] for i in range(0, len(group), chunk_size))
+        return chunks
+
     def _clean_obj_data_non_model_fields(
         self,
         *,
@@ -186,18 +479,35 @@ class BaseAsyncCrud():
         Атрибуты:
             obj_data: dict[str, Any] - данные для обновления объекта
         """
-        model_valid_columns: set[str] = {
-            col.name
-            for col
-            in self.model.__table__.columns
-        }
         return {
             k: v
             for k, v
             in obj_data.items()
-            if k in model_valid_columns
+            if k in self._columns_names
         }
 
+    def _get_query_by_column(self, *, column_name: str) -> Select:
+        """
+        Возвращает запрос объектов по значению колонки
+        (значение передается параметром "value").
+        """
+        query: Select | None = self._queries_by_column.get(column_name)
+        if query is None:
+            query: Select = select(self.model).where(getattr(self.model, column_name) == bindparam('value'))
+            self._queries_by_column[column_name] = query
+        return query
+
+    async def _retrieve_one_by_column(
+        self,
+        *,
+        column_name: str,
+        value: Any,
+        session: AsyncSession,
+    ) -> Base | None:
+        """Получает один объект из базы данных по значению колонки."""
+        query: Select = self._get_query_by_column(column_name=column_name)
+        return (await session.execute(query, {'value': value})).scalars().first()
+
     def _raise_value_error_not_found(
         self,
         id: int | None = None,
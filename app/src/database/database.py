@@ -2,11 +2,20 @@
 Модуль соединения с базой данных через SQLAlchemy.
 """
 
+from time import monotonic
 from typing import AsyncGenerator
 
-from redis import Redis
+from redis.asyncio import (
+    BlockingConnectionPool,
+    Redis,
+)
 from sqlalchemy import create_engine
+from sqlalchemy.exc import TimeoutError as SQLAlchemyTimeoutError
 from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.pool import (
+    AsyncAdaptedQueuePool,
+    ConnectionPoolEntry,
+)
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
     AsyncSession,
@@ -15,13 +24,54 @@ from sqlalchemy.ext.asyncio import (
 )
 
 from app.src.config.config import settings
+from app.src.utils.metrics import (
+    MetricsNames,
+    metrics,
+)
 
 DATABASE_ASYNC_URL: str = f'postgresql+asyncpg://{settings.POSTGRES_USER}:{settings.POSTGRES_PASSWORD}@{settings.DB_HOST}:{settings.DB_PORT}/{settings.POSTGRES_DB}'
 DATABASE_SYNC_URL: str = f'postgresql+psycopg2://{settings.POSTGRES_USER}:{settings.POSTGRES_PASSWORD}@{settings.DB_HOST}:{settings.DB_PORT}/{settings.POSTGRES_DB}'
 
+
+class MeteredAsyncAdaptedQueuePool(AsyncAdaptedQueuePool):
+    """
+    Класс пула соединений, собирающий метрики: ожидание выдачи соединения
+    (включая установку нового соединения), таймауты ожидания, количество
+    выданных соединений и заполненность пула.
+    """
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        started: float = monotonic()
+        try:
+            connection: ConnectionPoolEntry = super()._do_get()
+        except SQLAlchemyTimeoutError:
+            metrics.inc(MetricsNames.DB_POOL_CHECKOUT_TIMEOUTS)
+            raise
+        metrics.observe(MetricsNames.DB_POOL_CHECKOUT_WAIT_SEC, monotonic() - started)
+
+        checked_out: int = self.checkedout()
+        metrics.set(MetricsNames.DB_POOL_CHECKED_OUT, checked_out)
+        metrics.observe(
+            MetricsNames.DB_POOL_SATURATION,
+            checked_out / max(1, settings.DB_POOL_SIZE + settings.DB_POOL_MAX_OVERFLOW),
+        )
+        return connection
+
+    def _do_return_conn(self, record: ConnectionPoolEntry) -> None:
+        super()._do_return_conn(record)
+        metrics.set(MetricsNames.DB_POOL_CHECKED_OUT, self.checkedout())
+
+
 async_engine: AsyncEngine = create_async_engine(
     url=DATABASE_ASYNC_URL,
     echo=settings.DEBUG_DB,
+    poolclass=MeteredAsyncAdaptedQueuePool,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_POOL_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT_SEC,
+    pool_recycle=settings.DB_POOL_RECYCLE_SEC,
+    pool_pre_ping=settings.DB_POOL_PRE_PING,
+    connect_args={'prepared_statement_cache_size': settings.DB_STATEMENT_CACHE_SIZE},
 )
 
 async_session_maker: async_sessionmaker = async_sessionmaker(
@@ -61,17 +111,35 @@ class RedisKeys:
 
     __PREFIX_SRC: str = 'src_'
 
+    # INFO. Префикс состояний FSM aiogram, полный ключ:
+    #       src_fsm_{chat_id}_{user_id}_{destiny}_{state|data}.
+    FSM: str = __PREFIX_SRC + 'fsm'
+
     __PREFIX_GAME: str = __PREFIX_SRC + 'game_'
     GAME_LOBBY: str = __PREFIX_GAME + 'lobby_{number}'
     GAME_LOBBY_BLOCKED: str = GAME_LOBBY + '_blocked'
     GAME_LOBBIES_AVALIABLE: str = __PREFIX_GAME + 'lobbies_avaliable'
+    GAME_PLAYERS: str = GAME_LOBBY + '_players'
+    GAME_ROUND_TIMERS: str = __PREFIX_GAME + 'round_timers'
+    GAME_ROUND_TIMERS_PAUSED: str = GAME_ROUND_TIMERS + '_paused'
+    GAME_ROUND_TIMERS_PROCESSING: str = GAME_ROUND_TIMERS + '_processing'
+    GAME_ROUND_TIMERS_NOTIFY: str = GAME_ROUND_TIMERS + '_notify'
+    GAME_PLAYER: str = GAME_LOBBY + '_player_'
+    GAME_PLAYER_ACHIEVEMENTS: str = GAME_PLAYER + '{id_telegram}_achievements'
+    GAME_PLAYER_STATISTIC: str = GAME_PLAYER + '{id_telegram}_statistic'
     GAME_SET_PENALTY: str = GAME_LOBBY + '_set_penalty'
+    # INFO. Колода слов лобби прежнего формата (удаляется при запуске бота,
+    #       см. game_storage.delete_legacy_games).
     GAME_WORDS: str = GAME_LOBBY + '_words'
 
     __PREFIX_CARDS: str = __PREFIX_SRC + 'cards_'
     ROLES: str = __PREFIX_CARDS + 'roles'
     RULES: str = __PREFIX_CARDS + 'rules'
     WORDS: str = __PREFIX_CARDS + 'words'
+    WORDS_VERSION: str = WORDS + '_version'
+    WORDS_PINNED: str = WORDS + '_{version}'
+
+    USER_CACHE_INVALIDATE: str = __PREFIX_SRC + 'user_cache_invalidate'
 
     __PREFIX_USER: str = __PREFIX_SRC + 'user_{id_telegram}_'
     USER_GAME_LOBBY_NUMBER: str = __PREFIX_USER + 'game_lobby_number'
@@ -86,10 +154,34 @@ class RedisKeys:
     MESSAGE_SET_PENALTY: str = __PREFIX_USER_MESSAGES + 'SET_PENALTY'
     MESSAGE_WORD: str = __PREFIX_USER_MESSAGES + 'WORD'
 
+    WORKER_UPDATES: str = __PREFIX_SRC + 'worker_{worker_id}_updates'
 
-redis_engine: Redis = Redis(
+
+# INFO. Пул блокирующий: при исчерпании соединений запрос ждет
+#       свободное соединение, а не падает.
+redis_pool: BlockingConnectionPool = BlockingConnectionPool(
+    host=settings.REDIS_HOST,
+    port=settings.REDIS_PORT,
+    db=settings.REDIS_DB_CACHE,
+    decode_responses=True,
+    # INFO. Бинарные значения (REDIS_SERIALIZER=msgpack) передаются через str
+    #       без потерь, на значения в UTF-8 не влияет.
+    encoding_errors='surrogateescape',
+    max_connections=settings.REDIS_POOL_MAX_CONNECTIONS,
+)
+# INFO. Пул для блокирующих команд (BLPOP ожидающих блокировку лобби): они
+#       занимают соединение на все время ожидания и не должны исчерпывать
+#       основной пул, через который владелец блокировки ее продлевает
+#       и освобождает. Свободное соединение ожидается без ограничения.
+redis_blocking_pool: BlockingConnectionPool = BlockingConnectionPool(
     host=settings.REDIS_HOST,
     port=settings.REDIS_PORT,
     db=settings.REDIS_DB_CACHE,
     decode_responses=True,
+    encoding_errors='surrogateescape',
+    max_connections=settings.REDIS_BLOCKING_POOL_MAX_CONNECTIONS,
+    timeout=None,
 )
+
+redis_engine: Redis = Redis(connection_pool=redis_pool)
+redis_blocking_engine: Redis = Redis(connection_pool=redis_blocking_pool)
@@ -1,28 +1,98 @@
-from asyncio import run as asyncio_run
+from asyncio import (
+    CancelledError,
+    Task,
+    create_task as asyncio_create_task,
+    run as asyncio_run,
+)
 from os import path as os_path
 from sys import path as sys_path
 
+from aiohttp import web
+
 # INFO: добавляет корневую директорию проекта в sys.path для возможности
 #       использования абсолютных путей импорта данных из модулей.
 sys_path.append(os_path.abspath(os_path.join(os_path.dirname(__file__), '../..')))
 
 from app.src.bot.bot import bot
 from app.src.bot.dispatcher import dp
+from app.src.config.config import (
+    BotModes,
+    settings,
+)
+from app.src.crud.user import user_crud
+from app.src.scheduler.round_timer import round_timers
 from app.src.scheduler.scheduler import scheduler
+from app.src.utils.metrics_server import start_metrics_server
 
 
-def on_startup() -> None:
+async def on_startup() -> None:
     """Выполняет действия при запуске бота."""
-    # INFO. Очистка кэша лобби.
+    # INFO. Очистка кэша лобби (перезапуск одного из воркеров
+    #       не должен сбрасывать кэш остальных).
+    if settings.is_worker:
+        return
     from app.src.database.database import RedisKeys
+    from app.src.utils.game_storage import delete_legacy_games
     from app.src.utils.redis_app import redis_delete
-    redis_delete(key=RedisKeys.GAME_LOBBIES_AVALIABLE)
+    await redis_delete(key=RedisKeys.GAME_LOBBIES_AVALIABLE)
+    # INFO. Лобби в прежнем формате (JSON-строка) вызвали бы WRONGTYPE в HGETALL.
+    await delete_legacy_games()
+
+
+async def on_shutdown() -> None:
+    """Выполняет действия при остановке бота."""
+    # INFO. Закрытие пулов соединений Redis.
+    from app.src.database.database import (
+        redis_blocking_engine,
+        redis_engine,
+    )
+    await redis_engine.aclose()
+    await redis_blocking_engine.aclose()
 
 
 async def main() -> None:
-    on_startup()
-    scheduler.start()
-    await dp.start_polling(bot)
+    await on_startup()
+    metrics_server: web.AppRunner | None = await start_metrics_server()
+    # INFO. Шлюз не обрабатывает апдейты, поэтому и задачи игр не выполняет.
+    round_timers_task: Task | None = None
+    user_cache_task: Task = asyncio_create_task(user_crud.listen_cache_invalidations())
+    if not settings.is_gateway:
+        scheduler.start()
+        round_timers_task = asyncio_create_task(round_timers.run())
+    try:
+        if settings.is_worker:
+            from app.src.bot.sharding import run_worker
+            await run_worker(worker_id=settings.WORKER_ID)
+            return
+
+        if settings.is_gateway:
+            from app.src.bot.sharding import UpdatesRouterMiddleware
+            dp.update.outer_middleware(UpdatesRouterMiddleware())
+
+        if settings.BOT_MODE == BotModes.WEBHOOK:
+            from app.src.bot.webhook import run_webhook
+            await run_webhook()
+        else:
+            # INFO. Telegram не отдает апдейты через getUpdates,
+            #       пока зарегистрирован webhook.
+            await bot.delete_webhook()
+            # INFO. Шлюз распределяет апдейты последовательно,
+            #       чтобы не нарушить их порядок в очередях воркеров.
+            await dp.start_polling(bot, handle_as_tasks=not settings.is_gateway)
+    finally:
+        # INFO. Остановка задач ожидается до закрытия Redis: обрабатываемые
+        #       таймеры завершаются или возвращаются в запущенные.
+        for task in (user_cache_task, round_timers_task):
+            if task is None:
+                continue
+            task.cancel()
+            try:
+                await task
+            except CancelledError:
+                pass
+        if metrics_server is not None:
+            await metrics_server.cleanup()
+        await on_shutdown()
 
 
 if __name__ == '__main__':
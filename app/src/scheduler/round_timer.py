@@ -0,0 +1,345 @@
+"""
+Модуль таймеров окончания раундов.
+
+Время окончания раунда каждого лобби хранится в Redis в сортированном
+множестве RedisKeys.GAME_ROUND_TIMERS (элемент - номер лобби, вес -
+unix-время окончания), поэтому:
+- запуск, продление и отмена таймера - O(log n) операции Redis
+  (в отличие от задач APScheduler в SQL таблице через синхронный движок);
+- таймеры переживают перезапуск процесса: просроченные за время
+  остановки раунды завершаются сразу после запуска;
+- сработавшие таймеры забирает любой процесс, и каждый таймер забирается
+  ровно одним процессом (Lua-скрипт извлекает их атомарно);
+- забранный таймер переносится в сортированное множество
+  RedisKeys.GAME_ROUND_TIMERS_PROCESSING (вес - срок аренды) и удаляется
+  из него только после успешной обработки: если обработчик завершился
+  ошибкой или процесс остановился, то по истечении аренды таймер
+  возвращается в запущенные и обрабатывается повторно;
+- процессы не опрашивают Redis: каждый ждет ближайшего окончания или
+  уведомления в канале RedisKeys.GAME_ROUND_TIMERS_NOTIFY, которое
+  публикуется при запуске, возобновлении и продлении таймера.
+
+Приостановленные таймеры хранятся в хеше RedisKeys.GAME_ROUND_TIMERS_PAUSED
+(поле - номер лобби, значение - оставшееся время в секундах) и не
+срабатывают до возобновления.
+"""
+
+from asyncio import (
+    CancelledError,
+    Event,
+    Task,
+    TimeoutError as AsyncioTimeoutError,
+    create_task as asyncio_create_task,
+    sleep as asyncio_sleep,
+    timeout as asyncio_timeout,
+    wait as asyncio_wait,
+)
+from time import time
+from typing import (
+    Awaitable,
+    Callable,
+)
+
+from aiogram import loggers
+from redis.asyncio.client import PubSub
+from redis.commands.core import AsyncScript
+
+from app.src.config.config import (
+    GameEngines,
+    settings,
+)
+from app.src.database.database import (
+    RedisKeys,
+    redis_engine,
+)
+
+# INFO. Максимальное время ожидания (сек) между проверками таймеров.
+#       Уведомления pub/sub доставляются не более одного раза (например,
+#       теряются при переподключении), поэтому редкая проверка страхует
+#       от пропущенного уведомления.
+ROUND_TIMER_WAIT_MAX_SEC: float = 30
+# INFO. Пауза (сек) перед повторной подпиской на уведомления после ошибки.
+ROUND_TIMER_RESUBSCRIBE_SEC: float = 1
+# INFO. Пауза (сек) перед повторной проверкой таймеров после ошибки.
+ROUND_TIMER_RETRY_SEC: float = 1
+# INFO. Максимальное количество таймеров, забираемых за одну проверку.
+ROUND_TIMER_CLAIM_BATCH: int = 100
+# INFO. Срок аренды (сек) забранного таймера: если обработка не подтверждена
+#       за это время, то таймер снова срабатывает. Повторная обработка
+#       безопасна: обработчик проверяет статус игры под блокировкой лобби.
+ROUND_TIMER_LEASE_SEC: float = 60
+# INFO. Сколько ждать (сек) завершения обработки таймеров при остановке процесса.
+ROUND_TIMER_DRAIN_SEC: float = 10
+
+# INFO. Возвращает в запущенные таймеры с истекшей арендой (кроме уже
+#       перезапущенных и приостановленных), затем извлекает до ARGV[2]
+#       таймеров со временем окончания <= ARGV[1] и выдает им аренду
+#       до ARGV[1] + ARGV[3].
+__LUA_CLAIM: str = """
+local expired = redis.call('zrangebyscore', KEYS[2], '-inf', ARGV[1])
+for _, number in ipairs(expired) do
+    redis.call('zrem', KEYS[2], number)
+    if redis.call('hexists', KEYS[3], number) == 0 then
+        redis.call('zadd', KEYS[1], 'NX', ARGV[1], number)
+    end
+end
+local due = redis.call('zrangebyscore', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, ARGV[2])
+local lease = tonumber(ARGV[1]) + tonumber(ARGV[3])
+for _, number in ipairs(due) do
+    redis.call('zrem', KEYS[1], number)
+    redis.call('zadd', KEYS[2], lease, number)
+end
+return due
+"""
+
+# INFO. Переносит таймер в приостановленные с оставшимся временем.
+#       Если таймер уже сработал (его нет среди запущенных), то
+#       приостанавливает его с временем ARGV[3], если оно передано.
+#       Возвращает 1, если таймер приостановлен.
+__LUA_PAUSE: str = """
+local deadline = redis.call('zscore', KEYS[1], ARGV[1])
+local remaining
+if deadline then
+    redis.call('zrem', KEYS[1], ARGV[1])
+    remaining = math.max(0, tonumber(deadline) - tonumber(ARGV[2]))
+elseif ARGV[3] ~= '' then
+    remaining = tonumber(ARGV[3])
+else
+    return 0
+end
+redis.call('hset', KEYS[2], ARGV[1], tostring(remaining))
+return 1
+"""
+
+# INFO. Возобновляет приостановленный таймер и публикует уведомление в канал ARGV[3].
+#       Возвращает 1, если таймер возобновлен.
+__LUA_RESUME: str = """
+local remaining = redis.call('hget', KEYS[2], ARGV[1])
+if not remaining then
+    return 0
+end
+redis.call('hdel', KEYS[2], ARGV[1])
+redis.call('zadd', KEYS[1], tonumber(ARGV[2]) + tonumber(remaining), ARGV[1])
+redis.call('publish', ARGV[3], ARGV[1])
+return 1
+"""
+
+# INFO. Продлевает запущенный или приостановленный таймер на ARGV[2] секунд
+#       (отрицательное значение сокращает) и публикует уведомление в канал
+#       ARGV[3], если таймер запущен. Возвращает 1, если таймер найден.
+__LUA_EXTEND: str = """
+if redis.call('zscore', KEYS[1], ARGV[1]) then
+    redis.call('zincrby', KEYS[1], ARGV[2], ARGV[1])
+    redis.call('publish', ARGV[3], ARGV[1])
+    return 1
+end
+if redis.call('hexists', KEYS[2], ARGV[1]) == 1 then
+    redis.call('hincrbyfloat', KEYS[2], ARGV[1], ARGV[2])
+    return 1
+end
+return 0
+"""
+
+_script_claim: AsyncScript = redis_engine.register_script(__LUA_CLAIM)
+_script_pause: AsyncScript = redis_engine.register_script(__LUA_PAUSE)
+_script_resume: AsyncScript = redis_engine.register_script(__LUA_RESUME)
+_script_extend: AsyncScript = redis_engine.register_script(__LUA_EXTEND)
+
+
+class RoundTimers:
+    """
+    Класс сервиса таймеров окончания раундов.
+
+    Атрибуты:
+        key: str - ключ сортированного множества запущенных таймеров в Redis
+        paused_key: str - ключ хеша приостановленных таймеров в Redis
+        processing_key: str - ключ сортированного множества обрабатываемых таймеров в Redis
+        channel: str - канал уведомлений об изменении ближайших окончаний
+    """
+
+    def __init__(self, key: str, paused_key: str, processing_key: str, channel: str):
+        self.key: str = key
+        self.paused_key: str = paused_key
+        self.processing_key: str = processing_key
+        self.channel: str = channel
+        self.__handler: Callable[[str], Awaitable[None]] | None = None
+        self.__wakeup: Event = Event()
+        # INFO. Выполняющиеся обработчики: {задача: номер лобби}.
+        self.__tasks: dict[Task, str] = {}
+
+    def register_handler(self, handler: Callable[[str], Awaitable[None]]) -> None:
+        """Регистрирует обработчик сработавшего таймера (принимает номер лобби)."""
+        self.__handler = handler
+
+    async def start(self, number: str, delay_sec: float) -> None:
+        """Запускает (или перезапускает) таймер лобби."""
+        async with redis_engine.pipeline(transaction=True) as pipe:
+            pipe.hdel(self.paused_key, number)
+            # INFO. Новый таймер заменяет незавершенную обработку предыдущего.
+            pipe.zrem(self.processing_key, number)
+            pipe.zadd(self.key, {number: time() + delay_sec})
+            pipe.publish(self.channel, number)
+            await pipe.execute()
+        self.__wakeup.set()
+
+    async def cancel(self, number: str) -> bool:
+        """Отменяет запущенный или приостановленный таймер лобби. Возвращает False, если таймера не было."""
+        async with redis_engine.pipeline(transaction=True) as pipe:
+            pipe.zrem(self.key, number)
+            pipe.hdel(self.paused_key, number)
+            pipe.zrem(self.processing_key, number)
+            return any(await pipe.execute())
+
+    async def pause(self, number: str, remaining_sec: float | None = None) -> bool:
+        """
+        Приостанавливает таймер лобби, сохраняя оставшееся время.
+
+        Если таймер уже сработал, то он приостанавливается с временем
+        remaining_sec (если передано): так обработчик сработавшего таймера
+        может отложить окончание раунда до возобновления.
+        """
+        return bool(
+            await _script_pause(
+                keys=(self.key, self.paused_key),
+                args=(number, time(), '' if remaining_sec is None else remaining_sec),
+            ),
+        )
+
+    async def resume(self, number: str) -> bool:
+        """Возобновляет приостановленный таймер лобби. Возвращает False, если таймер не был приостановлен."""
+        resumed: bool = bool(
+            await _script_resume(keys=(self.key, self.paused_key), args=(number, time(), self.channel)),
+        )
+        if resumed:
+            self.__wakeup.set()
+        return resumed
+
+    async def extend(self, number: str, delta_sec: float) -> bool:
+        """Продлевает (или сокращает) таймер лобби. Возвращает False, если таймера нет."""
+        extended: bool = bool(
+            await _script_extend(keys=(self.key, self.paused_key), args=(number, delta_sec, self.channel)),
+        )
+        if extended:
+            self.__wakeup.set()
+        return extended
+
+    async def run(self) -> None:
+        """
+        Ожидает и обрабатывает сработавшие таймеры.
+        Ошибки Redis не останавливают задачу: проверка повторяется после паузы.
+        """
+        listener: Task = asyncio_create_task(self.__listen())
+        try:
+            while 1:
+                try:
+                    delay: float = await self.__process_due()
+                except CancelledError:
+                    raise
+                except Exception:
+                    loggers.event.exception('Cause exception while process round timers')
+                    await asyncio_sleep(ROUND_TIMER_RETRY_SEC)
+                    continue
+
+                try:
+                    async with asyncio_timeout(delay):
+                        await self.__wakeup.wait()
+                except AsyncioTimeoutError:
+                    pass
+        finally:
+            listener.cancel()
+            await self.__drain()
+
+    async def __process_due(self) -> float:
+        """Забирает сработавшие таймеры и возвращает время (сек) до ближайшей проверки."""
+        # INFO. Сброс до запроса к Redis: изменение таймеров во время
+        #       запросов снова разбудит ожидание.
+        self.__wakeup.clear()
+        await self.__claim_due()
+
+        async with redis_engine.pipeline(transaction=False) as pipe:
+            pipe.zrange(self.key, 0, 0, withscores=True)
+            pipe.zrange(self.processing_key, 0, 0, withscores=True)
+            nearest: list[list[tuple[str, float]]] = await pipe.execute()
+        delay: float = ROUND_TIMER_WAIT_MAX_SEC
+        for scores in nearest:
+            if scores:
+                delay = max(0, min(delay, scores[0][1] - time()))
+        return delay
+
+    async def __listen(self) -> None:
+        """Будит ожидание таймеров по уведомлениям из канала (в том числе от других процессов)."""
+        while 1:
+            pubsub: PubSub = redis_engine.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(self.channel)
+                # INFO. Уведомления, опубликованные до подписки, могли быть
+                #       пропущены, поэтому ближайшее окончание перечитывается.
+                self.__wakeup.set()
+                async for _ in pubsub.listen():
+                    self.__wakeup.set()
+            except CancelledError:
+                raise
+            except Exception:
+                loggers.event.exception('Cause exception while listen round timers channel')
+                await asyncio_sleep(ROUND_TIMER_RESUBSCRIBE_SEC)
+            finally:
+                await pubsub.aclose()
+
+    async def __claim_due(self) -> None:
+        """Забирает сработавшие таймеры и запускает их обработку."""
+        numbers: list[str] = await _script_claim(
+            keys=(self.key, self.processing_key, self.paused_key),
+            args=(time(), ROUND_TIMER_CLAIM_BATCH, ROUND_TIMER_LEASE_SEC),
+        )
+        for number in numbers:
+            task: Task = asyncio_create_task(self.__handle(number=number))
+            self.__tasks[task] = number
+            task.add_done_callback(self.__tasks.pop)
+
+    async def __handle(self, number: str) -> None:
+        """Вызывает обработчик сработавшего таймера и подтверждает обработку."""
+        try:
+            await self.__handler(number)
+        except Exception:
+            # INFO. Аренда не снимается: таймер сработает повторно по ее истечении.
+            loggers.event.exception('Cause exception while process round timer of lobby %s', number)
+            return
+        await redis_engine.zrem(self.processing_key, number)
+
+    async def __drain(self) -> None:
+        """
+        Ожидает завершения обработки забранных таймеров при остановке,
+        а не успевшие обработаться таймеры возвращает в запущенные.
+        """
+        if not self.__tasks:
+            return
+        _, pending = await asyncio_wait(self.__tasks, timeout=ROUND_TIMER_DRAIN_SEC)
+        numbers: list[str] = [self.__tasks[task] for task in pending]
+        for task in pending:
+            task.cancel()
+        if not numbers:
+            return
+        now: float = time()
+        async with redis_engine.pipeline(transaction=True) as pipe:
+            pipe.zrem(self.processing_key, *numbers)
+            pipe.zadd(self.key, {number: now for number in numbers}, nx=True)
+            await pipe.execute()
+
+
+# INFO. При GAME_ENGINE=actor таймер лобби должен сработать у воркера-владельца
+#       лобби (там находится актор лобби), поэтому у каждого воркера свои ключи
+#       таймеров: таймеры запускаются только командами лобби, то есть владельцем.
+#       Владелец определяется по WORKERS_COUNT, поэтому при его изменении таймеры
+#       начатых игр остаются в ключах прежнего владельца.
+__KEYS_SUFFIX: str = (
+    f'_{settings.WORKER_ID}'
+    if settings.GAME_ENGINE == GameEngines.ACTOR and settings.is_worker
+    else ''
+)
+
+round_timers: RoundTimers = RoundTimers(
+    key=RedisKeys.GAME_ROUND_TIMERS + __KEYS_SUFFIX,
+    paused_key=RedisKeys.GAME_ROUND_TIMERS_PAUSED + __KEYS_SUFFIX,
+    processing_key=RedisKeys.GAME_ROUND_TIMERS_PROCESSING + __KEYS_SUFFIX,
+    channel=RedisKeys.GAME_ROUND_TIMERS_NOTIFY + __KEYS_SUFFIX,
+)
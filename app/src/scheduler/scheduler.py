@@ -5,6 +5,11 @@ from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from app.src.config.config import Timezones
 from app.src.database.database import sync_engine
 
+# INFO. Таймеры окончания раундов работают без APScheduler
+#       (см. app/src/scheduler/round_timer.py), поэтому единственная задача -
+#       разовая sync_images, которую сразу выполняет процесс, получивший
+#       команду. Планировщики остальных процессов без своих задач общую
+#       таблицу не опрашивают, поэтому отдельные таблицы воркерам не нужны.
 scheduler: AsyncIOScheduler = AsyncIOScheduler(
     timezone=Timezones.MOSCOW,
     executors={'default': AsyncIOExecutor()},
@@ -19,6 +24,3 @@ class SchedulerJobNames:
 
     # Image.
     SYNC_IMAGES: str = 'sync_images'
-
-    # Game.
-    GAME_END_ROUND: str = 'game_{number}_end_round'
@@ -0,0 +1,74 @@
+"""
+Модуль in-process кешей приложения.
+
+Кеш ограничен по размеру (вытесняются давно не используемые записи - LRU)
+и по времени жизни записи (TTL). Кеш процесса не видит изменений,
+сделанных другими процессами: их записи нужно удалять по уведомлениям
+(см. app.src.crud.user), а TTL ограничивает время, в течение которого
+запись может быть устаревшей, если уведомление потеряно.
+"""
+
+from collections import OrderedDict
+from time import monotonic
+from typing import Any
+
+from app.src.utils.metrics import metrics
+
+
+class LruTtlCache:
+    """
+    Класс кеша с вытеснением LRU и временем жизни записей.
+
+    Атрибуты:
+        max_size: int - максимальное количество записей (0 - кеш отключен)
+        ttl: float - время жизни записи (сек)
+        metric_hits: str - название метрики попаданий
+        metric_misses: str - название метрики промахов
+    """
+
+    def __init__(
+        self,
+        max_size: int,
+        ttl: float,
+        metric_hits: str,
+        metric_misses: str,
+    ):
+        self.max_size: int = max_size
+        self.ttl: float = ttl
+        self.metric_hits: str = metric_hits
+        self.metric_misses: str = metric_misses
+        # INFO. {ключ: (время истечения, значение)}, порядок - от давно
+        #       использованных записей к недавно использованным.
+        self.__data: OrderedDict[Any, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: Any) -> Any | None:
+        """Возвращает значение по ключу или None, если записи нет или она истекла."""
+        item: tuple[float, Any] | None = self.__data.get(key)
+        if item is None or item[0] <= monotonic():
+            if item is not None:
+                del self.__data[key]
+            metrics.inc(self.metric_misses)
+            return None
+        self.__data.move_to_end(key)
+        metrics.inc(self.metric_hits)
+        return item[1]
+
+    def set(self, key: Any, value: Any) -> None:
+        """Записывает значение по ключу, при переполнении вытесняет давно не использованную запись."""
+        if self.max_size <= 0:
+            return
+        self.__data[key] = (monotonic() + self.ttl, value)
+        self.__data.move_to_end(key)
+        while len(self.__data) > self.max_size:
+            self.__data.popitem(last=False)
+
+    def delete(self, key: Any) -> None:
+        """Удаляет запись по ключу."""
+        self.__data.pop(key, None)
+
+    def clear(self) -> None:
+        """Удаляет все записи."""
+        self.__data.clear()
+
+    def __len__(self) -> int:
+        return len(self.__data)
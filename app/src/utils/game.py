@@ -1,6 +1,7 @@
 from asyncio import (
     Task,
     create_task as asyncio_create_task,
+    current_task as asyncio_current_task,
     gather as asyncio_gather,
     sleep as asyncio_sleep,
 )
@@ -8,12 +9,18 @@ from datetime import (
     datetime,
     timedelta,
 )
-from typing import Any
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+)
 from random import (
     choice,
+    getrandbits,
     shuffle,
 )
 
+from aiogram import loggers
 from aiogram.fsm.context import FSMContext
 from aiogram.fsm.state import (
     StatesGroup,
@@ -24,31 +31,40 @@ from aiogram.types import (
     ReplyKeyboardMarkup,
     ReplyKeyboardRemove,
 )
-from apscheduler.jobstores.base import JobLookupError
 
 from app.src.bot.bot import bot
 from app.src.bot.routers.start import command_start
 from app.src.config.config import (
-    TimeIntervals,
+    GameEngines,
     Timezones,
+    settings,
 )
-from app.src.crud.user import user_crud
 from app.src.crud.user_achievement import user_achievement_crud
 from app.src.crud.user_statistic import user_statistic_crud
 from app.src.database.database import (
     RedisKeys,
     async_session_maker,
 )
-from app.src.models.user import User
-from app.src.models.user_achievement import UserAchievement
 from app.src.models.user_statistic import UserStatistic
-from app.src.scheduler.scheduler import (
-    SchedulerJobNames,
-    scheduler,
+from app.src.scheduler.round_timer import round_timers
+from app.src.utils.game_actor import (
+    GameActor,
+    current_game_actor,
+    game_actors,
+)
+from app.src.utils.game_storage import (
+    GameVersionConflictError,
+    delete_game,
+    incr_players_statistic,
+    load_game,
+    save_game,
+    save_players_results,
+    set_players_achievements,
+    update_game_fields,
 )
 from app.src.utils.image import (
     get_role_image_cards,
-    get_shuffled_words_cards,
+    words_deck,
 )
 from app.src.utils.message import (
     MessagesEvents,
@@ -66,6 +82,7 @@ from app.src.utils.reply_keyboard import (
     KEYBOARD_LOBBY_SUPERVISOR_IN_GAME_RETELL,
     KEYBOARD_LOBBY_SUPERVISOR_IN_GAME_RETELL_FAIL,
 )
+from app.src.utils.redis_lock import RedisLock
 from app.src.utils.redis_app import (
     redis_check_exists,
     redis_delete,
@@ -80,9 +97,8 @@ from app.src.validators.game import (
 )
 from app.src.validators.user import UserAchievementDescription
 
-# INFO. Словарь с игрой в конечно форме (хранится в Redis):
-# TODO. Вынести все из одного словаря в отдельные, чтобы ускорить работу с памятью.
-#       (например, достижения и статистика).
+# INFO. Словарь с игрой в конечной форме (хранится в Redis в нескольких
+#       Redis Hash, см. модуль app.src.utils.game_storage):
 # game = {
 #     'number': '1234',
 #     'password': '1234',
@@ -92,6 +108,8 @@ from app.src.validators.user import UserAchievementDescription
 #     'host_chat_id': 87654321,
 #     'host_lobby_message_id': 123,
 #
+#     'cards_seed': 2805924713,
+#     'cards_version': 1534120875,
 #     'card_index': 0,
 #
 #     'players': {
@@ -124,14 +142,29 @@ from app.src.validators.user import UserAchievementDescription
 #     'round_correct_words': ['word1', 'word2', 'word3', ...],
 # }
 
-# INFO. Словарь с картинками для игры (хранится в Redis):
-# # TODO. Можно ограничить количество карт. В игре участвует N игроков,
-#         в раунде используется не более N слов, тогда нужно N*M слов.
-# 'game_cards_ids': {
-#     0: ('word_name', 1234),
-#     1: ('word_name, 1235),
-#     ...
-# },
+# INFO. Карты слов игры не копируются: игра хранит зерно случайного порядка
+#       общей колоды (cards_seed), ее версию (cards_version) и индекс текущей
+#       карты (card_index), см. app.src.utils.image.WordsDeck.
+
+# INFO. Время жизни блокировки лобби (мс). Пока блокировка удерживается,
+#       она продлевается в фоне, поэтому долгие рассылки не приводят к ее истечению.
+GAME_LOCK_LEASE_MS: int = 5_000
+
+# INFO. Поля игры, необходимые для валидации команд игроков в ходе игры.
+GAME_VALIDATION_FIELDS: tuple[str] = (
+    'number',
+    'players_dreaming_order',
+    'redis_key',
+    'status',
+    'supervisor_index',
+)
+
+# INFO. Блокировки лобби, удерживаемые задачами этого процесса:
+#       {(номер лобби, задача): блокировка}.
+__GAME_LOCKS: dict[tuple[str, Task], RedisLock] = {}
+__GAME_LOCKS_RELEASE_TASKS: set[Task] = set()
+# INFO. Фоновые задачи, не удерживающие лобби (ссылки защищают их от сборщика мусора).
+__GAME_BACKGROUND_TASKS: set[Task] = set()
 
 
 class GameForm(StatesGroup):
@@ -175,7 +208,7 @@ def form_lobby_host_message(game: dict[str, Any]) -> str:
     )
 
 
-def process_avaliable_game_numbers(
+async def process_avaliable_game_numbers(
     get: bool = False,
     add_number: str | None = None,
     remove_number: str | None = None,
@@ -184,7 +217,7 @@ def process_avaliable_game_numbers(
     Используя Redis Set, возвращает или модифицирует
     список номеров доступных игр.
     """
-    return redis_sset_process(
+    return await redis_sset_process(
         key=RedisKeys.GAME_LOBBIES_AVALIABLE,
         get=get,
         add_value=add_number,
@@ -196,27 +229,18 @@ async def send_game_start_messages(game: dict[str, Any]) -> None:
     """Отправляет сообщение игрокам в начале игры."""
 
     async def __set_players_last_game_datetime(
-        id_telegram: str | int,
+        users_ids_telegram: list[str],
         datetime_now: datetime,
     ) -> None:
-        """Обновляет время последней игры у игрока."""
+        """Обновляет время последней игры и количество игр у игроков одним запросом."""
         async with async_session_maker() as session:
-            user: User = await user_crud.retrieve_by_id_telegram(
-                obj_id_telegram=id_telegram,
-                session=session,
-            )
-            user_statistic: UserStatistic = await user_statistic_crud.retrieve_by_user_id(
-                user_id=user.id,
-                session=session,
-            )
-            await user_statistic_crud.update_by_id(
-                obj_id=user_statistic.id,
+            await user_statistic_crud.update_by_users_ids_telegram(
+                users_ids_telegram=users_ids_telegram,
                 obj_data={
                     'last_game_datetime': datetime_now,
-                    'total_games': user_statistic.total_games + 1,
+                    'total_games': UserStatistic.total_games + 1,
                 },
                 session=session,
-                perform_check_unique=False,
             )
 
     async def __send_game_start_message(chat_id: int) -> None:
@@ -247,11 +271,10 @@ async def send_game_start_messages(game: dict[str, Any]) -> None:
     ] + [
         asyncio_create_task(
             __set_players_last_game_datetime(
-                id_telegram=data['chat_id'],
+                users_ids_telegram=list(game['players']),
                 datetime_now=datetime_now,
             ),
-        )
-        for data in game['players'].values()
+        ),
     ]
     await asyncio_gather(*tasks)
 
@@ -289,15 +312,13 @@ async def setup_game_data(game: dict[str, Any]) -> None:
     """Подготавливает данные для игры."""
     for k in ('host_chat_id', 'host_lobby_message_id'):
         del game[k]
-    game_cards_ids: list[str, str] = await get_shuffled_words_cards()
-    redis_set(
-        key=RedisKeys.GAME_WORDS.format(number=game['number']),
-        value=game_cards_ids,
-    )
+    await words_deck.refresh()
     game.update(
         {
             'status': GameStatus.PREPARE_NEXT_ROUND,
 
+            'cards_seed': getrandbits(32),
+            'cards_version': words_deck.version,
             'card_index': 0,
 
             'players_dreaming_order': __get_players_dreaming_order(players=list(game['players'].keys())),
@@ -324,7 +345,9 @@ async def setup_game_data(game: dict[str, Any]) -> None:
                 'achievements': {},
             },
         )
-    await process_game_in_redis(redis_key=game['redis_key'], set_game=game)
+    await save_players_results(game=game)
+    # INFO. Блокировку лобби освобождает вызывающий после рассылки сообщений начала игры.
+    await save_game(game=game)
 
 
 # -----------------------------------------------------------------------------
@@ -336,8 +359,29 @@ async def process_in_game(
     message: Message,
     state: FSMContext,
 ) -> None:
-    """Обрабатывает команды игроков в ходе игры."""
-    game: dict[str, Any] = await process_game_in_redis(message=message, get=True)
+    """
+    Обрабатывает команды игроков в ходе игры.
+
+    При GAME_ENGINE=actor команда выполняется актором лобби игрока.
+    """
+    return await process_game_command(
+        command=lambda: __process_in_game(message=message, state=state),
+        message=message,
+    )
+
+
+async def __process_in_game(
+    message: Message,
+    state: FSMContext,
+) -> None:
+    """Обрабатывает команды игроков в ходе игры (в лобби уже определенной игры)."""
+    # INFO. Для валидации достаточно нескольких полей игры: лишние нажатия
+    #       игроков не приводят к извлечению всей игры из Redis.
+    game: dict[str, Any] = await process_game_in_redis(
+        message=message,
+        get=True,
+        fields=GAME_VALIDATION_FIELDS,
+    )
     state_value: str = await state.get_state()
     if not await __process_in_game_validate_message_text(
         game=game,
@@ -346,6 +390,7 @@ async def process_in_game(
     ):
         await process_game_in_redis(redis_key=game['redis_key'], release=True)
         return await delete_messages_list(chat_id=message.chat.id, messages_ids=(message.message_id,))
+    game: dict[str, Any] = await process_game_in_redis(redis_key=game['redis_key'], get=True)
 
     # INFO. Подтверждение действий.
     if state_value == GameForm.in_game_destroy_game:
@@ -380,6 +425,8 @@ async def process_in_game(
         await __process_in_game_drop_game(message=message, state=state)
     elif message.text == RoutersCommands.HOME:
         await __process_in_game_home(game=game, message=message, state=state)
+    else:
+        await process_game_in_redis(redis_key=game['redis_key'], release=True)
 
 
 async def __process_in_game_validate_message_text(
@@ -500,6 +547,7 @@ async def process_in_game_destroy_game_confirm(
         if message.text not in (RoutersCommands.YES, RoutersCommands.NO):
             return await process_game_in_redis(redis_key=game['redis_key'], release=True)
         elif message.text == RoutersCommands.NO:
+            await process_game_in_redis(redis_key=game['redis_key'], release=True)
             await state.set_state(state=GameForm.in_game)
             # INFO. Затрется reply-клавиатура, надо удалить роль и выслать заново.
             for k in (MessagesEvents.GAME_DESTROY, MessagesEvents.ROLE):
@@ -518,13 +566,10 @@ async def process_in_game_destroy_game_confirm(
     game['status'] = GameStatus.FINISHED
     await delete_user_messages(chat_id=message.chat.id, event_key=MessagesEvents.GAME_DESTROY)
     await process_game_in_redis(redis_key=game['redis_key'], set_game=game)
-    process_avaliable_game_numbers(remove_number=game['number'])
+    await process_avaliable_game_numbers(remove_number=game['number'])
 
     if not from_lobby:
-        try:
-            scheduler.remove_job(job_id=SchedulerJobNames.GAME_END_ROUND.format(number=game['number']))
-        except JobLookupError:
-            pass
+        await round_timers.cancel(number=game['number'])
 
     # INFO. Даже если человек в лобби, нужно поставить состояние GameForm.in_game,
     #       чтобы он смог обработать команду "RoutersCommands.HOME".
@@ -576,9 +621,10 @@ async def __process_in_game_drop_game_confirm(
     await delete_messages_list(chat_id=message.chat.id, messages_ids=(message.message_id,))
 
     if message.text not in (RoutersCommands.YES, RoutersCommands.NO):
-        return
+        return await process_game_in_redis(redis_key=game['redis_key'], release=True)
 
     if message.text == RoutersCommands.NO:
+        await process_game_in_redis(redis_key=game['redis_key'], release=True)
         await state.set_state(state=GameForm.in_game)
         # INFO. Затрется reply-клавиатура, надо удалить роль и выслать заново.
         for k in (MessagesEvents.GAME_DROP, MessagesEvents.ROLE):
@@ -593,17 +639,11 @@ async def __process_in_game_drop_game_confirm(
         )
 
     async with async_session_maker() as session:
-        # TODO. Оптимизировать в один запрос.
-        user: User = await user_crud.retrieve_by_id_telegram(
-            obj_id_telegram=message.from_user.id,
-            session=session,
-        )
-        current_statistic: UserStatistic = await user_statistic_crud.retrieve_by_user_id(
-            user_id=user.id,
+        await user_statistic_crud.update_by_user_id_telegram(
+            user_id_telegram=message.from_user.id,
+            obj_data={'total_quits': UserStatistic.total_quits + 1},
             session=session,
         )
-        current_statistic.total_quits = current_statistic.total_quits + 1
-        await session.commit()
 
     # INFO. -1 так как из game игрок еще не был удален.
     # TODO. Удалить игрока из game в этом месте, а не в функциях ниже.
@@ -618,6 +658,18 @@ async def __process_in_game_drop_game_confirm(
         reply_markup=ReplyKeyboardRemove(),
     )
     await delete_user_messages(chat_id=message.chat.id, all_event_keys=True)
+    # INFO. Игрок уже покинул лобби, поэтому прощание не задерживает
+    #       обработку команд остальных игроков (актор лобби или блокировку).
+    task: Task = asyncio_create_task(__process_in_game_drop_game_farewell(message=message, answer=answer))
+    __GAME_BACKGROUND_TASKS.add(task)
+    task.add_done_callback(__GAME_BACKGROUND_TASKS.discard)
+
+
+async def __process_in_game_drop_game_farewell(
+    message: Message,
+    answer: Message,
+) -> None:
+    """Удаляет прощальное сообщение покинувшему игру игроку и возвращает его в главное меню."""
     await asyncio_sleep(5)
     await delete_messages_list(chat_id=message.chat.id, messages_ids=(answer.message_id,))
     await command_start(message=message)
@@ -646,7 +698,7 @@ async def __process_in_game_set_penalty(
     )
     await state.set_state(state=GameForm.in_game_set_penalty)
 
-    redis_set(key=RedisKeys.GAME_SET_PENALTY.format(number=game['number']), value=1)
+    await redis_set(key=RedisKeys.GAME_SET_PENALTY.format(number=game['number']), value=1)
     await process_game_in_redis(redis_key=game['redis_key'], release=True)
 
 
@@ -659,8 +711,11 @@ async def __process_in_game_set_penalty_confirm(
     """Обрабатывает результат ответа на команду "Выдать штраф"."""
 
     async def __exit(game: dict[str, Any]) -> None:
-        redis_delete(key=RedisKeys.GAME_SET_PENALTY.format(number=game['number']))
-        await process_game_in_redis(redis_key=game['redis_key'], set_game=game)
+        await redis_delete(key=RedisKeys.GAME_SET_PENALTY.format(number=game['number']))
+        # INFO. Если раунд закончился во время назначения пенальти, то его
+        #       окончание было отложено и выполнится сразу после возобновления.
+        await round_timers.resume(number=game['number'])
+        await process_game_in_redis(redis_key=game['redis_key'], release=True)
 
         await state.set_state(state=GameForm.in_game)
 
@@ -670,7 +725,7 @@ async def __process_in_game_set_penalty_confirm(
             id_telegram=str(message.from_user.id),
             data=game['players'][str(message.from_user.id)],
             game=game,
-            game_cards_ids=redis_get(key=RedisKeys.GAME_WORDS.format(number=game['number'])),
+            card_file_id=(await __get_word_card(game=game))[1],
             send_supervisor_keyboard=True,
         )
 
@@ -686,8 +741,7 @@ async def __process_in_game_set_penalty_confirm(
             break
 
     if penalty_id_telegram:
-        game['players'][penalty_id_telegram]['statistic']['top_penalties'] += 1
-        await process_game_in_redis(redis_key=game['redis_key'], set_game=game)
+        await incr_players_statistic(game=game, deltas={penalty_id_telegram: {'top_penalties': 1}})
         return await __exit(game=game)
     else:
         await process_game_in_redis(redis_key=game['redis_key'], release=True)
@@ -711,17 +765,17 @@ async def __process_in_game_answer(
     # INFO. Проверка от дабл-кликов.
     datetime_now: datetime = datetime.now()
     last_check_answer_datetime: datetime = datetime.fromisoformat(game['last_check_answer_datetime'])
-    if datetime_now < last_check_answer_datetime + timedelta(seconds=5):
-        return
-    game['last_check_answer_datetime'] = datetime_now.strftime('%Y-%m-%d %H:%M:%S.%f')
+    if datetime_now < last_check_answer_datetime + timedelta(seconds=GameParams.ANSWER_DEBOUNCE_SEC):
+        return await process_game_in_redis(redis_key=game['redis_key'], release=True)
 
+    fields: dict[str, Any] = {'last_check_answer_datetime': datetime_now.strftime('%Y-%m-%d %H:%M:%S.%f')}
     if is_correct:
-        game['round_correct_count'] += 1
-        card_ids: list[str, str] = redis_get(key=RedisKeys.GAME_WORDS.format(number=game['number']))
-        game['round_correct_words'].append(card_ids[game['card_index']][0])
+        word: str = (await __get_word_card(game=game))[0]
+        fields['round_correct_words'] = game['round_correct_words'] + [word]
+        incr: dict[str, int] = {'round_correct_count': 1}
     else:
-        game['round_incorrect_count'] += 1
-    await __send_new_word(game=game)
+        incr: dict[str, int] = {'round_incorrect_count': 1}
+    await __send_new_word(game=game, fields=fields, incr=incr)
 
 
 async def __process_in_game_start_round(
@@ -731,7 +785,6 @@ async def __process_in_game_start_round(
     """Обрабатывает команду "Начать раунд"."""
     await delete_messages_list(chat_id=message.chat.id, messages_ids=(message.message_id,))
 
-    game['status'] = GameStatus.ROUND_IS_STARTED
     answer: Message = await bot.send_message(
         chat_id=game['players_dreaming_order'][game['supervisor_index']],
         text='Раунд начался!',
@@ -742,15 +795,9 @@ async def __process_in_game_start_round(
         messages=[answer],
     )
 
-    await __send_new_word(game=game)
+    await __send_new_word(game=game, fields={'status': GameStatus.ROUND_IS_STARTED})
 
-    scheduler.add_job(
-        id=SchedulerJobNames.GAME_END_ROUND.format(number=game['number']),
-        func=__process_in_game_end_round_ask_for_retail,
-        trigger='date',
-        next_run_time=datetime.now(tz=Timezones.MOSCOW) + timedelta(minutes=2),
-        kwargs={'redis_key': game['redis_key']},
-    )
+    await round_timers.start(number=game['number'], delay_sec=GameParams.ROUND_DURATION_SEC)
 
 
 async def __process_in_game_home(
@@ -762,11 +809,11 @@ async def __process_in_game_home(
     game['players'].pop(str(message.from_user.id), None)
     if len(game['players']) == 0:
         await process_game_in_redis(redis_key=game['redis_key'], delete=True)
-        process_avaliable_game_numbers(remove_number=game['number'])
+        await process_avaliable_game_numbers(remove_number=game['number'])
     else:
         if game['status'] == GameStatus.IN_LOBBY:
             if len(game['players']) < GameParams.PLAYERS_MIN:
-                process_avaliable_game_numbers(add_number=game['number'])
+                await process_avaliable_game_numbers(add_number=game['number'])
             await bot.edit_message_text(
                 chat_id=game['host_chat_id'],
                 message_id=game['host_lobby_message_id'],
@@ -796,27 +843,21 @@ async def __process_in_game_end_game(
             reply_markup=KEYBOARD_HOME,
         )
 
-    async def __process_in_game_end_game_update_user_db(
-        data: dict[str, Any],
-    ) -> None:
-        """Обновляет статистику и достижения игрока."""
+    async def __process_in_game_end_game_update_users_db(game: dict[str, Any]) -> None:
+        """Обновляет статистику и достижения всех игроков одной транзакцией."""
         async with async_session_maker() as session:
-            current_statistic: UserStatistic = await user_statistic_crud.retrieve_by_user_id(
-                user_id=data['id'],
+            await user_statistic_crud.bulk_increment(
+                key_column='user_id',
+                rows={data['id']: data['statistic'] for data in game['players'].values()},
                 session=session,
+                perform_commit=False,
             )
-            for k, v in data['statistic'].items():
-                if hasattr(current_statistic, k) and isinstance(v, (int, float)):
-                    setattr(current_statistic, k, getattr(current_statistic, k) + v)
-
-            current_achievement: UserAchievement = await user_achievement_crud.retrieve_by_user_id(
-                user_id=data['id'],
+            await user_achievement_crud.bulk_increment(
+                key_column='user_id',
+                rows={data['id']: data['achievements'] for data in game['players'].values()},
                 session=session,
+                perform_commit=False,
             )
-            for k, v in data['achievements'].items():
-                if hasattr(current_achievement, k) and isinstance(v, (int, float)):
-                    setattr(current_achievement, k, getattr(current_achievement, k) + v)
-
             await session.commit()
 
     def __set_game_achievements(game: dict[str, Any]) -> None:
@@ -914,13 +955,10 @@ async def __process_in_game_end_game(
     __set_game_statistics(game=game)
     __set_game_achievements(game=game)
     game['status'] = GameStatus.FINISHED
+    await save_players_results(game=game)
     await process_game_in_redis(redis_key=game['redis_key'], set_game=game)
 
-    tasks: tuple[Task] = (
-        asyncio_create_task(__process_in_game_end_game_update_user_db(data=data))
-        for data in game['players'].values()
-    )
-    await asyncio_gather(*tasks)
+    await __process_in_game_end_game_update_users_db(game=game)
 
     text: str = __get_results_text(game=game)
     tasks: tuple[Task] = (
@@ -972,15 +1010,18 @@ async def __process_in_game_end_round_ask_for_retail(redis_key: str) -> None:
             messages_to_delete.append(answer)
         await set_user_messages_to_delete(event_key=MessagesEvents.RETELL, messages=messages_to_delete)
 
-    game: dict[str, Any] = await process_game_in_redis(redis_key=redis_key, get=True)
-    await process_game_in_redis(redis_key=game['redis_key'], release=True)
-    # INFO. Пока назначается пенальти - сообщения окончания раунда перебивают клавиатуру.
-    while 1:
-        if redis_check_exists(key=RedisKeys.GAME_SET_PENALTY.format(number=game['number'])):
-            await asyncio_sleep(1)
-            continue
-        game: dict[str, Any] = await process_game_in_redis(redis_key=redis_key, get=True)
-        break
+    game: dict[str, Any] | None = await process_game_in_redis(redis_key=redis_key, get=True)
+    # INFO. Таймер мог сработать после перезапуска бота, когда игра
+    #       уже удалена или раунд уже завершен.
+    if game is None or game['status'] != GameStatus.ROUND_IS_STARTED:
+        return await process_game_in_redis(redis_key=redis_key, release=True)
+    # INFO. Пока назначается пенальти - сообщения окончания раунда перебивают клавиатуру,
+    #       поэтому окончание раунда откладывается: таймер приостанавливается без
+    #       оставшегося времени и возобновляется по окончании назначения пенальти
+    #       (проверка и возобновление выполняются под блокировкой лобби).
+    if await redis_check_exists(key=RedisKeys.GAME_SET_PENALTY.format(number=game['number'])):
+        await round_timers.pause(number=game['number'], remaining_sec=0)
+        return await process_game_in_redis(redis_key=redis_key, release=True)
 
     await delete_user_messages(
         chat_id=game['players_dreaming_order'][game['supervisor_index']],
@@ -1004,8 +1045,8 @@ async def __process_in_game_end_round_ask_for_retail(redis_key: str) -> None:
         words: str = '\n'.join(f'- {word}' for word in game['round_correct_words'])
         text += 'А вот и сами слова (т-с-с, не говори сновидцу!):\n' + words
 
-    game['status'] = GameStatus.WAIT_DREAMER_RETAILS
-    await process_game_in_redis(redis_key=game['redis_key'], set_game=game)
+    await update_game_fields(game=game, fields={'status': GameStatus.WAIT_DREAMER_RETAILS})
+    await process_game_in_redis(redis_key=game['redis_key'], release=True)
 
     tasks: tuple[Task] = (
         asyncio_create_task(
@@ -1037,11 +1078,15 @@ async def __process_in_game_end_round_ask_for_retail_confirm(
     )
     await asyncio_gather(*tasks)
 
-    if game['round_correct_words'] and message.text == RoutersCommands.WORD_CORRECT:
-        game['round_user_retell_dream_correct'] = True
-    else:
-        game['round_user_retell_dream_correct'] = False
-    await process_game_in_redis(redis_key=game['redis_key'], set_game=game)
+    await update_game_fields(
+        game=game,
+        fields={
+            'round_user_retell_dream_correct': bool(
+                game['round_correct_words'] and message.text == RoutersCommands.WORD_CORRECT,
+            ),
+        },
+    )
+    await process_game_in_redis(redis_key=game['redis_key'], release=True)
     await __process_in_game_end_round(redis_key=game['redis_key'])
 
 
@@ -1050,6 +1095,45 @@ async def __process_in_game_end_round_ask_for_retail_confirm(
 # -----------------------------------------------------------------------------
 
 
+async def process_game_command(
+    command: Callable[[], Awaitable[Any]],
+    number: str | None = None,
+    message: Message | None = None,
+) -> Any:
+    """
+    Выполняет команду лобби number (или лобби игрока, отправившего message):
+    при GAME_ENGINE=actor - в акторе лобби, иначе (или если игрок не в лобби) -
+    в текущей задаче.
+
+    Если игру в Redis изменили после того, как команда ее извлекла
+    (GameVersionConflictError), то команда прерывается без повтора:
+    блокировки лобби освобождаются, а игра в памяти актора будет
+    перечитана из Redis следующей командой.
+    """
+    if settings.GAME_ENGINE == GameEngines.ACTOR and number is None and message is not None:
+        number = await redis_get(
+            key=RedisKeys.USER_GAME_LOBBY_NUMBER.format(id_telegram=str(message.from_user.id)),
+        )
+    if settings.GAME_ENGINE == GameEngines.ACTOR and number is not None:
+        return await game_actors.submit(number=str(number), command=lambda: __run_game_command(command=command))
+    return await __run_game_command(command=command)
+
+
+async def __run_game_command(command: Callable[[], Awaitable[Any]]) -> Any:
+    """Выполняет команду лобби и прерывает ее при конфликте версий игры."""
+    try:
+        return await command()
+    except GameVersionConflictError as e:
+        loggers.event.warning('Drop game command: %s', e)
+        actor: GameActor | None = current_game_actor.get()
+        if actor is not None:
+            actor.game = None
+        task: Task = asyncio_current_task()
+        for number, lock_task in tuple(__GAME_LOCKS):
+            if lock_task is task:
+                await __release_game_lock(number=number)
+
+
 async def process_game_in_redis(
     redis_key: str | None = None,
     message: Message | None = None,
@@ -1058,36 +1142,94 @@ async def process_game_in_redis(
     delete: bool = False,
     release: bool = False,
     set_game: dict[str, Any] | None = None,
+    fields: tuple[str] | None = None,
 ) -> dict[str, Any] | None:
+    """
+    Извлекает (get=True, с захватом блокировки лобби), сохраняет (set_game),
+    удаляет (delete=True) игру в Redis или освобождает блокировку (release=True).
+
+    При get=True можно передать fields, чтобы извлечь только указанные поля игры.
+
+    В команде актора лобби (GAME_ENGINE=actor) начатая игра извлекается
+    из памяти актора без блокировки, а сохранения обновляют и Redis, и память.
+    """
+    actor: GameActor | None = current_game_actor.get()
     if not redis_key:
-        if not user_id_telegram:
-            user_id_telegram: int = message.from_user.id
-        number: str = redis_get(key=RedisKeys.USER_GAME_LOBBY_NUMBER.format(id_telegram=str(user_id_telegram)))
+        # INFO. Команды актора выполняются только для игроков его лобби.
+        if actor is not None:
+            number: str = actor.number
+        else:
+            if not user_id_telegram:
+                user_id_telegram: int = message.from_user.id
+            number: str = await redis_get(key=RedisKeys.USER_GAME_LOBBY_NUMBER.format(id_telegram=str(user_id_telegram)))
         redis_key: str = RedisKeys.GAME_LOBBY.format(number=number)
 
     # TODO. Посылать номер, чтобы не парсить. Подумать, как упростить интерфейс.
     # INFO. redis_key=src_lobby_{number}
     number: str = redis_key.split('_')[-1]
-    if get or release:
-        # INFO. Есть шанс, что несколько игроков одновременно получат данные
-        #       игры в Redis и начнется состояние гонки.
-        if release:
-            redis_delete(key=RedisKeys.GAME_LOBBY_BLOCKED.format(number=number))
-        else:
-            while 1:
-                if redis_check_exists(key=RedisKeys.GAME_LOBBY_BLOCKED.format(number=number)):
-                    await asyncio_sleep(0.05)
-                    continue
-                break
-            redis_set(key=RedisKeys.GAME_LOBBY_BLOCKED.format(number=number), value=1, ex_sec=TimeIntervals.SECOND_ONE)
-            return redis_get(key=redis_key)
-
+    if actor is not None and actor.number != number:
+        actor = None
+    if get:
+        if actor is not None and actor.game is not None:
+            return actor.game
+        await __acquire_game_lock(number=number)
+        game: dict[str, Any] | None = await load_game(number=number, fields=fields if actor is None else None)
+        # INFO. До начала игры игроки присоединяются к лобби из других процессов
+        #       (под блокировкой лобби), поэтому в памяти актора хранится только начатая игра.
+        if actor is not None and game is not None and game['status'] != GameStatus.IN_LOBBY:
+            actor.game = game
+            await __release_game_lock(number=number)
+        return game
+    elif release:
+        await __release_game_lock(number=number)
     elif delete:
-        redis_delete(key=redis_key)
-        redis_delete(key=RedisKeys.GAME_LOBBY_BLOCKED.format(number=number))
+        if actor is not None:
+            actor.game = None
+        await delete_game(number=number)
+        await __release_game_lock(number=number)
     elif set_game:
-        redis_set(key=redis_key, value=set_game)
-        redis_delete(key=RedisKeys.GAME_LOBBY_BLOCKED.format(number=number))
+        await save_game(game=set_game)
+        if actor is not None and set_game['status'] != GameStatus.IN_LOBBY:
+            actor.game = set_game
+        await __release_game_lock(number=number)
+
+
+async def __acquire_game_lock(number: str) -> None:
+    """
+    Захватывает блокировку лобби для текущей задачи.
+
+    Повторный захват той же задачей не ожидает сам себя. Если задача
+    завершится, не освободив блокировку, то она будет освобождена автоматически.
+    """
+    task: Task = asyncio_current_task()
+    if (number, task) in __GAME_LOCKS:
+        return
+
+    lock: RedisLock = RedisLock(
+        key=RedisKeys.GAME_LOBBY_BLOCKED.format(number=number),
+        lease_ms=GAME_LOCK_LEASE_MS,
+        auto_extend=True,
+    )
+    await lock.acquire()
+    __GAME_LOCKS[(number, task)] = lock
+    task.add_done_callback(lambda _: __release_game_lock_on_task_done(number=number, task=task))
+
+
+async def __release_game_lock(number: str) -> None:
+    """Освобождает блокировку лобби, если ее удерживает текущая задача."""
+    lock: RedisLock | None = __GAME_LOCKS.pop((number, asyncio_current_task()), None)
+    if lock is not None:
+        await lock.release()
+
+
+def __release_game_lock_on_task_done(number: str, task: Task) -> None:
+    """Освобождает блокировку лобби, забытую завершившейся задачей."""
+    lock: RedisLock | None = __GAME_LOCKS.pop((number, task), None)
+    if lock is None:
+        return
+    release_task: Task = asyncio_create_task(lock.release())
+    __GAME_LOCKS_RELEASE_TASKS.add(release_task)
+    release_task.add_done_callback(__GAME_LOCKS_RELEASE_TASKS.discard)
 
 
 async def __send_game_role_message(
@@ -1133,6 +1275,9 @@ async def send_game_roles_messages(game: dict[str, Any]) -> None:
                 i += 1
 
     __set_players_roles(game=game)
+    # INFO. Роли сохраняются до рассылки и без освобождения блокировки лобби
+    #       (ее освобождает вызывающий), поэтому разосланные роли есть в Redis.
+    await save_game(game=game)
     roles_images: dict[str, str] = await get_role_image_cards()
     tasks: tuple[Task] = (
         asyncio_create_task(
@@ -1146,8 +1291,6 @@ async def send_game_roles_messages(game: dict[str, Any]) -> None:
     )
     await asyncio_gather(*tasks)
 
-    await process_game_in_redis(redis_key=game['redis_key'], set_game=game)
-
 
 def __choose_drop_game_text(
     is_leave: bool = False,
@@ -1203,7 +1346,9 @@ async def __game_drop_move_indexes(
         # INFO. Проверка, что ушел сновидец, нужно сверить со старым индексом.
         if player_index == game['dreamer_index'] + 1:
             await process_game_in_redis(redis_key=game['redis_key'], set_game=game)
-            await __process_in_game_end_round(redis_key=game['redis_key'], skip_results=True)
+            # INFO. Раунд завершается по заново извлеченной игре, поэтому
+            #       словарь game устарел и повторно не сохраняется.
+            return await __process_in_game_end_round(redis_key=game['redis_key'], skip_results=True)
 
     await process_game_in_redis(redis_key=game['redis_key'], set_game=game)
 
@@ -1308,8 +1453,8 @@ async def __process_in_game_end_round(
     await asyncio_gather(*tasks)
 
     if not skip_results:
-        __set_round_achievements(game=game)
-        __set_round_points(game=game)
+        await set_players_achievements(game=game, achievements=__get_round_achievements(game=game))
+        await incr_players_statistic(game=game, deltas=__get_round_points(game=game))
 
     if game['dreamer_index'] == len(game['players_dreaming_order']) - 1:
         return await __process_in_game_end_game(game=game)
@@ -1329,30 +1474,47 @@ async def __process_in_game_end_round(
     await process_game_in_redis(redis_key=game['redis_key'], set_game=game)
 
 
-async def __send_new_word(game: dict[str, Any]) -> None:
-    """Отправляет новую карточку слова игрокам и смещает индекс карточки в игре."""
-    game['card_index'] += 1
-    game_cards_ids: list[str, str] = redis_get(key=RedisKeys.GAME_WORDS.format(number=game['number']))
+async def __send_new_word(
+    game: dict[str, Any],
+    fields: dict[str, Any] | None = None,
+    incr: dict[str, int] | None = None,
+) -> None:
+    """
+    Отправляет новую карточку слова игрокам и смещает индекс карточки в игре.
+
+    Переданные fields и incr сохраняются вместе с индексом карточки одним запросом.
+    """
+    await update_game_fields(game=game, fields=fields, incr={**(incr or {}), 'card_index': 1})
+    card_file_id: str = (await __get_word_card(game=game))[1]
     tasks: tuple[Task] = (
         asyncio_create_task(
             __send_new_word_to_player(
                 id_telegram=id_telegram,
                 data=data,
                 game=game,
-                game_cards_ids=game_cards_ids,
+                card_file_id=card_file_id,
             ),
         )
         for id_telegram, data in game['players'].items()
     )
     await asyncio_gather(*tasks)
-    await process_game_in_redis(redis_key=game['redis_key'], set_game=game)
+    await process_game_in_redis(redis_key=game['redis_key'], release=True)
+
+
+async def __get_word_card(game: dict[str, Any]) -> tuple[str, str]:
+    """Возвращает текущую карту (слово, id_telegram) игры."""
+    return await words_deck.get_card(
+        seed=game['cards_seed'],
+        index=game['card_index'],
+        version=game['cards_version'],
+    )
 
 
 async def __send_new_word_to_player(
     id_telegram: str,
     data: dict[str, Any],
     game: dict[str, Any],
-    game_cards_ids: list[str, str],
+    card_file_id: str,
     send_supervisor_keyboard: bool = False,
 ) -> None:
     """Задача по отправке новой карточки слова игроку."""
@@ -1366,13 +1528,13 @@ async def __send_new_word_to_player(
     if send_supervisor_keyboard:
         answer: Message = await bot.send_photo(
             chat_id=data['chat_id'],
-            photo=game_cards_ids[game['card_index']][1],
+            photo=card_file_id,
             reply_markup=KEYBOARD_LOBBY_SUPERVISOR_IN_GAME,
         )
     else:
         answer: Message = await bot.send_photo(
             chat_id=data['chat_id'],
-            photo=game_cards_ids[game['card_index']][1],
+            photo=card_file_id,
         )
     await set_user_messages_to_delete(
         event_key=MessagesEvents.WORD,
@@ -1380,16 +1542,17 @@ async def __send_new_word_to_player(
     )
 
 
-def __set_round_achievements(
+def __get_round_achievements(
     game: dict[str, Any],
-):
-    """Выдает достижения за раунд."""
-    for data in game['players'].values():
+) -> dict[str, dict[str, int]]:
+    """Возвращает достижения за раунд: {id_telegram: {название: 1}}."""
+    achievements: dict[str, dict[str, int]] = {}
+    for id_telegram, data in game['players'].items():
         if data['role'] != GameRoles.DREAMER:
             continue
 
         if game['round_correct_count'] == 0:
-            data['achievements']['nightmare'] = 1
+            achievements[id_telegram] = {'nightmare': 1}
         elif (
             game['round_correct_count'] >= 4
             and
@@ -1397,13 +1560,14 @@ def __set_round_achievements(
             and
             game['round_user_retell_dream_correct']
         ):
-            data['achievements']['dream_master'] = 1
+            achievements[id_telegram] = {'dream_master': 1}
+    return achievements
 
 
-def __set_round_points(
+def __get_round_points(
     game: dict[str, Any],
-):
-    """Подсчитывает очки за раунд."""
+) -> dict[str, dict[str, int]]:
+    """Подсчитывает очки за раунд: {id_telegram: {название очков: прирост}}."""
     if game['round_incorrect_count'] == game['round_correct_count']:
         sandman_points: int = game['round_correct_count'] + 2
     else:
@@ -1417,12 +1581,26 @@ def __set_round_points(
     if game['round_user_retell_dream_correct']:
         dreamer_points += 2
 
-    for data in game['players'].values():
+    points: dict[str, dict[str, int]] = {}
+    for id_telegram, data in game['players'].items():
         if data['role'] == GameRoles.BUKA:
-            data['statistic']['top_score_buka'] += game['round_incorrect_count']
+            points[id_telegram] = {'top_score_buka': game['round_incorrect_count']}
         elif data['role'] == GameRoles.FAIRY:
-            data['statistic']['top_score_fairy'] += game['round_correct_count']
+            points[id_telegram] = {'top_score_fairy': game['round_correct_count']}
         elif data['role'] == GameRoles.SANDMAN:
-            data['statistic']['top_score_sandman'] += sandman_points
+            points[id_telegram] = {'top_score_sandman': sandman_points}
         elif data['role'] == GameRoles.DREAMER:
-            data['statistic']['top_score_dreamer'] += dreamer_points
+            points[id_telegram] = {'top_score_dreamer': dreamer_points}
+    return points
+
+
+async def __process_round_timer(number: str) -> None:
+    """Обрабатывает срабатывание таймера раунда лобби (при GAME_ENGINE=actor - в акторе лобби)."""
+    redis_key: str = RedisKeys.GAME_LOBBY.format(number=number)
+    return await process_game_command(
+        command=lambda: __process_in_game_end_round_ask_for_retail(redis_key=redis_key),
+        number=number,
+    )
+
+
+round_timers.register_handler(handler=__process_round_timer)
@@ -0,0 +1,157 @@
+"""
+Модуль акторов лобби (движок игровых команд GAME_ENGINE=actor).
+
+Каждым активным лобби владеет один актор - задача asyncio с входящей
+очередью команд. Команды лобби (действия игроков, срабатывание таймера
+раунда) выполняются актором строго последовательно, поэтому:
+- для них не требуется блокировка лобби в Redis;
+- игра хранится в памяти актора и не извлекается из Redis на каждое
+  действие, а изменения по-прежнему сохраняются в Redis (контрольные
+  точки) и переживают перезапуск процесса.
+
+Актор завершается после GAME_ACTOR_IDLE_SEC без команд, игра при этом
+выгружается из памяти.
+
+Начатую игру изменяет только актор: начало игры (подготовка игры и рассылка
+ролей) тоже выполняется командой актора, см. game_create.start_game.
+
+Движок корректен, пока все команды лобби выполняет один процесс: апдейты
+игроков лобби приходят воркеру-владельцу лобби (см. app.src.bot.sharding),
+а таймеры раундов в этом режиме у каждого воркера свои
+(см. app.src.scheduler.round_timer).
+"""
+
+from asyncio import (
+    Future,
+    Queue,
+    Task,
+    TimeoutError as AsyncioTimeoutError,
+    create_task as asyncio_create_task,
+    get_running_loop,
+    timeout as asyncio_timeout,
+)
+from contextvars import (
+    Context,
+    ContextVar,
+    copy_context,
+)
+from time import monotonic
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+)
+
+from app.src.config.config import settings
+from app.src.utils.metrics import (
+    MetricsNames,
+    metrics,
+)
+
+# INFO. Актор, выполняющий текущую команду (None - вне актора).
+current_game_actor: ContextVar['GameActor | None'] = ContextVar('current_game_actor', default=None)
+
+
+class GameActor:
+    """
+    Класс актора лобби.
+
+    Атрибуты:
+        number: str - номер лобби
+        game: dict[str, Any] | None - игра в памяти (None - не загружена)
+    """
+
+    def __init__(self, number: str):
+        self.number: str = number
+        self.game: dict[str, Any] | None = None
+        self.__queue: Queue[tuple[Callable[[], Awaitable[Any]], Context, Future, float]] = Queue()
+        self.__task: Task | None = None
+
+    def submit(self, command: Callable[[], Awaitable[Any]]) -> Future:
+        """
+        Ставит команду в очередь актора. Возвращает future с результатом команды.
+
+        Команда выполняется отдельной задачей в контексте вызывающего
+        (переменные контекста, например, текущий апдейт, сохраняются).
+        """
+        context: Context = copy_context()
+        context.run(current_game_actor.set, self)
+        future: Future = get_running_loop().create_future()
+        self.__queue.put_nowait((command, context, future, monotonic()))
+        return future
+
+    def start(self, on_stop: Callable[['GameActor'], None]) -> None:
+        """Запускает обработку очереди команд."""
+        self.__task = asyncio_create_task(self.__run(on_stop=on_stop), name=f'game_actor_{self.number}')
+
+    async def __run(self, on_stop: Callable[['GameActor'], None]) -> None:
+        """Последовательно выполняет команды из очереди, пока актор не простаивает."""
+        try:
+            while 1:
+                try:
+                    async with asyncio_timeout(settings.GAME_ACTOR_IDLE_SEC):
+                        command, context, future, submitted = await self.__queue.get()
+                except AsyncioTimeoutError:
+                    # INFO. Команда могла попасть в очередь одновременно с истечением ожидания.
+                    if self.__queue.empty():
+                        return
+                    continue
+
+                metrics.observe(MetricsNames.GAME_ACTORS_COMMAND_WAIT_SEC, monotonic() - submitted)
+                if future.cancelled():
+                    continue
+                try:
+                    result: Any = await asyncio_create_task(command(), context=context)
+                except BaseException as e:
+                    if not isinstance(e, Exception):
+                        future.cancel()
+                        raise
+                    # INFO. Игра в памяти могла быть изменена частично,
+                    #       поэтому следующая команда перечитает ее из Redis.
+                    self.game = None
+                    if not future.cancelled():
+                        future.set_exception(e)
+                else:
+                    if not future.cancelled():
+                        future.set_result(result)
+        finally:
+            # INFO. Без ожиданий между выходом из цикла и снятием с учета:
+            #       новые команды не попадут в очередь остановленного актора.
+            on_stop(self)
+            # INFO. При отмене задачи актора ожидающие команды отменяются.
+            while not self.__queue.empty():
+                self.__queue.get_nowait()[2].cancel()
+
+
+class GameActors:
+    """Класс реестра акторов лобби процесса."""
+
+    def __init__(self):
+        self.__actors: dict[str, GameActor] = {}
+
+    async def submit(self, number: str, command: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Выполняет команду в акторе лобби (создает актор, если его нет)
+        и возвращает ее результат.
+
+        Нельзя вызывать из команды того же лобби: команда будет ждать сама себя.
+        """
+        actor: GameActor | None = self.__actors.get(number)
+        if actor is None:
+            actor = GameActor(number=number)
+            self.__actors[number] = actor
+            actor.start(on_stop=self.__on_actor_stop)
+            metrics.set(MetricsNames.GAME_ACTORS_ACTIVE, len(self.__actors))
+        return await actor.submit(command=command)
+
+    def __on_actor_stop(self, actor: GameActor) -> None:
+        """Снимает остановленный актор с учета."""
+        if self.__actors.get(actor.number) is actor:
+            del self.__actors[actor.number]
+        metrics.set(MetricsNames.GAME_ACTORS_ACTIVE, len(self.__actors))
+
+    def __len__(self) -> int:
+        return len(self.__actors)
+
+
+game_actors: GameActors = GameActors()
@@ -0,0 +1,410 @@
+"""
+Модуль хранения игры в Redis.
+
+Игра хранится не одним JSON-документом, а несколькими Redis Hash:
+- RedisKeys.GAME_LOBBY: поля игры (статус, индексы, счетчики раунда и т.д.);
+- RedisKeys.GAME_PLAYERS: игроки {id_telegram: {name, id, chat_id, role}};
+- RedisKeys.GAME_PLAYER_STATISTIC: очки игрока за игру;
+- RedisKeys.GAME_PLAYER_ACHIEVEMENTS: достижения игрока за игру.
+
+Значение каждого поля хранится в JSON, поэтому типы Python сохраняются,
+а целые числа увеличиваются на стороне Redis через HINCRBY.
+
+Сохранение игры (save_game) записывает только поля игры и игроков.
+Очки и достижения игроков изменяются только точечно (incr_players_statistic,
+set_players_achievements, save_players_results): каждая функция обновляет
+и Redis, и переданный словарь игры, чтобы они не расходились.
+
+Поля игры и игроков версионируются: поле GAME_VERSION_FIELD увеличивается
+при каждом изменении (save_game, update_game_fields), а изменение выполняется
+Lua-скриптом, только если версия в Redis совпадает с версией словаря игры.
+Поэтому запись по устаревшему словарю игры не затирает более новое состояние,
+а завершается исключением GameVersionConflictError (команда лобби
+при этом прерывается, см. app.src.utils.game.process_game_command).
+
+Извлеченная игра (GameState) помнит сохраненные значения полей, поэтому
+сохраняются только измененные поля и игроки, а повторное сохранение
+неизмененной игры (например, несколько save_game в одном обработчике)
+не выполняет запросов к Redis.
+
+Лобби, сохраненные до перехода на Redis Hash (одной JSON-строкой), не
+конвертируются, а удаляются при запуске бота (см. delete_legacy_games).
+"""
+
+from typing import (
+    Any,
+    Iterable,
+)
+
+from redis.asyncio.client import Pipeline
+from redis.commands.core import AsyncScript
+
+from app.src.database.database import (
+    RedisKeys,
+    redis_engine,
+)
+from app.src.utils.redis_app import (
+    redis_hash_decode,
+    redis_hash_encode,
+    redis_hmget,
+)
+from app.src.utils.metrics import (
+    MetricsNames,
+    metrics,
+)
+
+# INFO. Поля игрока, хранящиеся в RedisKeys.GAME_PLAYERS
+#       (остальные - в отдельных хешах очков и достижений).
+PLAYER_RESULTS_KEYS: tuple[str] = ('statistic', 'achievements')
+# INFO. Поле версии игры в RedisKeys.GAME_LOBBY (0 - игры не существует).
+GAME_VERSION_FIELD: str = 'version'
+
+# INFO. Изменяет игру, если ее версия (поле GAME_VERSION_FIELD) равна ARGV[1]:
+#       ARGV[2] - '1', если хеши игры и игроков перезаписываются полностью;
+#       далее группы "количество, элементы": поля игры для HSET (пары),
+#       поля игры для HDEL, игроки для HSET (пары), игроки для HDEL,
+#       поля игры для HINCRBY (пары).
+#       Возвращает {1, новая версия, результаты HINCRBY...} или {0, текущая версия}.
+__LUA_SAVE: str = """
+local version = tonumber(redis.call('hget', KEYS[1], 'version') or '0')
+if version ~= tonumber(ARGV[1]) then
+    return {0, version}
+end
+if ARGV[2] == '1' then
+    redis.call('del', KEYS[1], KEYS[2])
+end
+
+local i = 3
+local function take(key, command, size)
+    local n = tonumber(ARGV[i])
+    i = i + 1
+    if n > 0 then
+        redis.call(command, key, unpack(ARGV, i, i + n * size - 1))
+        i = i + n * size
+    end
+end
+take(KEYS[1], 'hset', 2)
+take(KEYS[1], 'hdel', 1)
+take(KEYS[2], 'hset', 2)
+take(KEYS[2], 'hdel', 1)
+
+local result = {1, version + 1}
+local n = tonumber(ARGV[i])
+i = i + 1
+for _ = 1, n do
+    result[#result + 1] = redis.call('hincrby', KEYS[1], ARGV[i], ARGV[i + 1])
+    i = i + 2
+end
+redis.call('hset', KEYS[1], 'version', version + 1)
+return result
+"""
+
+_script_save: AsyncScript = redis_engine.register_script(__LUA_SAVE)
+
+
+class GameVersionConflictError(Exception):
+    """Исключение: игра в Redis изменена после извлечения сохраняемого словаря игры."""
+
+
+class GameState(dict):
+    """
+    Класс словаря игры, извлеченной из Redis.
+
+    Атрибуты:
+        saved_fields: dict[str, str] - сохраненные в Redis значения полей игры
+        saved_players: dict[str, str] - сохраненные в Redis значения игроков
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.saved_fields: dict[str, str] = {}
+        self.saved_players: dict[str, str] = {}
+
+
+async def load_game(
+    number: str,
+    fields: Iterable[str] | None = None,
+) -> dict[str, Any] | None:
+    """
+    Извлекает игру из Redis (GameState). Возвращает None, если игры не существует.
+
+    Если переданы fields, то извлекаются только указанные поля игры
+    (без игроков, их очков и достижений) одним запросом HMGET.
+    """
+    if fields is not None:
+        return await redis_hmget(key=RedisKeys.GAME_LOBBY.format(number=number), fields=fields) or None
+
+    pipe: Pipeline
+    async with redis_engine.pipeline(transaction=False) as pipe:
+        pipe.hgetall(name=RedisKeys.GAME_LOBBY.format(number=number))
+        pipe.hgetall(name=RedisKeys.GAME_PLAYERS.format(number=number))
+        game_data, players_data = await pipe.execute()
+    if not game_data:
+        return None
+
+    game: GameState = GameState(redis_hash_decode(data=game_data))
+    game['players'] = redis_hash_decode(data=players_data)
+    game.saved_fields = {k: v for k, v in game_data.items() if k != GAME_VERSION_FIELD}
+    game.saved_players = players_data
+    if not game['players']:
+        return game
+
+    async with redis_engine.pipeline(transaction=False) as pipe:
+        for id_telegram in game['players']:
+            pipe.hgetall(name=RedisKeys.GAME_PLAYER_STATISTIC.format(number=number, id_telegram=id_telegram))
+            pipe.hgetall(name=RedisKeys.GAME_PLAYER_ACHIEVEMENTS.format(number=number, id_telegram=id_telegram))
+        results: list[dict[str, str]] = await pipe.execute()
+
+    for i, data in enumerate(game['players'].values()):
+        statistic: dict[str, Any] = redis_hash_decode(data=results[i * 2])
+        # INFO. Очки появляются у игроков только после начала игры.
+        if statistic:
+            data['statistic'] = statistic
+            data['achievements'] = redis_hash_decode(data=results[i * 2 + 1])
+    return game
+
+
+async def save_game(game: dict[str, Any]) -> None:
+    """
+    Сохраняет поля игры и игроков в Redis одним запросом.
+    Очки и достижения игроков не перезаписываются.
+
+    Для игры, извлеченной из Redis (GameState), записываются только
+    измененные поля и игроки. Словарь, созданный вручную (новое лобби),
+    перезаписывает игру полностью.
+
+    Вызывает GameVersionConflictError, если версия игры в Redis
+    не совпадает с версией словаря игры.
+    """
+    fields: dict[str, str] = redis_hash_encode(
+        data={k: v for k, v in game.items() if k not in ('players', GAME_VERSION_FIELD)},
+    )
+    players: dict[str, str] = redis_hash_encode(
+        data={
+            id_telegram: {k: v for k, v in data.items() if k not in PLAYER_RESULTS_KEYS}
+            for id_telegram, data in game['players'].items()
+        },
+    )
+
+    if isinstance(game, GameState):
+        fields_set: dict[str, str] = {k: v for k, v in fields.items() if game.saved_fields.get(k) != v}
+        fields_del: list[str] = [k for k in game.saved_fields if k not in fields]
+        players_set: dict[str, str] = {k: v for k, v in players.items() if game.saved_players.get(k) != v}
+        players_del: list[str] = [k for k in game.saved_players if k not in players]
+        if not (fields_set or fields_del or players_set or players_del):
+            metrics.inc(MetricsNames.GAME_STATE_SAVES_SKIPPED)
+            return
+        await __execute_save(
+            game=game,
+            fields_set=fields_set,
+            fields_del=fields_del,
+            players_set=players_set,
+            players_del=players_del,
+        )
+        game.saved_fields = fields
+        game.saved_players = players
+        if players_del:
+            await redis_engine.delete(
+                *(
+                    key
+                    for id_telegram in players_del
+                    for key in __get_player_results_keys(number=game['number'], id_telegram=id_telegram)
+                ),
+            )
+    else:
+        await __execute_save(game=game, fields_set=fields, players_set=players, reset=True)
+
+
+async def __execute_save(
+    game: dict[str, Any],
+    fields_set: dict[str, str] | None = None,
+    fields_del: list[str] | None = None,
+    players_set: dict[str, str] | None = None,
+    players_del: list[str] | None = None,
+    incr: dict[str, int] | None = None,
+    reset: bool = False,
+) -> list[int]:
+    """
+    Изменяет игру в Redis с проверкой версии и обновляет версию в словаре игры.
+    Возвращает результаты HINCRBY полей incr.
+    """
+    args: list[Any] = [game.get(GAME_VERSION_FIELD, 0), int(reset)]
+    for mapping in (fields_set, fields_del, players_set, players_del, incr):
+        mapping = mapping or ()
+        args.append(len(mapping))
+        if isinstance(mapping, dict):
+            for k, v in mapping.items():
+                args.extend((k, v))
+        else:
+            args.extend(mapping)
+
+    result: list[int] = await _script_save(
+        keys=(
+            RedisKeys.GAME_LOBBY.format(number=game['number']),
+            RedisKeys.GAME_PLAYERS.format(number=game['number']),
+        ),
+        args=args,
+    )
+    if not result[0]:
+        metrics.inc(MetricsNames.GAME_STATE_CONFLICTS)
+        raise GameVersionConflictError(
+            f'Game {game["number"]} version conflict: '
+            f'expected {game.get(GAME_VERSION_FIELD, 0)}, found {result[1]}',
+        )
+    game[GAME_VERSION_FIELD] = result[1]
+    return result[2:]
+
+
+async def delete_game(number: str) -> None:
+    """Удаляет игру, ее игроков, их очки и достижения из Redis."""
+    keys: list[str] = [
+        RedisKeys.GAME_LOBBY.format(number=number),
+        RedisKeys.GAME_PLAYERS.format(number=number),
+        RedisKeys.GAME_SET_PENALTY.format(number=number),
+    ]
+    # INFO. Ключи очков и достижений строятся по игрокам лобби (без обхода
+    #       всех ключей Redis); ключи выбывших игроков удаляет save_game.
+    for id_telegram in await redis_engine.hkeys(RedisKeys.GAME_PLAYERS.format(number=number)):
+        keys.extend(__get_player_results_keys(number=number, id_telegram=id_telegram))
+    await redis_engine.delete(*keys)
+
+
+async def delete_legacy_games() -> int:
+    """
+    Удаляет лобби, сохраненные до перехода на Redis Hash (одной JSON-строкой),
+    вместе с их колодой слов, пенальти и блокировкой.
+    Возвращает количество удаленных лобби.
+    """
+    prefix: str = RedisKeys.GAME_LOBBY.format(number='')
+    # INFO. Ключи лобби без суффиксов (_players, _blocked и т.д.): в номере лобби нет "_".
+    keys: list[str] = [
+        key
+        async for key in redis_engine.scan_iter(match=prefix + '*', count=1000)
+        if '_' not in key[len(prefix):]
+    ]
+    if not keys:
+        return 0
+
+    pipe: Pipeline
+    async with redis_engine.pipeline(transaction=False) as pipe:
+        for key in keys:
+            pipe.type(key)
+        types: list[str] = await pipe.execute()
+    numbers: list[str] = [key[len(prefix):] for key, key_type in zip(keys, types) if key_type == 'string']
+    if not numbers:
+        return 0
+
+    await redis_engine.delete(
+        *(
+            key.format(number=number)
+            for number in numbers
+            for key in (
+                RedisKeys.GAME_LOBBY,
+                RedisKeys.GAME_LOBBY_BLOCKED,
+                RedisKeys.GAME_SET_PENALTY,
+                RedisKeys.GAME_WORDS,
+            )
+        ),
+    )
+    return len(numbers)
+
+
+def __get_player_results_keys(number: str, id_telegram: str) -> tuple[str, str]:
+    """Возвращает ключи очков и достижений игрока за игру."""
+    return (
+        RedisKeys.GAME_PLAYER_STATISTIC.format(number=number, id_telegram=id_telegram),
+        RedisKeys.GAME_PLAYER_ACHIEVEMENTS.format(number=number, id_telegram=id_telegram),
+    )
+
+
+async def update_game_fields(
+    game: dict[str, Any],
+    fields: dict[str, Any] | None = None,
+    incr: dict[str, int] | None = None,
+) -> None:
+    """
+    Точечно обновляет поля игры в Redis и в словаре игры game:
+    fields - устанавливает значения (HSET), incr - увеличивает целые числа (HINCRBY).
+
+    Вызывает GameVersionConflictError, если версия игры в Redis
+    не совпадает с версией словаря игры.
+    """
+    encoded: dict[str, str] = redis_hash_encode(data=fields or {})
+    results: list[int] = await __execute_save(game=game, fields_set=encoded, incr=incr)
+
+    if fields:
+        game.update(fields)
+    for k, v in zip((incr or {}).keys(), results):
+        game[k] = v
+        encoded[k] = str(v)
+    if isinstance(game, GameState):
+        game.saved_fields.update(encoded)
+
+
+async def incr_players_statistic(
+    game: dict[str, Any],
+    deltas: dict[str, dict[str, int]],
+) -> None:
+    """
+    Увеличивает очки игроков в Redis и в словаре игры game.
+
+    Атрибуты:
+        deltas: dict[str, dict[str, int]] - {id_telegram: {название очков: прирост}}
+    """
+    items: list[tuple[str, str]] = []
+    pipe: Pipeline
+    async with redis_engine.pipeline(transaction=True) as pipe:
+        for id_telegram, statistic in deltas.items():
+            key: str = RedisKeys.GAME_PLAYER_STATISTIC.format(number=game['number'], id_telegram=id_telegram)
+            for k, v in statistic.items():
+                pipe.hincrby(name=key, key=k, amount=v)
+                items.append((id_telegram, k))
+        if not items:
+            return
+        results: list[int] = await pipe.execute()
+
+    for (id_telegram, k), v in zip(items, results):
+        game['players'][id_telegram]['statistic'][k] = v
+
+
+async def set_players_achievements(
+    game: dict[str, Any],
+    achievements: dict[str, dict[str, int]],
+) -> None:
+    """
+    Выдает достижения игрокам в Redis и в словаре игры game.
+
+    Атрибуты:
+        achievements: dict[str, dict[str, int]] - {id_telegram: {название достижения: значение}}
+    """
+    achievements: dict[str, dict[str, int]] = {k: v for k, v in achievements.items() if v}
+    if not achievements:
+        return
+
+    pipe: Pipeline
+    async with redis_engine.pipeline(transaction=True) as pipe:
+        for id_telegram, data in achievements.items():
+            pipe.hset(
+                name=RedisKeys.GAME_PLAYER_ACHIEVEMENTS.format(number=game['number'], id_telegram=id_telegram),
+                mapping=redis_hash_encode(data=data),
+            )
+        await pipe.execute()
+
+    for id_telegram, data in achievements.items():
+        game['players'][id_telegram]['achievements'].update(data)
+
+
+async def save_players_results(game: dict[str, Any]) -> None:
+    """
+    Полностью перезаписывает очки и достижения всех игроков из словаря игры game.
+    """
+    pipe: Pipeline
+    async with redis_engine.pipeline(transaction=True) as pipe:
+        for id_telegram, data in game['players'].items():
+            statistic_key: str = RedisKeys.GAME_PLAYER_STATISTIC.format(number=game['number'], id_telegram=id_telegram)
+            achievements_key: str = RedisKeys.GAME_PLAYER_ACHIEVEMENTS.format(number=game['number'], id_telegram=id_telegram)
+            pipe.delete(statistic_key, achievements_key)
+            pipe.hset(name=statistic_key, mapping=redis_hash_encode(data=data['statistic']))
+            if data['achievements']:
+                pipe.hset(name=achievements_key, mapping=redis_hash_encode(data=data['achievements']))
+        await pipe.execute()
@@ -8,10 +8,12 @@ from asyncio import (
     gather as asyncio_gather,
     sleep as asyncio_sleep,
 )
-from random import shuffle
+from functools import lru_cache
+from random import Random
 from re import sub as re_sub
 from pathlib import Path
 from typing import Any
+from zlib import crc32
 
 from aiogram.exceptions import TelegramRetryAfter
 from aiogram.types import (
@@ -24,6 +26,7 @@ from tempfile import NamedTemporaryFile
 from app.src.bot.bot import bot
 from app.src.config.config import (
     Dirs,
+    TimeIntervals,
     settings,
 )
 from app.src.crud.image import image_crud
@@ -42,38 +45,127 @@ from app.src.utils.redis_app import (
 
 async def get_role_image_cards() -> dict[str, str]:
     """Получает id_telegram карт ролей."""
-    cards_ids: dict[str, str] | None = redis_get(key=RedisKeys.ROLES)
+    cards_ids: dict[str, str] | None = await redis_get(key=RedisKeys.ROLES)
     if not cards_ids:
         async with async_session_maker() as session:
             cards_ids: dict[str, str] = await image_crud.retrieve_all_roles_ids_telegram(session=session)
-            redis_set(key=RedisKeys.ROLES, value=cards_ids)
+            await redis_set(key=RedisKeys.ROLES, value=cards_ids)
     return cards_ids
 
 
 async def get_rules_ids_telegram() -> list[str]:
     """Получает список id_telegram всех карточек правил, отсортированных по порядку."""
-    rules_ids: list[str] = redis_get(key=RedisKeys.RULES)
+    rules_ids: list[str] = await redis_get(key=RedisKeys.RULES)
     if not rules_ids:
         async with async_session_maker() as session:
             rules_ids: list[str] = await image_crud.retrieve_all_rules_ids_telegram(session=session)
-        redis_set(key=RedisKeys.RULES, value=rules_ids)
+        await redis_set(key=RedisKeys.RULES, value=rules_ids)
     return rules_ids
 
 
-async def get_shuffled_words_cards() -> list[str, str]:
-    """Генерирует случайный порядок карт слов для игры."""
-    cards_ids: list[str, str] = redis_get(key=RedisKeys.WORDS)
-    if not cards_ids:
-        async with async_session_maker() as session:
-            cards_data: list[tuple[str, int, int]] = await image_crud.retrieve_all_words_ids_telegram(session=session)
-            cards_ids: list[str, str] = []
+# INFO. Время хранения (сек) колоды каждой версии в Redis для начатых с ней игр.
+WORDS_PINNED_TTL_SEC: int = TimeIntervals.SECONDS_IN_1_DAY
+# INFO. Максимальное количество версий колоды в памяти процесса.
+WORDS_DECKS_MAX: int = 4
+
+
+class WordsDeck:
+    """
+    Класс общей колоды карт слов процесса.
+
+    Колода хранится один раз в Redis (RedisKeys.WORDS) и в памяти процесса,
+    а игра хранит только зерно случайного порядка карт, версию колоды
+    и индекс текущей карты (см. get_card).
+
+    Игра до конца использует колоду той версии, с которой началась: после
+    синхронизации картинок прежняя версия колоды хранится в Redis
+    (RedisKeys.WORDS_PINNED) и в памяти процесса.
+
+    Атрибуты:
+        cards: list[tuple[str, str]] - карты (слово, id_telegram) текущей колоды в порядке из базы данных
+        version: int | None - версия текущей колоды (контрольная сумма карт)
+    """
+
+    def __init__(self):
+        self.cards: list[tuple[str, str]] = []
+        self.version: int | None = None
+        # INFO. Колоды по версиям (в том числе текущая), от старых к новым.
+        self.__decks: dict[int, list[tuple[str, str]]] = {}
+
+    async def refresh(self) -> None:
+        """
+        Сверяет колоду в памяти с версией в Redis и при расхождении загружает
+        ее из Redis (или из базы данных, если в Redis колоды нет).
+        """
+        if self.cards and await redis_get(key=RedisKeys.WORDS_VERSION) == self.version:
+            return
+
+        cards_ids: list[tuple[str, str]] | None = await redis_get(key=RedisKeys.WORDS)
+        if not cards_ids:
+            async with async_session_maker() as session:
+                cards_data: list[tuple[str, int, int]] = await image_crud.retrieve_all_words_ids_telegram(session=session)
+            cards_ids: list[tuple[str, str]] = []
             for name, normal_id, rotated_id in cards_data:
                 name_parts: list[str] = name.split(' | ')
                 cards_ids.append((name_parts[0], normal_id))
                 cards_ids.append((name_parts[1], rotated_id))
-            redis_set(key=RedisKeys.WORDS, value=cards_ids)
-    shuffle(cards_ids)
-    return cards_ids
+            await redis_set(key=RedisKeys.WORDS, value=cards_ids)
+
+        self.cards = [tuple(card) for card in cards_ids]
+        self.version = crc32('\n'.join(f'{word}|{file_id}' for word, file_id in self.cards).encode())
+        self.__remember(version=self.version, cards=self.cards)
+        await redis_set(key=RedisKeys.WORDS_VERSION, value=self.version)
+        await redis_set(
+            key=RedisKeys.WORDS_PINNED.format(version=self.version),
+            value=self.cards,
+            ex_sec=WORDS_PINNED_TTL_SEC,
+        )
+
+    async def get_card(self, seed: int, index: int, version: int) -> tuple[str, str]:
+        """
+        Возвращает карту (слово, id_telegram) с индексом index в случайном
+        порядке колоды версии version, заданном зерном seed.
+
+        Колода загружается из Redis, только если ее версии нет в памяти процесса.
+        """
+        cards: list[tuple[str, str]] | None = self.__decks.get(version)
+        if cards is None:
+            cards = await self.__load(version=version)
+        order: tuple[int, ...] = self.__get_cards_order(seed=seed, size=len(cards))
+        return cards[order[index % len(order)]]
+
+    async def __load(self, version: int) -> list[tuple[str, str]]:
+        """Загружает колоду версии version в память процесса."""
+        await self.refresh()
+        if version == self.version:
+            return self.cards
+
+        cards_ids: list[tuple[str, str]] | None = await redis_get(key=RedisKeys.WORDS_PINNED.format(version=version))
+        # INFO. Если колода версии игры уже удалена из Redis, то игра
+        #       продолжается с текущей колодой.
+        cards: list[tuple[str, str]] = [tuple(card) for card in cards_ids] if cards_ids else self.cards
+        self.__remember(version=version, cards=cards)
+        return cards
+
+    def __remember(self, version: int, cards: list[tuple[str, str]]) -> None:
+        """Сохраняет колоду версии version в памяти, вытесняя самые старые версии."""
+        self.__decks.pop(version, None)
+        self.__decks[version] = cards
+        while len(self.__decks) > WORDS_DECKS_MAX:
+            del self.__decks[next(iter(self.__decks))]
+
+    # INFO. Порядок карт вычисляется один раз на игру в процессе (O(n)),
+    #       после чего получение карты - O(1) без обращения к Redis.
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def __get_cards_order(seed: int, size: int) -> tuple[int, ...]:
+        """Возвращает случайный порядок индексов карт колоды, заданный зерном."""
+        order: list[int] = list(range(size))
+        Random(seed).shuffle(order)
+        return tuple(order)
+
+
+words_deck: WordsDeck = WordsDeck()
 
 
 async def sync_images() -> None:
@@ -100,17 +192,29 @@ async def sync_images() -> None:
         for dir in Dirs.get_all_cards()
         for obj in dir.iterdir()
     ]
-    await asyncio_gather(*tasks)
+    objs_data: list[dict[str, Any] | None] = await asyncio_gather(*tasks)
 
-    if db_images:
-        async with async_session_maker() as session:
+    # INFO. Изменения записываются в базу данных одной транзакцией:
+    #       сначала удаляются отсутствующие локально картинки (их уникальные
+    #       значения могут совпасть с новыми), затем новые и измененные
+    #       картинки создаются или обновляются пачками по local_path.
+    async with async_session_maker() as session:
+        if db_images:
             await image_crud.delete_all_by_ids(
                 obj_ids=[obj['id'] for obj in db_images.values()],
                 session=session,
+                perform_commit=False,
             )
+        await image_crud.bulk_upsert(
+            objs_data=[obj_data for obj_data in objs_data if obj_data is not None],
+            index_elements=('local_path',),
+            session=session,
+            perform_commit=False,
+        )
+        await session.commit()
 
-    for key in (RedisKeys.ROLES, RedisKeys.WORDS):
-        redis_delete(key=key)
+    for key in (RedisKeys.ROLES, RedisKeys.WORDS, RedisKeys.WORDS_VERSION):
+        await redis_delete(key=key)
 
     message: Message = await bot.send_message(
         chat_id=settings.ADMIN_NOTIFY_ID,
@@ -142,32 +246,22 @@ async def __sync_image(
     obj: Path,
     dir_name: str,
     db_images: dict[str, str | int],
-) -> None:
-    """Проверяет один объект в рамках логики функции check_images."""
+) -> dict[str, Any] | None:
+    """
+    Проверяет один объект в рамках логики функции sync_images.
+    Возвращает данные для записи в базу данных, если объект был загружен в telegram.
+    """
     obj_local_path: str = str(obj.relative_to(Dirs.DIR_RES))
     db_obj: dict[str, str | int] | None = db_images.pop(obj_local_path, None)
 
     if not await __check_if_is_needed_to_sync(obj=obj, db_obj=db_obj):
-        return
+        return None
 
-    obj_data: dict[str, Any] = await __upload_images_to_telegram(
+    return await __upload_images_to_telegram(
         obj=obj,
         obj_local_path=obj_local_path,
-        db_obj=db_obj,
         dir_name=dir_name,
     )
-    async with async_session_maker() as session:
-        if db_obj:
-            await image_crud.update_by_id(
-                obj_id=db_obj['id'],
-                obj_dat=obj_data,
-                session=session,
-            )
-        else:
-            await image_crud.create(
-                obj_data=obj_data,
-                session=session,
-            )
 
 
 def __parse_obj_name(obj: Path, dir_name: str) -> str:
@@ -186,15 +280,14 @@ async def __sync_image_with_semaphore(
     dir_name: str,
     db_images: dict[str, str | int],
     semaphore: AsyncSemaphore,
-) -> None:
+) -> dict[str, Any] | None:
     async with semaphore:
-        await __sync_image(obj=obj, dir_name=dir_name, db_images=db_images)
+        return await __sync_image(obj=obj, dir_name=dir_name, db_images=db_images)
 
 
 async def __upload_images_to_telegram(
     obj: Path,
     obj_local_path: str,
-    db_obj: dict[str, str | int] | None,
     dir_name: str,
 ) -> dict[str, Any]:
     """Загружает картинки в telegram."""
@@ -226,7 +319,9 @@ async def __upload_images_to_telegram(
                 else:
                     break
             except TelegramRetryAfter:
-                await asyncio_sleep(15)
+                # INFO. Ограничитель запросов (utils/rate_limiter.py) уже
+                #       заблокировал чат ровно на retry_after секунд,
+                #       поэтому повторный запрос дождется окончания блокировки.
                 continue
             messages_ids.append(message.message_id)
             obj_data[key] = message.photo[-1].file_id
@@ -234,12 +329,11 @@ async def __upload_images_to_telegram(
 
     await delete_messages_list(chat_id=message.chat.id, messages_ids=messages_ids)
 
-    if not db_obj:
-        obj_data.update(
+    obj_data.update(
         {
             'local_path': obj_local_path,
             'name': __parse_obj_name(obj=obj, dir_name=dir_name),
             'category': ImageCategory.get_category_by_dir(dir_name=dir_name),
         },
-        )
+    )
     return obj_data
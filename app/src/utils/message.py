@@ -1,3 +1,4 @@
+from asyncio import gather as asyncio_gather
 from typing import Iterable
 
 from aiogram.exceptions import (
@@ -5,14 +6,14 @@ from aiogram.exceptions import (
     TelegramForbiddenError,
 )
 from aiogram.methods.delete_message import DeleteMessage
+from aiogram.methods.delete_messages import DeleteMessages
 from aiogram.types import Message
 
 from app.src.bot.bot import bot
 from app.src.database.database import RedisKeys
 from app.src.utils.redis_app import (
-    redis_get,
+    redis_mget,
     redis_set,
-    redis_delete,
 )
 
 
@@ -62,7 +63,10 @@ class MessagesEvents:
             return RedisKeys.MESSAGE_WORD.format(id_telegram=chat_id)
 
 
-# TODO. Попробовать интеграцию bot.delete_messages
+# INFO. Максимальное количество сообщений в одном запросе deleteMessages.
+DELETE_MESSAGES_BATCH_SIZE: int = 100
+
+
 async def delete_messages_list(
     chat_id: int,
     messages_ids: Iterable[int],
@@ -71,18 +75,56 @@ async def delete_messages_list(
 ) -> None:
     """
     Удаляет указанные сообщения в телеграм чате/группе.
+
+    Сообщения удаляются пачками до DELETE_MESSAGES_BATCH_SIZE штук
+    одним запросом deleteMessages. Если пачку удалить не удалось,
+    то ее сообщения удаляются по одному.
     """
-    for message_id in reversed(messages_ids) if reverse else messages_ids:
+    messages_ids: list[int] = list(messages_ids)
+    if reverse:
+        messages_ids.reverse()
+
+    for i in range(0, len(messages_ids), DELETE_MESSAGES_BATCH_SIZE):
+        batch: list[int] = messages_ids[i:i + DELETE_MESSAGES_BATCH_SIZE]
         try:
-            await bot(DeleteMessage(chat_id=chat_id, message_id=message_id))
+            if len(batch) > 1:
+                await bot(DeleteMessages(chat_id=chat_id, message_ids=batch))
+                continue
         except TelegramForbiddenError:
             if raise_exception:
                 raise
             return
+        except TelegramBadRequest:
+            pass
+        if not await __delete_messages_one_by_one(
+            chat_id=chat_id,
+            messages_ids=batch,
+            raise_exception=raise_exception,
+        ):
+            return
+
+
+async def __delete_messages_one_by_one(
+    chat_id: int,
+    messages_ids: Iterable[int],
+    raise_exception: bool,
+) -> bool:
+    """
+    Удаляет сообщения по одному.
+    Возвращает False, если бот не имеет доступа к чату.
+    """
+    for message_id in messages_ids:
+        try:
+            await bot(DeleteMessage(chat_id=chat_id, message_id=message_id))
+        except TelegramForbiddenError:
+            if raise_exception:
+                raise
+            return False
         except TelegramBadRequest:
             if raise_exception:
                 raise
             continue
+    return True
 
 
 async def set_user_messages_to_delete(
@@ -90,7 +132,7 @@ async def set_user_messages_to_delete(
     messages: Iterable[Message],
 ) -> None:
     """Добавляет ID сообщений чата игрока для удаления в список по указанному ключу."""
-    redis_set(
+    await redis_set(
         key=MessagesEvents.get_redis_key(chat_id=messages[0].chat.id, event_key=event_key),
         value=[message.message_id for message in messages],
     )
@@ -101,15 +143,25 @@ async def delete_user_messages(
     event_key: str | None = None,
     all_event_keys: bool = False,
 ) -> None:
-    """Удаляет сообщения игрока по заданному ключу или все."""
+    """
+    Удаляет сообщения игрока по заданному ключу или все.
+
+    ID сообщений всех ключей извлекаются и удаляются из Redis одной
+    транзакцией, после чего сообщения удаляются в Telegram конкурентно.
+    """
     if all_event_keys:
-        event_keys: list[str] = MessagesEvents.get_all_events()
+        event_keys: tuple[str] = MessagesEvents.get_all_events()
     else:
         event_keys: tuple[str] = (event_key,)
 
-    for k in event_keys:
-        redis_key: str = MessagesEvents.get_redis_key(chat_id=chat_id, event_key=k)
-        messages_ids: tuple[int] | None = redis_get(key=redis_key)
-        if messages_ids:
-            await delete_messages_list(chat_id=chat_id, messages_ids=messages_ids)
-            redis_delete(key=redis_key)
+    messages_ids_by_event: list[list[int] | None] = await redis_mget(
+        keys=(MessagesEvents.get_redis_key(chat_id=chat_id, event_key=k) for k in event_keys),
+        delete=True,
+    )
+    await asyncio_gather(
+        *(
+            delete_messages_list(chat_id=chat_id, messages_ids=messages_ids)
+            for messages_ids in messages_ids_by_event
+            if messages_ids
+        ),
+    )
@@ -0,0 +1,100 @@
+"""
+Модуль сбора внутренних метрик приложения.
+
+Метрики хранятся в памяти процесса: счетчики (inc), текущие значения
+(set) и распределения (observe: количество, сумма, максимум). Используются
+для замеров ожидания блокировок, нагрузки на Redis, Telegram и базу данных.
+"""
+
+from typing import Any
+
+
+class MetricsNames:
+    """Класс представления названий метрик."""
+
+    # Cache.
+    USER_CACHE_HITS: str = 'user_cache_hits_total'
+    USER_CACHE_MISSES: str = 'user_cache_misses_total'
+
+    # Database pool.
+    DB_POOL_CHECKED_OUT: str = 'db_pool_checked_out'
+    DB_POOL_CHECKOUT_TIMEOUTS: str = 'db_pool_checkout_timeouts_total'
+    DB_POOL_CHECKOUT_WAIT_SEC: str = 'db_pool_checkout_wait_seconds'
+    DB_POOL_SATURATION: str = 'db_pool_saturation'
+
+    # Game actors.
+    GAME_ACTORS_ACTIVE: str = 'game_actors_active'
+    GAME_ACTORS_COMMAND_WAIT_SEC: str = 'game_actors_command_wait_seconds'
+
+    # Game state.
+    GAME_STATE_CONFLICTS: str = 'game_state_conflicts_total'
+    GAME_STATE_SAVES_SKIPPED: str = 'game_state_saves_skipped_total'
+
+    # Redis lock.
+    REDIS_LOCK_ACQUIRED: str = 'redis_lock_acquired_total'
+    REDIS_LOCK_CONTENDED: str = 'redis_lock_contended_total'
+    REDIS_LOCK_TIMEOUTS: str = 'redis_lock_timeouts_total'
+    REDIS_LOCK_WAIT_SEC: str = 'redis_lock_wait_seconds'
+
+    # Telegram.
+    TELEGRAM_RATE_WAIT_SEC: str = 'telegram_rate_wait_seconds'
+    TELEGRAM_REQUESTS: str = 'telegram_requests_total'
+    TELEGRAM_RETRY_AFTER: str = 'telegram_retry_after_total'
+    WEBHOOK_UPDATES: str = 'webhook_updates_total'
+    WORKER_UPDATES_ROUTED: str = 'worker_updates_routed_total'
+
+
+class Metrics:
+    """Класс хранения метрик процесса."""
+
+    def __init__(self):
+        self.__counters: dict[str, float] = {}
+        self.__gauges: dict[str, float] = {}
+        self.__summaries: dict[str, dict[str, float]] = {}
+
+    def inc(self, name: str, value: float = 1) -> None:
+        """Увеличивает счетчик."""
+        self.__counters[name] = self.__counters.get(name, 0) + value
+
+    def set(self, name: str, value: float) -> None:
+        """Устанавливает текущее значение."""
+        self.__gauges[name] = value
+
+    def observe(self, name: str, value: float) -> None:
+        """Добавляет значение в распределение."""
+        summary: dict[str, float] | None = self.__summaries.get(name)
+        if summary is None:
+            self.__summaries[name] = {'count': 1, 'sum': value, 'max': value}
+            return
+        summary['count'] += 1
+        summary['sum'] += value
+        if value > summary['max']:
+            summary['max'] = value
+
+    def get_all(self) -> dict[str, Any]:
+        """Возвращает копию всех метрик."""
+        return {
+            **self.__counters,
+            **self.__gauges,
+            **{name: dict(summary) for name, summary in self.__summaries.items()},
+        }
+
+    def render(self) -> str:
+        """Возвращает метрики в текстовом формате Prometheus."""
+        lines: list[str] = [
+            f'{name} {value}'
+            for name, value in sorted((*self.__counters.items(), *self.__gauges.items()))
+        ]
+        for name, summary in sorted(self.__summaries.items()):
+            for k, v in summary.items():
+                lines.append(f'{name}_{k} {v}')
+        return '\n'.join(lines) + '\n'
+
+    def reset(self) -> None:
+        """Сбрасывает все метрики."""
+        self.__counters.clear()
+        self.__gauges.clear()
+        self.__summaries.clear()
+
+
+metrics: Metrics = Metrics()
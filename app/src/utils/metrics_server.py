@@ -0,0 +1,40 @@
+"""
+Модуль веб-сервера метрик.
+
+Эндпоинт /metrics отдает метрики процесса (app.src.utils.metrics)
+в текстовом формате Prometheus. Сервер запускается в каждом процессе
+независимо от способа получения апдейтов (polling или webhook):
+процесс-шлюз (или единственный процесс) слушает порт METRICS_PORT,
+воркер с WORKER_ID=N - порт METRICS_PORT + 1 + N.
+"""
+
+from aiohttp import web
+
+from app.src.config.config import settings
+from app.src.utils.metrics import metrics
+
+
+async def start_metrics_server() -> web.AppRunner | None:
+    """
+    Запускает веб-сервер метрик. Возвращает его для остановки
+    (runner.cleanup()) или None, если сервер отключен (METRICS_PORT=0).
+    """
+    if not settings.METRICS_PORT:
+        return None
+
+    app: web.Application = web.Application()
+    app.router.add_get(path='/metrics', handler=__handle_metrics)
+
+    port: int = settings.METRICS_PORT
+    if settings.is_worker:
+        port += 1 + settings.WORKER_ID
+
+    runner: web.AppRunner = web.AppRunner(app=app)
+    await runner.setup()
+    await web.TCPSite(runner=runner, host=settings.METRICS_HOST, port=port).start()
+    return runner
+
+
+async def __handle_metrics(request: web.Request) -> web.Response:
+    """Отдает метрики процесса."""
+    return web.Response(text=metrics.render())
@@ -0,0 +1,233 @@
+"""
+Модуль ограничения частоты исходящих запросов к Telegram Bot API.
+
+Все запросы бота, адресованные чату (у метода есть chat_id), проходят
+через два token bucket: персональный для чата и общий для бота.
+Персональный bucket резервирует время отправки заранее, поэтому
+запросы в разные чаты не ждут друг друга. Общий bucket выдает токены
+в порядке приоритета: сообщения живой игры раньше удаления сообщений.
+
+У удаления сообщений в чате свой персональный bucket (со своей скоростью),
+поэтому всплеск удалений не расходует токены чата и сообщения живой
+игры не ждут удалений ни в чате, ни в общем bucket.
+
+При ответе TelegramRetryAfter чат блокируется ровно на retry_after секунд,
+после чего запрос повторяется (не более max_retries раз).
+"""
+
+from asyncio import (
+    Future,
+    Task,
+    create_task as asyncio_create_task,
+    get_running_loop as asyncio_get_running_loop,
+    sleep as asyncio_sleep,
+)
+from heapq import (
+    heappop,
+    heappush,
+)
+from itertools import count
+from time import monotonic
+from typing import TYPE_CHECKING
+
+from aiogram.client.session.middlewares.base import (
+    BaseRequestMiddleware,
+    NextRequestMiddlewareType,
+)
+from aiogram.exceptions import TelegramRetryAfter
+from aiogram.methods import (
+    DeleteMessage,
+    DeleteMessages,
+)
+from aiogram.methods.base import TelegramType
+
+from app.src.config.config import settings
+from app.src.utils.metrics import (
+    MetricsNames,
+    metrics,
+)
+
+if TYPE_CHECKING:
+    from aiogram import Bot
+    from aiogram.methods import (
+        Response,
+        TelegramMethod,
+    )
+
+
+class RequestPriority:
+    """Класс представления приоритетов исходящих запросов (меньше - важнее)."""
+
+    GAME: int = 0
+    CLEANUP: int = 1
+
+
+class TokenBucket:
+    """
+    Класс token bucket.
+
+    Атрибуты:
+        rate: float - скорость пополнения (токенов в секунду)
+        capacity: float - максимальное количество токенов (размер всплеска)
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate: float = rate
+        self.capacity: float = capacity
+        self.tokens: float = capacity
+        self.updated: float = monotonic()
+        self.blocked_until: float = 0.0
+
+    def __refill(self) -> float:
+        """Пополняет токены и возвращает текущее время."""
+        now: float = monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        return now
+
+    def get_delay(self) -> float:
+        """Возвращает время ожидания (сек) до появления токена."""
+        now: float = self.__refill()
+        delay: float = 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+        return max(delay, self.blocked_until - now)
+
+    def consume(self) -> None:
+        """Забирает токен (допускается уход в минус - резервирование)."""
+        self.__refill()
+        self.tokens -= 1
+
+    def reserve(self) -> float:
+        """Резервирует токен и возвращает время ожидания (сек) до его появления."""
+        delay: float = self.get_delay()
+        self.consume()
+        return delay
+
+    def block(self, seconds: float) -> None:
+        """Запрещает выдачу токенов на указанное время."""
+        self.blocked_until = max(self.blocked_until, monotonic() + seconds)
+
+    @property
+    def is_idle(self) -> bool:
+        """Полон ли bucket (не влияет на ожидание и может быть удален)."""
+        return self.get_delay() == 0 and self.tokens >= self.capacity
+
+
+class TelegramRateLimiter(BaseRequestMiddleware):
+    """
+    Класс middleware запросов бота, ограничивающий частоту запросов в Telegram.
+
+    Атрибуты:
+        global_rate: float - запросов в секунду на бота
+        chat_rate: float - запросов в секунду на чат
+        chat_burst: int - количество запросов в чат без ожидания
+        cleanup_chat_rate: float - удалений сообщений в секунду на чат
+        max_retries: int - количество повторов запроса после TelegramRetryAfter
+    """
+
+    # INFO. Количество персональных bucket, после которого удаляются неактивные.
+    CHATS_BUCKETS_PRUNE_SIZE: int = 10_000
+
+    def __init__(
+        self,
+        global_rate: float,
+        chat_rate: float,
+        chat_burst: int,
+        cleanup_chat_rate: float,
+        max_retries: int,
+    ):
+        self.chat_rate: float = chat_rate
+        self.chat_burst: int = chat_burst
+        self.cleanup_chat_rate: float = cleanup_chat_rate
+        self.max_retries: int = max_retries
+
+        self.__global_bucket: TokenBucket = TokenBucket(rate=global_rate, capacity=global_rate)
+        # INFO. {(chat_id, приоритет): bucket}.
+        self.__chats_buckets: dict[tuple[str, int], TokenBucket] = {}
+        self.__queue: list[tuple[int, int, Future]] = []
+        self.__queue_counter: count = count()
+        self.__pump_task: Task | None = None
+
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType[TelegramType],
+        bot: 'Bot',
+        method: 'TelegramMethod[TelegramType]',
+    ) -> 'Response[TelegramType]':
+        chat_id: int | str | None = getattr(method, 'chat_id', None)
+        if chat_id is None:
+            return await make_request(bot, method)
+
+        priority: int = (
+            RequestPriority.CLEANUP
+            if isinstance(method, (DeleteMessage, DeleteMessages))
+            else RequestPriority.GAME
+        )
+        retries: int = 0
+        while 1:
+            await self.acquire(chat_id=chat_id, priority=priority)
+            try:
+                return await make_request(bot, method)
+            except TelegramRetryAfter as e:
+                metrics.inc(MetricsNames.TELEGRAM_RETRY_AFTER)
+                # INFO. Ограничение Telegram действует на весь чат.
+                for k in (RequestPriority.GAME, RequestPriority.CLEANUP):
+                    self.__get_chat_bucket(chat_id=chat_id, priority=k).block(seconds=e.retry_after)
+                retries += 1
+                if retries > self.max_retries:
+                    raise
+
+    async def acquire(self, chat_id: int | str, priority: int = RequestPriority.GAME) -> None:
+        """Ожидает разрешения на отправку запроса в чат."""
+        started: float = monotonic()
+
+        delay: float = self.__get_chat_bucket(chat_id=chat_id, priority=priority).reserve()
+        if delay > 0:
+            await asyncio_sleep(delay)
+
+        future: Future = asyncio_get_running_loop().create_future()
+        heappush(self.__queue, (priority, next(self.__queue_counter), future))
+        if self.__pump_task is None or self.__pump_task.done():
+            self.__pump_task = asyncio_create_task(self.__pump())
+        await future
+
+        waited: float = monotonic() - started
+        metrics.inc(MetricsNames.TELEGRAM_REQUESTS)
+        metrics.observe(MetricsNames.TELEGRAM_RATE_WAIT_SEC, waited)
+
+    def __get_chat_bucket(self, chat_id: int | str, priority: int) -> TokenBucket:
+        """Возвращает персональный bucket чата для запросов с приоритетом priority."""
+        key: tuple[str, int] = (str(chat_id), priority)
+        bucket: TokenBucket | None = self.__chats_buckets.get(key)
+        if bucket is None:
+            if len(self.__chats_buckets) >= self.CHATS_BUCKETS_PRUNE_SIZE:
+                self.__chats_buckets = {k: v for k, v in self.__chats_buckets.items() if not v.is_idle}
+            bucket = self.__chats_buckets[key] = TokenBucket(
+                rate=self.cleanup_chat_rate if priority == RequestPriority.CLEANUP else self.chat_rate,
+                capacity=self.chat_burst,
+            )
+        return bucket
+
+    async def __pump(self) -> None:
+        """Задача выдачи токенов общего bucket ожидающим в порядке приоритета."""
+        while self.__queue:
+            delay: float = self.__global_bucket.get_delay()
+            if delay > 0:
+                # INFO. Пока идет ожидание, в очередь может встать более
+                #       приоритетный запрос, поэтому голова очереди
+                #       выбирается только после ожидания.
+                await asyncio_sleep(delay)
+                continue
+            _, _, future = heappop(self.__queue)
+            if future.done():
+                continue
+            self.__global_bucket.consume()
+            future.set_result(None)
+
+
+telegram_rate_limiter: TelegramRateLimiter = TelegramRateLimiter(
+    global_rate=settings.TELEGRAM_RATE_GLOBAL_PER_SEC / settings.WORKERS_COUNT,
+    chat_rate=settings.TELEGRAM_RATE_CHAT_PER_SEC,
+    chat_burst=settings.TELEGRAM_RATE_CHAT_BURST,
+    cleanup_chat_rate=settings.TELEGRAM_RATE_CHAT_CLEANUP_PER_SEC,
+    max_retries=settings.TELEGRAM_RETRY_AFTER_MAX_RETRIES,
+)
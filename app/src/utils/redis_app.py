@@ -3,38 +3,158 @@
 
 Использование хранилища Redis для ручного извлечения и сохранения данных
 осуществляется через функции redis_get и redis_set соответственно.
-"""
 
-# TODO: перейти на aioredis
+Все функции асинхронные и работают через общий пул соединений
+redis_engine (redis.asyncio), поэтому ожидание ответа Redis
+не блокирует обработку апдейтов других лобби.
+
+Значения преобразуются форматом REDIS_SERIALIZER (redis_dumps, redis_loads).
+Бинарные форматы начинают значение байтом-меткой формата, а значения
+без метки читаются как JSON, поэтому при смене формата ранее записанные
+значения остаются читаемыми. Целые числа в Redis Hash всегда хранятся
+десятичной строкой, чтобы их можно было увеличивать через HINCRBY.
+"""
 
 import json
-from typing import Any
+from typing import (
+    Any,
+    Iterable,
+)
+
+from redis.asyncio.client import Pipeline
 
+from app.src.config.config import (
+    RedisSerializers,
+    settings,
+)
 from app.src.database.database import redis_engine
 
 
-def redis_check_exists(key: str) -> bool:
+class RedisSerializer:
+    """
+    Класс формата значений в Redis (JSON стандартного модуля json).
+
+    Атрибуты:
+        tag: str - байт-метка формата в начале значения ('' - значение в JSON без метки)
+    """
+
+    tag: str = ''
+
+    def dumps(self, value: Any) -> str:
+        """Преобразует значение в строку для записи в Redis."""
+        return json.dumps(value)
+
+    def loads(self, data: str) -> Any:
+        """Преобразует строку из Redis (без байта-метки) в значение."""
+        return json.loads(data)
+
+
+class RedisSerializerOrjson(RedisSerializer):
+    """Класс формата значений в Redis: JSON через пакет orjson."""
+
+    def __init__(self):
+        import orjson
+        self.__orjson = orjson
+
+    def dumps(self, value: Any) -> str:
+        return self.__orjson.dumps(value, option=self.__orjson.OPT_NON_STR_KEYS).decode()
+
+    def loads(self, data: str) -> Any:
+        return self.__orjson.loads(data)
+
+
+class RedisSerializerMsgpack(RedisSerializer):
+    """
+    Класс формата значений в Redis: бинарный формат пакета msgpack.
+
+    Соединения Redis декодируют ответы в str (decode_responses=True), поэтому
+    байты передаются через str с обработкой ошибок surrogateescape без потерь
+    (см. redis_pool в модуле app.src.database.database).
+    """
+
+    tag: str = '\x01'
+
+    def __init__(self):
+        import msgpack
+        self.__msgpack = msgpack
+
+    def dumps(self, value: Any) -> str:
+        return self.tag + self.__msgpack.packb(value).decode('utf-8', 'surrogateescape')
+
+    def loads(self, data: str) -> Any:
+        return self.__msgpack.unpackb(data.encode('utf-8', 'surrogateescape'))
+
+
+def __get_redis_serializer(name: str) -> RedisSerializer:
+    """Возвращает формат значений в Redis по названию из настроек."""
+    if name == RedisSerializers.ORJSON:
+        return RedisSerializerOrjson()
+    elif name == RedisSerializers.MSGPACK:
+        return RedisSerializerMsgpack()
+    return RedisSerializer()
+
+
+redis_serializer: RedisSerializer = __get_redis_serializer(name=settings.REDIS_SERIALIZER)
+# INFO. Значения без байта-метки (JSON) читаются быстрейшим доступным JSON.
+__redis_serializer_json: RedisSerializer = (
+    redis_serializer
+    if not redis_serializer.tag
+    else RedisSerializer()
+)
+# INFO. Форматы с байтом-меткой: значения читаются и после смены REDIS_SERIALIZER
+#       (формат создается при первом чтении, если он не выбран в настройках).
+__REDIS_SERIALIZERS_TAGGED: dict[str, type[RedisSerializer]] = {
+    RedisSerializerMsgpack.tag: RedisSerializerMsgpack,
+}
+__REDIS_SERIALIZERS_BY_TAG: dict[str, RedisSerializer] = (
+    {redis_serializer.tag: redis_serializer}
+    if redis_serializer.tag
+    else {}
+)
+
+
+def redis_dumps(value: Any) -> str:
+    """Преобразует значение в строку для записи в Redis в формате REDIS_SERIALIZER."""
+    return redis_serializer.dumps(value)
+
+
+def redis_loads(data: str) -> Any:
+    """
+    Преобразует строку из Redis в значение по байту-метке формата
+    (значения без метки - JSON).
+    """
+    tag: str = data[:1]
+    if tag not in __REDIS_SERIALIZERS_TAGGED:
+        return __redis_serializer_json.loads(data)
+
+    serializer: RedisSerializer | None = __REDIS_SERIALIZERS_BY_TAG.get(tag)
+    if serializer is None:
+        serializer = __REDIS_SERIALIZERS_BY_TAG[tag] = __REDIS_SERIALIZERS_TAGGED[tag]()
+    return serializer.loads(data[1:])
+
+
+async def redis_check_exists(key: str) -> bool:
     """
     Проверяет существование ключа в Redis.
     """
-    return redis_engine.exists(key)
+    return bool(await redis_engine.exists(key))
 
 
-def redis_delete(key: str) -> None:
+async def redis_delete(key: str) -> None:
     """
     Удаляет данные из Redis по указанному ключу.
     """
-    redis_engine.delete(key)
+    await redis_engine.delete(key)
 
 
-def redis_flushall() -> None:
+async def redis_flushall() -> None:
     """
     Удаляет все данные из Redis.
     """
-    redis_engine.flushall()
+    await redis_engine.flushall()
 
 
-def redis_get(
+async def redis_get(
     key: str,
     get_ttl: bool = False,
     default: Any = None,
@@ -45,56 +165,125 @@ def redis_get(
 
     Если get_ttl=True, то возвращается TTL в секундах (-1, если ключа не существует).
     """
-    data: Any = redis_engine.get(name=key)
+    if get_ttl:
+        pipe: Pipeline
+        async with redis_engine.pipeline(transaction=False) as pipe:
+            pipe.get(name=key)
+            pipe.ttl(name=key)
+            data, ttl = await pipe.execute()
+    else:
+        data: Any = await redis_engine.get(name=key)
+
     if data is not None:
         try:
-            data: Any = json.loads(s=data)
+            data: Any = redis_loads(data=data)
         except json.JSONDecodeError:
             pass
     elif default is not None:
         data: Any = default
 
     if get_ttl:
-        return data, redis_engine.ttl(name=key)
+        return data, ttl
     return data
 
 
-def redis_get_ttl(key: str) -> int:
+async def redis_mget(keys: Iterable[str], delete: bool = False) -> list[Any]:
+    """
+    Извлекает данные из Redis по нескольким ключам одним запросом MGET
+    в типах данных Python (None для отсутствующих ключей).
+
+    Если delete=True, то ключи удаляются в той же транзакции.
+    """
+    keys: tuple[str] = tuple(keys)
+    if not keys:
+        return []
+
+    if delete:
+        pipe: Pipeline
+        async with redis_engine.pipeline(transaction=True) as pipe:
+            pipe.mget(keys)
+            pipe.delete(*keys)
+            values, _ = await pipe.execute()
+    else:
+        values: list[str | None] = await redis_engine.mget(keys)
+
+    result: list[Any] = []
+    for value in values:
+        if value is not None:
+            try:
+                value: Any = redis_loads(data=value)
+            except json.JSONDecodeError:
+                pass
+        result.append(value)
+    return result
+
+
+async def redis_get_ttl(key: str) -> int:
     """
     Извлекает TTL из Redis по указанному ключу
     (-1, если ключа не существует).
     """
-    return redis_engine.ttl(name=key)
+    return await redis_engine.ttl(name=key)
 
 
-def redis_set(key: str, value: Any, ex_sec: int | None = None) -> None:
+async def redis_set(key: str, value: Any, ex_sec: int | None = None) -> None:
     """
     Сохраняет данные в Redis по указанному ключу.
 
-    Преобразует тип данных dict в JSON.
+    Преобразует типы данных Python (кроме строк) в формат REDIS_SERIALIZER.
     """
-    redis_engine.set(
+    await redis_engine.set(
         name=key,
         value=(
-            json.dumps(value)
+            redis_dumps(value=value)
             if isinstance(value, (dict, list, tuple, int, float, bool, type(None)))
             else value
         ),
         ex=ex_sec,
     )
 
-def redis_sset_process(
+
+async def redis_hmget(key: str, fields: Iterable[str]) -> dict[str, Any]:
+    """
+    Извлекает указанные поля Redis Hash в типах данных Python.
+    Отсутствующие поля в результат не попадают.
+    """
+    fields: tuple[str] = tuple(fields)
+    values: list[str | None] = await redis_engine.hmget(name=key, keys=fields)
+    return redis_hash_decode(data=dict(zip(fields, values)))
+
+
+def redis_hash_encode(data: dict[str, Any]) -> dict[str, str]:
+    """
+    Преобразует значения полей Redis Hash в формат REDIS_SERIALIZER.
+    Целые числа сохраняются десятичной строкой (для HINCRBY).
+    """
+    return {
+        k: str(v) if type(v) is int else redis_dumps(value=v)
+        for k, v in data.items()
+    }
+
+
+def redis_hash_decode(data: dict[str, str | None]) -> dict[str, Any]:
+    """
+    Преобразует значения полей Redis Hash в типы данных Python.
+    Поля со значением None (отсутствующие) пропускаются.
+    """
+    return {k: redis_loads(data=v) for k, v in data.items() if v is not None}
+
+
+async def redis_sset_process(
     key,
     get: bool=False,
     add_value: bool=False,
     remove_value: bool=False,
-) -> None:
+) -> set[str] | None:
     """
     Обновляет данные в Redis Set по указанному ключу.
     """
     if get:
-        return redis_engine.smembers(key)
+        return await redis_engine.smembers(key)
     elif add_value:
-        redis_engine.sadd(key, add_value)
+        await redis_engine.sadd(key, add_value)
     elif remove_value:
-        redis_engine.srem(key, remove_value)
+        await redis_engine.srem(key, remove_value)
@@ -0,0 +1,211 @@
+"""
+Модуль распределенной блокировки в Redis.
+
+Захват выполняется атомарным SET NX PX с уникальным токеном владельца,
+освобождение и продление - Lua-скриптами со сравнением токена, поэтому
+чужая блокировка никогда не будет снята или продлена по ошибке.
+
+Ожидающие не опрашивают ключ блокировки: они ждут сигнала через BLPOP
+на ключе уведомлений, в который освобождающий кладет значение. Если
+владелец пропал без освобождения, ожидание ограничено оставшимся TTL.
+
+BLPOP выполняется через отдельный пул соединений (redis_blocking_engine),
+и в каждом процессе BLPOP по ключу выполняет только один ожидающий
+(освобождение будит одного ожидающего), остальные ждут его в процессе.
+Поэтому ожидающие не занимают соединения основного пула.
+"""
+
+from asyncio import (
+    CancelledError,
+    Lock as AsyncioLock,
+    Task,
+    TimeoutError as AsyncioTimeoutError,
+    create_task as asyncio_create_task,
+    sleep as asyncio_sleep,
+    timeout as asyncio_timeout,
+)
+from time import monotonic
+from uuid import uuid4
+
+from redis.commands.core import AsyncScript
+
+from app.src.database.database import (
+    redis_blocking_engine,
+    redis_engine,
+)
+from app.src.utils.metrics import (
+    MetricsNames,
+    metrics,
+)
+
+# INFO. Возвращает 0, если блокировка захвачена, иначе оставшийся TTL в мс.
+__LUA_ACQUIRE: str = """
+if redis.call('set', KEYS[1], ARGV[1], 'NX', 'PX', ARGV[2]) then
+    return 0
+end
+return redis.call('pttl', KEYS[1])
+"""
+
+# INFO. Удаляет блокировку, только если она принадлежит владельцу токена,
+#       и будит одного ожидающего.
+__LUA_RELEASE: str = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    redis.call('del', KEYS[1])
+    redis.call('lpush', KEYS[2], 1)
+    redis.call('ltrim', KEYS[2], 0, 0)
+    redis.call('pexpire', KEYS[2], ARGV[2])
+    return 1
+end
+return 0
+"""
+
+# INFO. Продлевает блокировку, только если она принадлежит владельцу токена.
+__LUA_EXTEND: str = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('pexpire', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+_script_acquire: AsyncScript = redis_engine.register_script(__LUA_ACQUIRE)
+_script_release: AsyncScript = redis_engine.register_script(__LUA_RELEASE)
+_script_extend: AsyncScript = redis_engine.register_script(__LUA_EXTEND)
+
+
+class RedisLock:
+    """
+    Класс распределенной блокировки в Redis.
+
+    Атрибуты:
+        key: str - ключ блокировки
+        lease_ms: int - время жизни блокировки (мс)
+        auto_extend: bool - продлевать ли блокировку в фоне, пока она удерживается
+        max_hold_ms: int - максимальное время фонового продления (мс), после
+            которого блокировка истечет сама (защита от забытого release)
+        waited_sec: float - сколько секунд заняло ожидание при последнем захвате
+    """
+
+    # INFO. Минимальное время ожидания сигнала в BLPOP (сек).
+    WAIT_MIN_SEC: float = 0.01
+
+    # INFO. Ожидание сигнала в процессе по ключам уведомлений:
+    #       {ключ: (блокировка BLPOP, количество ожидающих)}.
+    __waits: dict[str, tuple[AsyncioLock, int]] = {}
+
+    def __init__(
+        self,
+        key: str,
+        lease_ms: int = 5_000,
+        auto_extend: bool = False,
+        max_hold_ms: int = 60_000,
+    ):
+        self.key: str = key
+        self.notify_key: str = key + '_notify'
+        self.lease_ms: int = lease_ms
+        self.auto_extend: bool = auto_extend
+        self.max_hold_ms: int = max_hold_ms
+        self.waited_sec: float = 0.0
+
+        self.__token: str | None = None
+        self.__extend_task: Task | None = None
+
+    @property
+    def is_owned(self) -> bool:
+        """Удерживается ли блокировка этим объектом."""
+        return self.__token is not None
+
+    async def acquire(self, timeout_sec: float | None = None) -> bool:
+        """
+        Захватывает блокировку, ожидая ее освобождения не дольше timeout_sec
+        (None - без ограничения). Возвращает успешность захвата.
+        """
+        token: str = uuid4().hex
+        started: float = monotonic()
+        contended: bool = False
+        while 1:
+            pttl: int = await _script_acquire(keys=(self.key,), args=(token, self.lease_ms))
+            if pttl == 0:
+                break
+            contended = True
+
+            wait_sec: float = pttl / 1000 if pttl > 0 else self.WAIT_MIN_SEC
+            if timeout_sec is not None:
+                left_sec: float = timeout_sec - (monotonic() - started)
+                if left_sec <= 0:
+                    metrics.inc(MetricsNames.REDIS_LOCK_TIMEOUTS)
+                    return False
+                wait_sec = min(wait_sec, left_sec)
+            await self.__wait_notify(wait_sec=max(wait_sec, self.WAIT_MIN_SEC))
+
+        self.__token = token
+        self.waited_sec = monotonic() - started
+        metrics.inc(MetricsNames.REDIS_LOCK_ACQUIRED)
+        metrics.observe(MetricsNames.REDIS_LOCK_WAIT_SEC, self.waited_sec)
+        if contended:
+            metrics.inc(MetricsNames.REDIS_LOCK_CONTENDED)
+        if self.auto_extend:
+            self.__extend_task = asyncio_create_task(self.__extend_in_background())
+        return True
+
+    async def release(self) -> bool:
+        """
+        Освобождает блокировку и будит одного ожидающего.
+        Возвращает False, если блокировка уже истекла или принадлежит другому.
+        """
+        if self.__token is None:
+            return False
+        token, self.__token = self.__token, None
+        if self.__extend_task is not None:
+            self.__extend_task.cancel()
+            self.__extend_task = None
+        return bool(await _script_release(keys=(self.key, self.notify_key), args=(token, self.lease_ms)))
+
+    async def extend(self, lease_ms: int | None = None) -> bool:
+        """
+        Продлевает блокировку на lease_ms (по умолчанию - на self.lease_ms).
+        Возвращает False, если блокировка уже истекла или принадлежит другому.
+        """
+        if self.__token is None:
+            return False
+        return bool(
+            await _script_extend(
+                keys=(self.key,),
+                args=(self.__token, lease_ms or self.lease_ms),
+            ),
+        )
+
+    async def __wait_notify(self, wait_sec: float) -> None:
+        """
+        Ожидает сигнала об освобождении не дольше wait_sec. Если BLPOP по ключу
+        уже выполняет другой ожидающий процесса, то ожидается его завершение.
+        """
+        wait_lock, count = self.__waits.get(self.notify_key, (AsyncioLock(), 0))
+        self.__waits[self.notify_key] = (wait_lock, count + 1)
+        try:
+            if wait_lock.locked():
+                try:
+                    async with asyncio_timeout(wait_sec):
+                        async with wait_lock:
+                            pass
+                except AsyncioTimeoutError:
+                    pass
+                return
+            async with wait_lock:
+                await redis_blocking_engine.blpop(self.notify_key, timeout=wait_sec)
+        finally:
+            wait_lock, count = self.__waits[self.notify_key]
+            if count == 1:
+                del self.__waits[self.notify_key]
+            else:
+                self.__waits[self.notify_key] = (wait_lock, count - 1)
+
+    async def __extend_in_background(self) -> None:
+        """Задача по продлению блокировки, пока она удерживается."""
+        started: float = monotonic()
+        try:
+            while (monotonic() - started) * 1000 < self.max_hold_ms:
+                await asyncio_sleep(self.lease_ms / 1000 / 3)
+                if not await self.extend():
+                    return
+        except CancelledError:
+            pass
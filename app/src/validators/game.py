@@ -4,6 +4,12 @@ class GameParams:
     PLAYERS_MAX: int = 10
     PLAYERS_MIN: int = 4
 
+    # INFO. Длительность раунда (сек).
+    ROUND_DURATION_SEC: float = 120
+    # INFO. Интервал (сек), в течение которого повторные ответы
+    #       сновидца игнорируются (защита от дабл-кликов).
+    ANSWER_DEBOUNCE_SEC: float = 5
+
 
 class GameRoles:
     """Роли в игре."""